@@ -6,11 +6,18 @@ Coordinates all components for end-to-end functionality
 import logging
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
+from dataclasses import replace
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+import threading
 import time
 
+import numpy as np
+
 from models import (
     AdaptiveMetaGraph, QuerySignature, RetrievalOutcome,
-    RAGResponse, RetrievalMethod
+    RAGResponse, RetrievalMethod, EmbeddingStore
 )
 from config import config
 from retrieval_outcome_tracker import get_rot
@@ -19,6 +26,8 @@ from latent_relationship_discovery import get_lrd
 from meta_query_router import get_mqr
 from embeddings_manager import get_embeddings_manager
 from neo4j_manager import get_neo4j_manager
+from semantic_cache import get_semantic_cache
+from signature_index import QuerySignatureIndex
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +37,11 @@ class AdaptiveGraphRAGOrchestrator:
     
     def __init__(self):
         """Initialize orchestrator and all components"""
-        self.meta_graph = AdaptiveMetaGraph()
+        self.meta_graph = AdaptiveMetaGraph(
+            embedding_cache=EmbeddingStore(
+                quantize=config.embedding.quantize_cache
+            )
+        )
         
         # Initialize all components
         self.rot = get_rot()
@@ -37,13 +50,30 @@ class AdaptiveGraphRAGOrchestrator:
         self.mqr = get_mqr(self.meta_graph)
         self.embeddings = get_embeddings_manager(self.meta_graph)
         self.neo4j = get_neo4j_manager()
+        self.semantic_cache = get_semantic_cache()
+        self.signature_index = QuerySignatureIndex()
+        
+        # Embedding and classification are deterministic in the query text
+        self._embed_and_classify = lru_cache(
+            maxsize=config.embedding.signature_cache_size
+        )(self._compute_embedding_and_type)
+        
+        # Serializes adaptive updates, which may run as background tasks
+        self._update_lock = threading.Lock()
+        
+        # Fan-out pool for independent retrievers in HYBRID mode
+        self.retrieval_executor = ThreadPoolExecutor(
+            max_workers=config.retriever.max_parallel_retrievers,
+            thread_name_prefix="retrieval"
+        )
         
         logger.info("Initialized AdaptiveGraphRAG Orchestrator")
     
     def process_query(
         self,
         query_text: str,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        embedding: Optional[List[float]] = None
     ) -> RAGResponse:
         """
         Process a query end-to-end
@@ -51,14 +81,62 @@ class AdaptiveGraphRAGOrchestrator:
         Args:
             query_text: User query
             user_id: Optional user ID for tracking
+            embedding: Precomputed query embedding (e.g. from a batch)
             
         Returns:
             RAGResponse object
         """
-        start_time = time.time()
+        response, query_signature = self.process_query_fast(
+            query_text,
+            user_id,
+            embedding
+        )
+        
+        if query_signature is not None:
+            self.finalize_query(response, query_signature)
+        
+        return response
+    
+    def process_query_fast(
+        self,
+        query_text: str,
+        user_id: Optional[str] = None,
+        embedding: Optional[List[float]] = None
+    ) -> Tuple[RAGResponse, Optional[QuerySignature]]:
+        """
+        Answer a query without applying adaptive updates
+        
+        Args:
+            query_text: User query
+            user_id: Optional user ID for tracking
+            embedding: Precomputed query embedding (e.g. from a batch)
+            
+        Returns:
+            Tuple of (response, query signature to pass to finalize_query).
+            The signature is None for cache hits, which need no updates.
+        """
+        start_time = time.perf_counter()
         
         # 1. Create query signature
-        query_signature = self._create_query_signature(query_text)
+        query_signature = self._create_query_signature(query_text, embedding)
+        
+        # Serve paraphrased/repeated queries from the semantic cache
+        cache_key = None
+        if config.semantic_cache.enabled and len(query_signature.embedding):
+            cache_key = self.semantic_cache.normalize(
+                query_signature.embedding
+            )
+            cached = self.semantic_cache.get(cache_key)
+            if cached is not None:
+                execution_time_ms = (time.perf_counter() - start_time) * 1000
+                logger.info(
+                    f"Served query from semantic cache in "
+                    f"{execution_time_ms:.1f}ms"
+                )
+                return (
+                    replace(cached, execution_time_ms=execution_time_ms),
+                    None
+                )
         
         # 2. Classify and route
         best_method, ensemble_weights = self.mqr.get_optimal_routing(
@@ -72,30 +150,72 @@ class AdaptiveGraphRAGOrchestrator:
             ensemble_weights
         )
         
-        # 4. Update adaptive components
-        self._update_adaptive_components(response, query_signature)
-        
-        # 5. Calculate metrics
-        execution_time_ms = (time.time() - start_time) * 1000
+        # 4. Calculate metrics
+        execution_time_ms = (time.perf_counter() - start_time) * 1000
         response.execution_time_ms = execution_time_ms
         
+        if cache_key is not None:
+            self.semantic_cache.put(cache_key, response)
+        
         logger.info(
             f"Processed query in {execution_time_ms:.1f}ms | "
             f"Method: {best_method.value} | "
             f"Confidence: {response.confidence_score:.2%}"
         )
         
-        return response
+        return response, query_signature
     
-    def _create_query_signature(self, query_text: str) -> QuerySignature:
-        """Create signature for a query"""
+    def finalize_query(
+        self,
+        response: RAGResponse,
+        query_signature: QuerySignature
+    ):
+        """
+        Apply adaptive updates for a query answered by process_query_fast
+        
+        Safe to run from background threads; updates are serialized.
+        
+        Args:
+            response: Response returned by process_query_fast
+            query_signature: Signature returned by process_query_fast
+        """
+        with self._update_lock:
+            self._update_adaptive_components(response, query_signature)
+    
+    @staticmethod
+    def _compact_embedding(embedding: List[float]) -> np.ndarray:
+        """Convert an embedding to a read-only vector in the storage dtype"""
+        vector = np.array(embedding, dtype=config.embedding.storage_dtype)
+        vector.flags.writeable = False
+        return vector
+    
+    def _compute_embedding_and_type(
+        self,
+        query_text: str
+    ) -> Tuple[np.ndarray, str]:
+        """Embed and classify a query (memoized per instance)"""
         embedding = self.embeddings.embed_text(query_text)
         query_type = self.mqr.classify_query(query_text)
+        return self._compact_embedding(embedding), query_type.value
+    
+    def _create_query_signature(
+        self,
+        query_text: str,
+        embedding: Optional[List[float]] = None
+    ) -> QuerySignature:
+        """Create signature for a query"""
+        if embedding is None:
+            embedding, query_type = self._embed_and_classify(query_text)
+        else:
+            embedding = self._compact_embedding(embedding)
+            query_type = self.mqr.classify_query(query_text).value
         
+        # Fresh signature per request so each query keeps its own ID;
+        # the read-only embedding vector is shared, not copied
         signature = QuerySignature(
             query_text=query_text,
             embedding=embedding,
-            query_type=query_type.value
+            query_type=query_type
         )
         
         self.meta_graph.query_signatures[signature.query_id] = signature
@@ -132,15 +252,19 @@ class AdaptiveGraphRAGOrchestrator:
         elif primary_method == RetrievalMethod.LOGICAL_FILTERING:
             response = self._logical_filtering(query_signature, response)
         elif primary_method == RetrievalMethod.HYBRID:
-            # Execute multiple methods and ensemble
-            vector_response = self._vector_search(
+            # Execute multiple methods concurrently and ensemble
+            vector_future = self.retrieval_executor.submit(
+                self._vector_search,
                 query_signature,
                 RAGResponse(query=query_signature.query_text)
             )
-            graph_response = self._graph_traversal(
+            graph_future = self.retrieval_executor.submit(
+                self._graph_traversal,
                 query_signature,
                 RAGResponse(query=query_signature.query_text)
             )
+            vector_response = vector_future.result()
+            graph_response = graph_future.result()
             
             # Ensemble results
             response = self._ensemble_responses(
@@ -207,9 +331,11 @@ class AdaptiveGraphRAGOrchestrator:
         )
         ensemble_response.confidence_score = avg_confidence
         
-        # Combine methods tried
+        # Combine methods tried, deduplicated in first-seen order
         ensemble_response.methods_tried = list(
-            set().union(*(r.methods_tried for r in responses))
+            dict.fromkeys(
+                chain.from_iterable(r.methods_tried for r in responses)
+            )
         )
         
         logger.debug(
@@ -225,6 +351,15 @@ class AdaptiveGraphRAGOrchestrator:
         query_signature: QuerySignature
     ):
         """Update all adaptive components based on retrieval outcome"""
+        # Deduplicate retrieved nodes in first-seen order; edges dedupe on
+        # GERE's packed int64 keys, which the edge update reuses
+        source_nodes = list(dict.fromkeys(response.source_nodes))
+        packed_edges = self.gere.pack_edges(response.source_edges)
+        _, first = np.unique(packed_edges, return_index=True)
+        first.sort()
+        path_edges = [response.source_edges[i] for i in first]
+        packed_edges = packed_edges[first]
+        
         # Record outcome
         outcome = self.rot.record_outcome(
             query_signature=query_signature,
@@ -233,17 +368,21 @@ class AdaptiveGraphRAGOrchestrator:
             confidence_score=response.confidence_score,
             reasoning_validity=0.8,  # Would be calculated from reasoning
             embedding_coherence=0.75,  # Would be calculated
-            retrieved_nodes=response.source_nodes,
-            retrieved_edges=response.source_edges,
+            retrieved_nodes=source_nodes,
+            retrieved_edges=path_edges,
             execution_time_ms=response.execution_time_ms
         )
         
+        # Score once; every consumer below reuses it
+        success_score = outcome.composite_success_score()
+        
         # Update meta-graph
-        self.meta_graph.query_outcomes.append(outcome)
+        self.meta_graph.query_outcomes.append(outcome, success_score)
+        self.signature_index.add(outcome)
         
         # Update routing effectiveness
         query_type = query_signature.query_type
-        success = outcome.composite_success_score() > 0.5
+        success = success_score > 0.5
         self.mqr.update_method_effectiveness(
             response.retrieval_method_used,
             query_type,
@@ -252,12 +391,11 @@ class AdaptiveGraphRAGOrchestrator:
         )
         
         # Update edge weights
-        path_edges = response.source_edges
         if path_edges:
-            self.gere.update_edges_from_outcome(
+            self.gere.submit_outcome_packed(
                 outcome,
-                response.source_nodes,
-                path_edges
+                packed_edges,
+                success_score
             )
         
         # Discover latent relationships
@@ -267,6 +405,24 @@ class AdaptiveGraphRAGOrchestrator:
                 response.reasoning_chain
             )
     
+    def find_similar_queries(
+        self,
+        embedding: np.ndarray,
+        k: int = 5
+    ) -> List[Tuple[RetrievalOutcome, float]]:
+        """
+        Find outcomes of past queries most similar to an embedding
+        
+        Args:
+            embedding: Query embedding
+            k: Number of past queries to return
+            
+        Returns:
+            List of (outcome, cosine similarity), most similar first
+        """
+        with self._update_lock:
+            return self.signature_index.search(embedding, k)
+    
     def get_system_status(self) -> Dict:
         """Get system status and statistics"""
         return {
@@ -276,15 +432,26 @@ class AdaptiveGraphRAGOrchestrator:
                 "query_signatures": len(self.meta_graph.query_signatures),
                 "edge_weights": len(self.meta_graph.edge_weights),
                 "latent_relations": len(self.meta_graph.latent_relations),
+                "signature_index": self.signature_index.get_statistics(),
             },
             "rot": self.rot.get_performance_summary(),
             "gere": self.gere.get_statistics(),
             "lrd": self.lrd.get_statistics(),
             "mqr": self.mqr.get_statistics(),
-            "embeddings": self.embeddings.get_cache_stats(),
+            "embeddings": {
+                **self.embeddings.get_cache_stats(),
+                "signature_cache": (
+                    self._embed_and_classify.cache_info()._asdict()
+                ),
+            },
             "neo4j": self.neo4j.get_statistics(),
+            "semantic_cache": self.semantic_cache.get_statistics(),
         }
     
+    def clear_signature_cache(self):
+        """Drop memoized query embeddings and classifications"""
+        self._embed_and_classify.cache_clear()
+    
     def save_state(self, filepath: str):
         """Save orchestrator state"""
         self.rot.export_outcomes(filepath)
@@ -292,17 +459,23 @@ class AdaptiveGraphRAGOrchestrator:
     
     def cleanup(self):
         """Cleanup resources"""
+        self.gere.flush()
+        self.rot.close()
+        self.retrieval_executor.shutdown(wait=False)
         self.neo4j.close()
         logger.info("Cleaned up AdaptiveGraphRAG resources")
 
 
 # Global instance
 orchestrator_instance: Optional[AdaptiveGraphRAGOrchestrator] = None
+_instance_lock = threading.Lock()
 
 
 def get_orchestrator() -> AdaptiveGraphRAGOrchestrator:
     """Get or create orchestrator instance"""
     global orchestrator_instance
     if orchestrator_instance is None:
-        orchestrator_instance = AdaptiveGraphRAGOrchestrator()
+        with _instance_lock:
+            if orchestrator_instance is None:
+                orchestrator_instance = AdaptiveGraphRAGOrchestrator()
     return orchestrator_instance
\ No newline at end of file
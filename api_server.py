@@ -3,16 +3,20 @@ FastAPI Server for AdaptiveGraphRAG
 REST API endpoints for the system
 """
 
+import asyncio
+import hashlib
 import logging
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 import uvicorn
 
 from config import config
 from adaptive_orchestrator import get_orchestrator
-from models import RetrievalMethod
+from models import RetrievalMethod, RAGResponse
+from embeddings_manager import EmbeddingBatcher
 
 # Configure logging
 logging.basicConfig(
@@ -25,7 +29,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="AdaptiveGraphRAG API",
     description="Self-Evolving Knowledge Graph Intelligence",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -40,6 +45,12 @@ app.add_middleware(
 # Initialize orchestrator
 orchestrator = get_orchestrator()
 
+# Coalesce embeddings for concurrent /query requests
+embed_batcher = EmbeddingBatcher(orchestrator.embeddings)
+
+# In-flight /query pipelines keyed by query text hash (single-flight)
+inflight_queries: Dict[bytes, asyncio.Future] = {}
+
 
 # ==================== Request/Response Models ====================
 
@@ -70,6 +81,7 @@ class SystemStatusResponse(BaseModel):
     mqr: Dict
     embeddings: Dict
     neo4j: Dict
+    semantic_cache: Dict
 
 
 class HealthResponse(BaseModel):
@@ -99,13 +111,42 @@ class RelationshipResponse(BaseModel):
 
 # ==================== API Endpoints ====================
 
+async def _answer_query(
+    request: QueryRequest,
+    background_tasks: BackgroundTasks
+) -> RAGResponse:
+    """Run the query pipeline, deferring adaptive updates"""
+    # Embed as part of a batch, then process query
+    embedding = await embed_batcher.submit(request.query)
+    response, query_signature = orchestrator.process_query_fast(
+        request.query,
+        request.user_id,
+        embedding=embedding
+    )
+    
+    if query_signature is not None:
+        background_tasks.add_task(
+            orchestrator.finalize_query,
+            response,
+            query_signature
+        )
+    
+    return response
+
+
 @app.post("/query", response_model=QueryResponse)
-async def process_query(request: QueryRequest):
+async def process_query(
+    request: QueryRequest,
+    background_tasks: BackgroundTasks
+):
     """
     Process a query and get adaptive routing response
     
+    Adaptive updates run as a background task after the response is sent.
+    
     Args:
         request: QueryRequest with query text
+        background_tasks: FastAPI background task queue
         
     Returns:
         QueryResponse with answer and metadata
@@ -117,11 +158,30 @@ async def process_query(request: QueryRequest):
                 detail="Query cannot be empty"
             )
         
-        # Process query
-        response = orchestrator.process_query(
-            request.query,
-            request.user_id
-        )
+        # Identical concurrent queries share one pipeline run
+        key = hashlib.blake2b(
+            request.query.encode("utf-8"),
+            digest_size=16
+        ).digest()
+        
+        inflight = inflight_queries.get(key)
+        if inflight is not None:
+            response = await asyncio.shield(inflight)
+        else:
+            future = asyncio.get_running_loop().create_future()
+            inflight_queries[key] = future
+            try:
+                response = await _answer_query(request, background_tasks)
+                future.set_result(response)
+            except BaseException as e:
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+                    future.exception()  # Mark retrieved if nobody waits
+                raise
+            finally:
+                inflight_queries.pop(key, None)
         
         return QueryResponse(
             query=response.query,
@@ -295,6 +355,7 @@ async def clear_embeddings_cache():
     """Clear embeddings cache"""
     try:
         orchestrator.embeddings.clear_cache()
+        orchestrator.clear_signature_cache()
         return {"status": "success", "message": "Cache cleared"}
     except Exception as e:
         logger.error(f"Error clearing cache: {e}")
@@ -312,9 +373,21 @@ async def save_state(filepath: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.on_event("startup")
+async def startup_event():
+    """Warm up models and start background workers"""
+    # Keep model load out of the first query's latency
+    try:
+        await asyncio.to_thread(orchestrator.embeddings.warmup)
+    except Exception as e:
+        logger.warning(f"Embedding warmup failed: {e}")
+    embed_batcher.start()
+
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
+    await embed_batcher.stop()
     orchestrator.cleanup()
     logger.info("Server shutdown")
 
@@ -327,11 +400,17 @@ if __name__ == "__main__":
         f"{config.api.host}:{config.api.port}"
     )
     
+    # Reload and multiple workers need an import string; each worker
+    # process then builds its own orchestrator with independent state
+    multi_process = config.api.reload or config.api.workers > 1
+    
     uvicorn.run(
-        app,
+        "api_server:app" if multi_process else app,
         host=config.api.host,
         port=config.api.port,
-        debug=config.api.debug,
         reload=config.api.reload,
+        workers=config.api.workers,
+        loop=config.api.loop,
+        http=config.api.http,
         log_level=config.monitoring.log_level.lower()
     )
\ No newline at end of file
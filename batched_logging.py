@@ -0,0 +1,83 @@
+"""
+Batched Logging Handler
+Coalesces log records into page-sized writes to the output stream
+"""
+
+import atexit
+import logging
+import sys
+import threading
+from typing import Optional, TextIO
+
+
+class BatchedStreamHandler(logging.Handler):
+    """Stream handler that buffers formatted records and writes them in pages"""
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        page_size: int = 4096,
+        max_delay_ms: float = 10.0
+    ):
+        """
+        Initialize handler
+
+        Args:
+            stream: Output stream (defaults to stderr)
+            page_size: Buffered bytes that trigger a write
+            max_delay_ms: Max time a record waits in the buffer
+        """
+        super().__init__()
+        self.stream = stream or sys.stderr
+        self.page_size = page_size
+        self.max_delay_ms = max_delay_ms
+
+        self._buffer = bytearray()
+        self._flush_timer: Optional[threading.Timer] = None
+
+        atexit.register(self.flush)
+
+    def emit(self, record: logging.LogRecord):
+        """Buffer a record, writing the page once it fills"""
+        try:
+            self._buffer += self.format(record).encode() + b"\n"
+        except Exception:
+            self.handleError(record)
+            return
+
+        # handle() already holds self.lock here
+        if len(self._buffer) >= self.page_size:
+            self._write()
+        elif self._flush_timer is None:
+            self._flush_timer = threading.Timer(
+                self.max_delay_ms / 1000,
+                self.flush
+            )
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self):
+        """Write any buffered records"""
+        with self.lock:
+            self._write()
+
+    def _write(self):
+        """Write the buffer in one call; caller holds self.lock"""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        if not self._buffer:
+            return
+
+        data = self._buffer.decode()
+        self._buffer.clear()
+
+        self.stream.write(data)
+        if hasattr(self.stream, "flush"):
+            self.stream.flush()
+
+    def close(self):
+        """Flush and close the handler"""
+        self.flush()
+        super().close()
@@ -5,7 +5,8 @@ Centralized configuration for all components
 
 import os
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -18,6 +19,8 @@ class Neo4jConfig:
     username: str = os.getenv("NEO4J_USERNAME", "neo4j")
     password: str = os.getenv("NEO4J_PASSWORD", "password")
     database: str = os.getenv("NEO4J_DATABASE", "neo4j")
+    stats_cache_ttl_seconds: float = 30.0  # How long get_statistics counts are reused
+    unique_entity_names: bool = False  # Enforce unique Entity.name with a constraint
 
 
 @dataclass
@@ -26,7 +29,17 @@ class EmbeddingConfig:
     model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
     embedding_dim: int = 384
     device: str = "cpu"  # or "cuda" for GPU
+    backend: str = os.getenv("EMBEDDING_BACKEND", "onnx")  # "onnx" or "torch"
+    onnx_file_name: Optional[str] = "onnx/model_O3.onnx"  # Graph-optimized export
+    use_fp16: bool = True  # Half precision for torch on GPU
     cache_embeddings: bool = True
+    quantize_cache: bool = False  # int8 cache rows; hits return lossy dequantized vectors
+    storage_dtype: str = "float16"  # dtype of stored query embeddings
+    persist_embeddings: bool = True  # Keep computed embeddings across restarts
+    persistent_cache_dir: str = "./data/embedding_cache"
+    signature_cache_size: int = 4096  # Memoized query signatures
+    batch_size: int = 32  # Max texts per batched forward pass
+    batch_wait_ms: float = 5.0  # Max wait for concurrent requests to batch
 
 
 @dataclass
@@ -46,6 +59,7 @@ class RetrieverConfig:
     vector_search_top_k: int = 5
     graph_traversal_hops: int = 3
     logical_filter_threshold: float = 0.7
+    max_parallel_retrievers: int = 3  # Concurrent retrievers for HYBRID
     hybrid_weights: Dict[str, float] = field(default_factory=lambda: {
         "vector": 0.4,
         "graph": 0.3,
@@ -60,11 +74,19 @@ class AdaptiveMetaGraphConfig:
     positive_weight_delta: float = 0.15
     negative_weight_delta: float = -0.10
     initial_edge_weight: float = 1.0
+    deadband: float = 0.05  # Skip edge updates for scores within 0.5 +/- this
     
     # Decay
     recency_decay_factor: float = 0.95
     time_window_days: int = 30
     
+    # Edge update batching
+    edge_batch_size: int = 512  # Flush once this many outcomes are queued
+    edge_batch_max_delay_ms: float = 20.0  # ...or this long after the first
+    edge_min_coalesce_delay_ms: float = 1.0  # Lower bound for the tuned window
+    edge_target_flush_latency_ms: float = 2.0  # Window is tuned toward this
+    edge_flush_immediately_score: float = 0.95  # Scores this decisive flush at once
+    
     # Relationship discovery
     latent_relation_confidence_threshold: float = 0.7
     auto_approve_high_confidence: bool = True
@@ -72,8 +94,39 @@ class AdaptiveMetaGraphConfig:
     # Routing
     min_historical_queries: int = 5  # Min queries before routing optimization
     routing_update_frequency: int = 10  # Update routing every N queries
+    classification_cache_size: int = 4096  # Memoized query classifications
+    routing_history_size: int = 1000  # Recent routing decisions kept
     
 
+@dataclass
+class OutcomeTrackerConfig:
+    """Retrieval Outcome Tracker Configuration"""
+    max_retained_outcomes: int = 500_000  # Oldest outcomes are dropped past this
+    retention_slack: int = 32_768  # Extra outcomes allowed before a trim
+    summary_cache_ttl_seconds: float = 5.0  # Reuse performance summaries this long
+    wal_enabled: bool = False  # Append each outcome to a log replayed on startup
+    wal_fsync: bool = False  # fsync the log after every outcome
+    wal_checkpoint_records: int = 50_000  # Logged outcomes that trigger a checkpoint
+
+
+@dataclass
+class SemanticCacheConfig:
+    """Semantic Response Cache Configuration"""
+    enabled: bool = True
+    similarity_threshold: float = 0.85  # Query-to-query cosine similarity
+    ttl_seconds: float = 300.0
+    max_entries: int = 1024
+
+
+@dataclass
+class SignatureIndexConfig:
+    """Query Signature ANN Index Configuration"""
+    max_elements: int = 100_000  # Grows automatically when exceeded
+    m: int = 16
+    ef_construction: int = 200
+    ef_search: int = 50
+
+
 @dataclass
 class FastAPIConfig:
     """FastAPI Server Configuration"""
@@ -81,6 +134,9 @@ class FastAPIConfig:
     port: int = int(os.getenv("API_PORT", "8000"))
     debug: bool = os.getenv("DEBUG", "False") == "True"
     reload: bool = os.getenv("RELOAD", "False") == "True"
+    workers: int = int(os.getenv("API_WORKERS", "1"))
+    loop: str = os.getenv("API_LOOP", "uvloop")  # "uvloop", "asyncio", "auto"
+    http: str = os.getenv("API_HTTP", "httptools")  # "httptools", "h11", "auto"
 
 
 @dataclass
@@ -95,26 +151,49 @@ class MonitoringConfig:
 class AdaptiveGraphRAGConfig:
     """Master Configuration Class"""
     
+    # Sub-config attributes, in to_dict() order
+    SECTIONS = (
+        "neo4j", "embedding", "llm", "retriever", "adaptive_meta",
+        "outcome_tracker", "semantic_cache", "signature_index", "api",
+        "monitoring",
+    )
+    
     def __init__(self):
         self.neo4j = Neo4jConfig()
         self.embedding = EmbeddingConfig()
         self.llm = LLMConfig()
         self.retriever = RetrieverConfig()
         self.adaptive_meta = AdaptiveMetaGraphConfig()
+        self.outcome_tracker = OutcomeTrackerConfig()
+        self.semantic_cache = SemanticCacheConfig()
+        self.signature_index = SignatureIndexConfig()
         self.api = FastAPIConfig()
         self.monitoring = MonitoringConfig()
+        
+        self._as_dict: Optional[Mapping[str, Mapping[str, Any]]] = None
+    
+    def __setattr__(self, name: str, value: Any):
+        # Replacing a whole sub-config invalidates the to_dict() snapshot
+        if name in self.SECTIONS:
+            object.__setattr__(self, "_as_dict", None)
+        object.__setattr__(self, name, value)
     
-    def to_dict(self) -> Dict:
-        """Convert configuration to dictionary"""
-        return {
-            "neo4j": vars(self.neo4j),
-            "embedding": vars(self.embedding),
-            "llm": vars(self.llm),
-            "retriever": vars(self.retriever),
-            "adaptive_meta": vars(self.adaptive_meta),
-            "api": vars(self.api),
-            "monitoring": vars(self.monitoring),
-        }
+    def to_dict(self) -> Mapping[str, Mapping[str, Any]]:
+        """
+        Convert configuration to dictionary
+        
+        Built once and shared. Each section is a read-only view of its
+        sub-config's attributes, so runtime tweaks (e.g.
+        config.embedding.device = ...) show through, while edits to the
+        result raise instead of changing the live config. Copy with
+        {name: dict(section) for ...} for a mutable or JSON-ready dict.
+        """
+        if self._as_dict is None:
+            self._as_dict = MappingProxyType({
+                name: MappingProxyType(vars(getattr(self, name)))
+                for name in self.SECTIONS
+            })
+        return self._as_dict
 
 
 # Global config instance
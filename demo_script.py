@@ -4,7 +4,10 @@ Complete end-to-end demonstration with synthetic data
 """
 
 import logging
+import os
+from typing import Optional
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import time
 import json
 from pathlib import Path
@@ -15,28 +18,51 @@ from models import (
     RetrievalMethod
 )
 from config import config
+from batched_logging import BatchedStreamHandler
 
-# Setup logging
+# Setup logging; records are written to stderr in batches
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[BatchedStreamHandler()]
 )
 logger = logging.getLogger(__name__)
 
+_SEP = "=" * 80
+_RULE = "-" * 80
+
 
 class AdaptiveGraphRAGDemo:
     """Demo for AdaptiveGraphRAG system"""
     
-    def __init__(self):
-        """Initialize demo"""
+    def __init__(self, interactive: Optional[bool] = None):
+        """
+        Initialize demo
+        
+        Args:
+            interactive: Pause between phases for readability. Defaults to
+                the ADAPTIVE_DEMO_INTERACTIVE env var (on unless "false");
+                turn off for CI and benchmark runs.
+        """
+        if interactive is None:
+            interactive = os.getenv(
+                "ADAPTIVE_DEMO_INTERACTIVE", "true"
+            ).lower() not in ("0", "false", "no")
+        
+        self.interactive = interactive
         self.orchestrator = get_orchestrator()
         self.results = []
     
+    def _pause(self):
+        """Pause between demo phases when running interactively"""
+        if self.interactive:
+            time.sleep(1)
+    
     def demo_query_routing(self):
         """Demo: Query classification and routing"""
-        logger.info("=" * 80)
+        logger.info(_SEP)
         logger.info("DEMO 1: Query Classification & Routing")
-        logger.info("=" * 80)
+        logger.info(_SEP)
         
         test_queries = [
             "Tell me about machine learning techniques",  # Semantic
@@ -45,25 +71,26 @@ class AdaptiveGraphRAGDemo:
             "Show me articles published only by Yann LeCun",  # Constraint
         ]
         
+        mqr = self.orchestrator.mqr
+        create_signature = self.orchestrator._create_query_signature
+        
         for query in test_queries:
-            query_type = self.orchestrator.mqr.classify_query(query)
-            logger.info(f"\nQuery: {query}")
-            logger.info(f"Classified as: {query_type.value}")
+            query_type = mqr.classify_query(query)
+            logger.info("\nQuery: %s", query)
+            logger.info("Classified as: %s", query_type.value)
             
-            best_method, weights = (
-                self.orchestrator.mqr.get_optimal_routing(
-                    self.orchestrator._create_query_signature(query)
-                )
+            best_method, weights = mqr.get_optimal_routing(
+                create_signature(query)
             )
             
-            logger.info(f"Recommended method: {best_method.value}")
-            logger.info(f"Ensemble weights: {weights}")
+            logger.info("Recommended method: %s", best_method.value)
+            logger.info("Ensemble weights: %s", weights)
     
     def demo_retrieval_learning(self):
         """Demo: Retrieval outcome learning"""
-        logger.info("=" * 80)
+        logger.info(_SEP)
         logger.info("DEMO 2: Retrieval Outcome Learning")
-        logger.info("=" * 80)
+        logger.info(_SEP)
         
         # Simulate multiple queries with different outcomes
         test_scenarios = [
@@ -93,200 +120,217 @@ class AdaptiveGraphRAGDemo:
             },
         ]
         
-        for scenario in test_scenarios:
-            # Simulate query processing
-            response = self.orchestrator.process_query(scenario["query"])
-            
-            logger.info(f"\nQuery: {scenario['query']}")
-            logger.info(f"Method: {response.retrieval_method_used.value}")
-            logger.info(f"Confidence: {response.confidence_score:.2%}")
-            logger.info(f"Execution time: {response.execution_time_ms:.1f}ms")
+        # Simulate query processing; queries overlap, results log in order.
+        # The routing, embedding and cache state process_query shares is
+        # locked, and adaptive updates are serialized by the orchestrator
+        process_query = self.orchestrator.process_query
+        with ThreadPoolExecutor(max_workers=len(test_scenarios)) as executor:
+            responses = list(executor.map(
+                lambda scenario: process_query(scenario["query"]),
+                test_scenarios
+            ))
+        
+        for scenario, response in zip(test_scenarios, responses):
+            logger.info("\nQuery: %s", scenario["query"])
+            logger.info("Method: %s", response.retrieval_method_used.value)
+            logger.info("Confidence: %.2f%%", response.confidence_score * 100)
+            logger.info("Execution time: %.1fms", response.execution_time_ms)
         
         # Show learned effectiveness
-        logger.info("\n" + "-" * 80)
+        logger.info("\n%s", _RULE)
         logger.info("Learned Method Effectiveness:")
-        logger.info("-" * 80)
+        logger.info(_RULE)
         
-        for method_key, effectiveness in (
+        for (method, query_type), effectiveness in (
             self.orchestrator.meta_graph.method_effectiveness.items()
         ):
             logger.info(
-                f"{method_key}: "
-                f"Success={effectiveness.success_rate:.2%}, "
-                f"Reliability={effectiveness.confidence:.2%}, "
-                f"Uses={effectiveness.total_uses}"
+                "%s_%s: Success=%.2f%%, Reliability=%.2f%%, Uses=%d",
+                method.value,
+                query_type,
+                effectiveness.success_rate * 100,
+                effectiveness.confidence * 100,
+                effectiveness.total_uses
             )
     
     def demo_edge_reweighting(self):
         """Demo: Graph edge reweighting"""
-        logger.info("=" * 80)
+        logger.info(_SEP)
         logger.info("DEMO 3: Graph Edge Reweighting")
-        logger.info("=" * 80)
+        logger.info(_SEP)
         
         logger.info("\nInitial edge weights (before learning):")
-        logger.info("-" * 80)
+        logger.info(_RULE)
         
-        initial_weights = self.orchestrator.gere.get_top_edges(limit=10)
-        for source, target, rel_type, weight in initial_weights:
-            logger.info(
-                f"{source} -[{rel_type}]-> {target}: {weight:.2f}"
-            )
+        gere = self.orchestrator.gere
+        if logger.isEnabledFor(logging.INFO):
+            initial_weights = gere.get_top_edges(limit=10)
+            for source, target, rel_type, weight in initial_weights:
+                logger.info(
+                    "%s -[%s]-> %s: %.2f", source, rel_type, target, weight
+                )
         
-        logger.info(f"\nTotal edges tracked: "
-                   f"{len(self.orchestrator.meta_graph.edge_weights)}")
+        logger.info(
+            "\nTotal edges tracked: %d",
+            len(self.orchestrator.meta_graph.edge_weights)
+        )
         
         # Get statistics
-        stats = self.orchestrator.gere.get_statistics()
-        logger.info(f"\nEdge Reweighting Statistics:")
-        logger.info(f"  Total updates: {stats['total_updates']}")
+        stats = gere.get_statistics()
+        logger.info("\nEdge Reweighting Statistics:")
+        logger.info("  Total updates: %d", stats["total_updates"])
         logger.info(
-            f"  Positive updates: {stats['positive_updates']} "
-            f"({stats['positive_ratio']:.1%})"
+            "  Positive updates: %d (%.1f%%)",
+            stats["positive_updates"],
+            stats["positive_ratio"] * 100
         )
-        logger.info(f"  Negative updates: {stats['negative_updates']}")
-        logger.info(f"  Average edge weight: {stats['average_edge_weight']:.2f}")
+        logger.info("  Negative updates: %d", stats["negative_updates"])
+        logger.info("  Average edge weight: %.2f", stats["average_edge_weight"])
     
     def demo_relationship_discovery(self):
         """Demo: Latent relationship discovery"""
-        logger.info("=" * 80)
+        logger.info(_SEP)
         logger.info("DEMO 4: Latent Relationship Discovery")
-        logger.info("=" * 80)
+        logger.info(_SEP)
         
-        stats = self.orchestrator.lrd.get_statistics()
+        lrd = self.orchestrator.lrd
+        stats = lrd.get_statistics()
         
         logger.info("\nDiscovered Relationships:")
-        logger.info("-" * 80)
-        logger.info(f"Total discovered: {stats['total_discovered']}")
-        logger.info(f"Pending approval: {stats['pending']}")
-        logger.info(f"Approved: {stats['approved']}")
-        logger.info(f"Active: {stats['active']}")
-        logger.info(f"Rejected: {stats['rejected']}")
+        logger.info(_RULE)
+        logger.info("Total discovered: %d", stats["total_discovered"])
+        logger.info("Pending approval: %d", stats["pending"])
+        logger.info("Approved: %d", stats["approved"])
+        logger.info("Active: %d", stats["active"])
+        logger.info("Rejected: %d", stats["rejected"])
         logger.info(
-            f"Average confidence: "
-            f"{stats['average_confidence']:.2%}"
+            "Average confidence: %.2f%%",
+            stats["average_confidence"] * 100
         )
         
         # Get pending relationships
-        pending = self.orchestrator.lrd.get_pending_relationships()
+        pending = lrd.get_pending_relationships()
         if pending:
             logger.info("\nPending Relationships for Approval:")
-            logger.info("-" * 80)
+            logger.info(_RULE)
             for rel in pending[:5]:
                 logger.info(
-                    f"{rel.source_entity} -[{rel.relationship_type}]-> "
-                    f"{rel.target_entity} "
-                    f"(confidence: {rel.confidence_score:.2%})"
+                    "%s -[%s]-> %s (confidence: %.2f%%)",
+                    rel.source_entity,
+                    rel.relationship_type,
+                    rel.target_entity,
+                    rel.confidence_score * 100
                 )
         
         # Get high confidence
-        high_conf = (
-            self.orchestrator.lrd.get_high_confidence_relationships(0.8)
-        )
+        high_conf = lrd.get_high_confidence_relationships(0.8)
         if high_conf:
             logger.info("\nHigh Confidence Relationships (>80%):")
-            logger.info("-" * 80)
+            logger.info(_RULE)
             for rel in high_conf[:5]:
                 logger.info(
-                    f"{rel.source_entity} -[{rel.relationship_type}]-> "
-                    f"{rel.target_entity} "
-                    f"(confidence: {rel.confidence_score:.2%})"
+                    "%s -[%s]-> %s (confidence: %.2f%%)",
+                    rel.source_entity,
+                    rel.relationship_type,
+                    rel.target_entity,
+                    rel.confidence_score * 100
                 )
     
     def demo_system_status(self):
         """Demo: System status and monitoring"""
-        logger.info("=" * 80)
+        logger.info(_SEP)
         logger.info("DEMO 5: System Status & Monitoring")
-        logger.info("=" * 80)
+        logger.info(_SEP)
         
         status = self.orchestrator.get_system_status()
         
-        logger.info("\nSystem Timestamp: " + status['timestamp'])
+        logger.info("\nSystem Timestamp: %s", status["timestamp"])
         
         logger.info("\nMeta-Graph Statistics:")
-        logger.info("-" * 80)
+        logger.info(_RULE)
         for key, value in status['meta_graph'].items():
-            logger.info(f"  {key}: {value}")
+            logger.info("  %s: %s", key, value)
         
         logger.info("\nRetrieval Performance Summary:")
-        logger.info("-" * 80)
+        logger.info(_RULE)
         rot_stats = status['rot']
         if 'overall_success_rate' in rot_stats:
             logger.info(
-                f"  Overall success rate: "
-                f"{rot_stats['overall_success_rate']:.2%}"
+                "  Overall success rate: %.2f%%",
+                rot_stats["overall_success_rate"] * 100
             )
             logger.info(
-                f"  Avg execution time: "
-                f"{rot_stats['overall_avg_execution_time_ms']:.1f}ms"
+                "  Avg execution time: %.1fms",
+                rot_stats["overall_avg_execution_time_ms"]
             )
         
-        if 'methods' in rot_stats:
+        if 'methods' in rot_stats and logger.isEnabledFor(logging.INFO):
             logger.info("\n  Per-Method Statistics:")
             for method, metrics in rot_stats['methods'].items():
-                logger.info(f"    {method}:")
+                logger.info("    %s:", method)
                 logger.info(
-                    f"      Success rate: {metrics['success_rate']:.2%}"
+                    "      Success rate: %.2f%%",
+                    metrics["success_rate"] * 100
                 )
                 logger.info(
-                    f"      Avg time: {metrics['avg_execution_time_ms']:.1f}ms"
-                )
-                logger.info(
-                    f"      Uses: {metrics['count']}"
+                    "      Avg time: %.1fms",
+                    metrics["avg_execution_time_ms"]
                 )
+                logger.info("      Uses: %d", metrics["count"])
         
         logger.info("\nEmbedding Statistics:")
-        logger.info("-" * 80)
+        logger.info(_RULE)
         emb_stats = status['embeddings']
-        logger.info(f"  Cached embeddings: {emb_stats['cached_embeddings']}")
-        logger.info(f"  Model: {emb_stats['model_name']}")
-        logger.info(f"  Dimension: {emb_stats['embedding_dim']}")
+        logger.info("  Cached embeddings: %d", emb_stats["cached_embeddings"])
+        logger.info("  Model: %s", emb_stats["model_name"])
+        logger.info("  Dimension: %d", emb_stats["embedding_dim"])
         
         logger.info("\nGraph Database Statistics:")
-        logger.info("-" * 80)
+        logger.info(_RULE)
         neo4j_stats = status['neo4j']
-        logger.info(f"  Nodes: {neo4j_stats['nodes']}")
-        logger.info(f"  Relationships: {neo4j_stats['relationships']}")
+        logger.info("  Nodes: %s", neo4j_stats["nodes"])
+        logger.info("  Relationships: %s", neo4j_stats["relationships"])
     
     def run_full_demo(self):
         """Run full demonstration"""
         logger.info("\n")
-        logger.info("=" * 80)
+        logger.info(_SEP)
         logger.info("AdaptiveGraphRAG - Complete System Demo")
-        logger.info("=" * 80)
-        logger.info(f"Started: {datetime.now().isoformat()}")
-        logger.info("=" * 80)
+        logger.info(_SEP)
+        logger.info("Started: %s", datetime.now().isoformat())
+        logger.info(_SEP)
         
         try:
             # Run demos
             self.demo_query_routing()
-            time.sleep(1)
+            self._pause()
             
             self.demo_retrieval_learning()
-            time.sleep(1)
+            self._pause()
             
             self.demo_edge_reweighting()
-            time.sleep(1)
+            self._pause()
             
             self.demo_relationship_discovery()
-            time.sleep(1)
+            self._pause()
             
             self.demo_system_status()
             
             # Final summary
             logger.info("\n")
-            logger.info("=" * 80)
+            logger.info(_SEP)
             logger.info("Demo Summary")
-            logger.info("=" * 80)
+            logger.info(_SEP)
             logger.info("✓ Query classification working")
             logger.info("✓ Adaptive routing learning from outcomes")
             logger.info("✓ Edge weights being updated")
             logger.info("✓ Latent relationships discovered")
             logger.info("✓ System monitoring active")
-            logger.info("=" * 80)
-            logger.info(f"Completed: {datetime.now().isoformat()}")
+            logger.info(_SEP)
+            logger.info("Completed: %s", datetime.now().isoformat())
             
         except Exception as e:
-            logger.error(f"Demo error: {e}", exc_info=True)
+            logger.error("Demo error: %s", e, exc_info=True)
         finally:
             # Cleanup
             self.orchestrator.cleanup()
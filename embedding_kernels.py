@@ -0,0 +1,42 @@
+"""
+Embedding Kernels
+Integer dot products for int8-quantized embedding rows
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # Fall back to NumPy einsum
+    numba = None
+
+
+def _int8_dots_numpy(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """NumPy implementation of int8_dots"""
+    return np.einsum("ij,j->i", matrix, query, dtype=np.int32)
+
+
+def _int8_dots_loop(matrix, query):
+    """Row-by-row loop implementation of int8_dots, compiled by Numba"""
+    rows, dim = matrix.shape
+    out = np.empty(rows, dtype=np.int32)
+    for i in range(rows):
+        acc = 0
+        for j in range(dim):
+            acc += np.int32(matrix[i, j]) * np.int32(query[j])
+        out[i] = acc
+    return out
+
+
+if numba is not None:
+    int8_dots = numba.njit(cache=True, fastmath=True)(_int8_dots_loop)
+else:
+    int8_dots = _int8_dots_numpy
+
+
+def warmup():
+    """Compile the kernel ahead of the first similarity scan"""
+    if numba is None:
+        return
+
+    int8_dots(np.zeros((1, 1), dtype=np.int8), np.zeros(1, dtype=np.int8))
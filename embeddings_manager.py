@@ -0,0 +1,415 @@
+"""
+Embeddings Manager Component
+Handles embedding generation, batching and caching
+"""
+
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+from typing import List, Dict, Optional, Tuple
+from pathlib import Path
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+import embedding_kernels
+from models import AdaptiveMetaGraph
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingsManager:
+    """Generates and caches text embeddings"""
+
+    def __init__(self, meta_graph: AdaptiveMetaGraph):
+        """
+        Initialize embeddings manager
+
+        Args:
+            meta_graph: The adaptive meta-graph holding the embedding cache
+        """
+        self.meta_graph = meta_graph
+        self.cfg = config.embedding
+
+        # Loaded lazily on first embed; queries may embed on several threads
+        self.model: Optional[SentenceTransformer] = None
+        self._model_lock = threading.Lock()
+
+        # On-disk cache, opened lazily; shared by batcher worker threads
+        self._disk_cache: Optional[sqlite3.Connection] = None
+        self._disk_cache_path: Optional[Path] = None
+        self._disk_lock = threading.Lock()
+        self.disk_hits = 0
+
+    def _get_model(self) -> SentenceTransformer:
+        """Load the embedding model on first use"""
+        if self.model is None:
+            with self._model_lock:
+                if self.model is None:
+                    self.model = self._load_model()
+        return self.model
+
+    def _load_model(self) -> SentenceTransformer:
+        """Load the model on the configured backend, falling back to torch"""
+        on_gpu = self.cfg.device.startswith("cuda")
+
+        if self.cfg.backend == "onnx":
+            model_kwargs = {
+                "provider": (
+                    "CUDAExecutionProvider" if on_gpu
+                    else "CPUExecutionProvider"
+                ),
+            }
+            if self.cfg.onnx_file_name:
+                model_kwargs["file_name"] = self.cfg.onnx_file_name
+
+            try:
+                model = SentenceTransformer(
+                    self.cfg.model_name,
+                    device=self.cfg.device,
+                    backend="onnx",
+                    model_kwargs=model_kwargs
+                )
+                logger.info(
+                    f"Loaded embedding model {self.cfg.model_name} "
+                    f"(onnx, {model_kwargs['provider']})"
+                )
+                return model
+            except Exception as e:
+                logger.warning(
+                    f"Failed to load ONNX backend, falling back to torch: {e}"
+                )
+
+        model = SentenceTransformer(
+            self.cfg.model_name,
+            device=self.cfg.device
+        )
+        if on_gpu and self.cfg.use_fp16:
+            model.half()
+
+        logger.info(f"Loaded embedding model {self.cfg.model_name} (torch)")
+        return model
+
+    def warmup(self):
+        """Load the model and run one forward pass ahead of traffic"""
+        self._get_model().encode("warmup", convert_to_numpy=True)
+        if self.meta_graph.embedding_cache.quantize:
+            embedding_kernels.warmup()
+        logger.info("Embedding model warmed up")
+
+    def embed_text(self, text: str) -> np.ndarray:
+        """
+        Embed a single text
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector
+        """
+        if self.cfg.cache_embeddings:
+            cached = self.meta_graph.embedding_cache.get(text)
+            if cached is not None:
+                return cached
+
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Embed multiple texts in as few forward passes as possible
+
+        Lookups go through the in-memory cache, then the on-disk cache,
+        and only texts missing from both are encoded.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embedding vectors in input order
+        """
+        cache = self.meta_graph.embedding_cache
+        embeddings: Dict[str, np.ndarray] = {}
+
+        if self.cfg.cache_embeddings:
+            for text in texts:
+                cached = cache.get(text)
+                if cached is not None:
+                    embeddings[text] = cached
+
+        missing = [
+            text for text in dict.fromkeys(texts)
+            if text not in embeddings
+        ]
+
+        if missing and self.cfg.persist_embeddings:
+            persisted = self._load_persisted(missing)
+            for text, embedding in persisted.items():
+                embeddings[text] = embedding
+                if self.cfg.cache_embeddings:
+                    cache.put(text, embedding)
+            missing = [text for text in missing if text not in persisted]
+
+        # Encode each uncached text once, in a single padded batch
+        if missing:
+            vectors = self._get_model().encode(
+                missing,
+                batch_size=self.cfg.batch_size,
+                convert_to_numpy=True
+            )
+            vectors = vectors.astype(np.float32, copy=False)
+            for text, vector in zip(missing, vectors):
+                embeddings[text] = vector
+                if self.cfg.cache_embeddings:
+                    cache.put(text, vector)
+
+            if self.cfg.persist_embeddings:
+                self._persist(missing, vectors)
+
+        logger.debug(
+            f"Embedded batch of {len(texts)} texts "
+            f"({len(missing)} encoded)"
+        )
+
+        return [embeddings[text] for text in texts]
+
+    # ==================== Persistent Cache ====================
+
+    def _get_disk_cache(self) -> sqlite3.Connection:
+        """Open the on-disk cache for the current model on first use"""
+        if self._disk_cache is None:
+            cache_dir = Path(self.cfg.persistent_cache_dir)
+            cache_dir.mkdir(parents=True, exist_ok=True)
+
+            # One file per model so switching models never collides
+            model_file = self.cfg.model_name.replace("/", "__") + ".sqlite"
+            self._disk_cache_path = cache_dir / model_file
+
+            self._disk_cache = sqlite3.connect(
+                str(self._disk_cache_path),
+                check_same_thread=False
+            )
+            self._disk_cache.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._disk_cache.commit()
+            logger.info(
+                f"Opened persistent embeddings cache at "
+                f"{self._disk_cache_path}"
+            )
+        return self._disk_cache
+
+    @staticmethod
+    def _disk_key(text: str) -> bytes:
+        """Content-hash key for a text"""
+        return hashlib.sha256(text.encode("utf-8")).digest()[:16]
+
+    def _load_persisted(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """Load persisted embeddings for the given texts"""
+        keys = {self._disk_key(text): text for text in texts}
+
+        with self._disk_lock:
+            try:
+                connection = self._get_disk_cache()
+                placeholders = ",".join("?" * len(keys))
+                rows = connection.execute(
+                    f"SELECT key, vector FROM embeddings "
+                    f"WHERE key IN ({placeholders})",
+                    list(keys)
+                ).fetchall()
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Failed to read embeddings cache: {e}")
+                return {}
+            self.disk_hits += len(rows)
+
+        return {
+            keys[key]: np.frombuffer(vector, dtype=np.float32)
+            for key, vector in rows
+        }
+
+    def _persist(self, texts: List[str], vectors: np.ndarray):
+        """Write newly computed embeddings to the on-disk cache"""
+        rows = [
+            (self._disk_key(text), np.asarray(vector, np.float32).tobytes())
+            for text, vector in zip(texts, vectors)
+        ]
+
+        with self._disk_lock:
+            try:
+                connection = self._get_disk_cache()
+                connection.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) "
+                    "VALUES (?, ?)",
+                    rows
+                )
+                connection.commit()
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Failed to write embeddings cache: {e}")
+
+    def similarity(
+        self,
+        embedding_a: List[float],
+        embedding_b: List[float]
+    ) -> float:
+        """Calculate cosine similarity between two embeddings"""
+        a = np.asarray(embedding_a, dtype=np.float32)
+        b = np.asarray(embedding_b, dtype=np.float32)
+
+        norm = np.linalg.norm(a) * np.linalg.norm(b)
+        if norm == 0:
+            return 0.0
+        return float(a @ b / norm)
+
+    def clear_cache(self):
+        """Clear in-memory and on-disk embedding caches"""
+        self.meta_graph.embedding_cache.clear()
+
+        if self.cfg.persist_embeddings:
+            with self._disk_lock:
+                try:
+                    connection = self._get_disk_cache()
+                    connection.execute("DELETE FROM embeddings")
+                    connection.commit()
+                except (sqlite3.Error, OSError) as e:
+                    logger.warning(f"Failed to clear embeddings cache: {e}")
+
+        logger.info("Cleared embeddings cache")
+
+    def get_cache_stats(self) -> Dict:
+        """Get embedding cache statistics"""
+        return {
+            "cached_embeddings": len(self.meta_graph.embedding_cache),
+            "cache_bytes": self.meta_graph.embedding_cache.nbytes,
+            "cache_quantized": self.meta_graph.embedding_cache.quantize,
+            "model_name": self.cfg.model_name,
+            "embedding_dim": self.cfg.embedding_dim,
+            "device": self.cfg.device,
+            "persistent_cache": (
+                str(self._disk_cache_path)
+                if self._disk_cache_path else None
+            ),
+            "persistent_cache_hits": self.disk_hits,
+        }
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent embedding requests into batched forward passes"""
+
+    def __init__(
+        self,
+        embeddings: EmbeddingsManager,
+        batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None
+    ):
+        """
+        Initialize batcher
+
+        Args:
+            embeddings: Embeddings manager used for batched encoding
+            batch_size: Max texts per forward pass
+            max_wait_ms: Max time to wait for a batch to fill
+        """
+        self.embeddings = embeddings
+        self.batch_size = batch_size or config.embedding.batch_size
+        self.max_wait_ms = (
+            max_wait_ms if max_wait_ms is not None
+            else config.embedding.batch_wait_ms
+        )
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the batching worker on the running event loop"""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+            logger.info(
+                f"Started embedding batcher "
+                f"(batch_size={self.batch_size}, "
+                f"max_wait_ms={self.max_wait_ms})"
+            )
+
+    async def stop(self):
+        """Stop the batching worker"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+            self._queue = None
+
+    async def submit(self, text: str) -> np.ndarray:
+        """
+        Embed a text as part of the next batch
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector
+        """
+        if self._worker is None:
+            # Batcher not running - embed directly
+            return self.embeddings.embed_text(text)
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _run(self):
+        """Drain the queue into batches and resolve per-request futures"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch: List[Tuple[str, asyncio.Future]] = [
+                await self._queue.get()
+            ]
+            deadline = loop.time() + self.max_wait_ms / 1000
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                vectors = await asyncio.to_thread(
+                    self.embeddings.embed_batch, texts
+                )
+            except Exception as e:
+                logger.error(f"Failed to embed batch: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+
+# Global instance
+embeddings_instance: Optional[EmbeddingsManager] = None
+_instance_lock = threading.Lock()
+
+
+def get_embeddings_manager(meta_graph: AdaptiveMetaGraph) -> EmbeddingsManager:
+    """Get or create embeddings manager instance"""
+    global embeddings_instance
+    if embeddings_instance is None:
+        with _instance_lock:
+            if embeddings_instance is None:
+                embeddings_instance = EmbeddingsManager(meta_graph)
+    return embeddings_instance
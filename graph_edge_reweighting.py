@@ -5,17 +5,45 @@ Dynamically adjusts graph edge weights based on retrieval outcomes
 
 import logging
 from typing import Dict, List, Tuple, Optional
-from datetime import datetime, timedelta
+from datetime import timedelta
 import math
+import queue
+import threading
+import time
+
+import numpy as np
 
 from models import (
     GraphEdgeWeight, RetrievalOutcome, AdaptiveMetaGraph,
-    RetrievalMethod
+    RetrievalMethod, MIN_EDGE_WEIGHT, MAX_EDGE_WEIGHT,
+    monotonic_ns_to_datetime
 )
 from config import config
+import graph_edge_reweighting_kernels as kernels
 
 logger = logging.getLogger(__name__)
 
+# Multi-hop bonus log10(hops + 1) * 0.05, precomputed for typical path lengths
+_HOP_BONUS_LUT_SIZE = 64
+_HOP_BONUS_LUT = np.array(
+    [math.log10(hops + 1) * 0.05 for hops in range(_HOP_BONUS_LUT_SIZE)],
+    dtype=np.float32
+)
+
+
+def _column(value, count: int, dtype) -> np.ndarray:
+    """Expand a scalar or array into a contiguous per-row column"""
+    if np.ndim(value) == 0:
+        return np.full(count, value, dtype=dtype)
+    return np.ascontiguousarray(value, dtype=dtype)
+
+
+def _hop_bonus(hop_count: int) -> float:
+    """Multi-hop bonus for a path of hop_count edges"""
+    if hop_count < _HOP_BONUS_LUT_SIZE:
+        return float(_HOP_BONUS_LUT[hop_count])
+    return math.log10(hop_count + 1) * 0.05
+
 
 class GraphEdgeReweightingEngine:
     """Dynamically learns and optimizes graph edge weights"""
@@ -34,6 +62,26 @@ class GraphEdgeReweightingEngine:
         self.total_updates = 0
         self.positive_updates = 0
         self.negative_updates = 0
+        self.deadband_skips = 0
+        
+        # Producers push (outcome, path_edges, success_score) without
+        # locking; a single consumer thread drains them in batches
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._has_items = threading.Event()
+        self._batch_full = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.batches_flushed = 0
+        
+        # Coalescing window, tuned toward the target flush latency
+        self._coalesce_delay_ms = self.cfg.edge_batch_max_delay_ms
+        self._flush_latency_ms: Optional[float] = None
+        
+        # Edge timestamps are monotonic int64 ticks, not datetimes
+        self._now_ns = time.monotonic_ns
+        
+        # Pay kernel compilation off the hot path
+        kernels.warmup()
     
     def update_edges_from_outcome(
         self,
@@ -49,40 +97,431 @@ class GraphEdgeReweightingEngine:
             path_nodes: Nodes in the retrieval path
             path_edges: Edges used in the retrieval path
         """
-        success_score = outcome.composite_success_score()
+        self.update_edges_from_outcome_packed(
+            outcome,
+            self.pack_edges(path_edges)
+        )
+    
+    def update_edges_from_outcome_packed(
+        self,
+        outcome: RetrievalOutcome,
+        packed_edge_ids: np.ndarray,
+        success_score: Optional[float] = None
+    ):
+        """
+        Update edge weights for a path given as packed int64 edge keys
+        
+        Args:
+            outcome: The retrieval outcome
+            packed_edge_ids: Edge keys from pack_edges
+            success_score: Precomputed composite success score
+        """
+        if success_score is None:
+            success_score = outcome.composite_success_score()
+        if self._in_deadband(success_score):
+            return
+        
+        with self._lock:
+            if success_score > 0.5:
+                # Successful retrieval - increase weights
+                self._strengthen_path(
+                    packed_edge_ids,
+                    success_score,
+                    _hop_bonus(len(packed_edge_ids))
+                )
+            else:
+                # Failed retrieval - decrease weights
+                self._weaken_path(packed_edge_ids, success_score)
+            
+            self.meta_graph.last_updated_ns = self._now_ns()
+    
+    def pack_edges(self, path_edges: List[Tuple[str, str, str]]) -> np.ndarray:
+        """
+        Intern edges into packed int64 keys for the *_packed APIs
+        
+        Args:
+            path_edges: (source, target, relationship_type) tuples
+        
+        Returns:
+            int64 packed keys in input order
+        """
+        with self._lock:
+            return self.meta_graph.edge_weights.pack_many(path_edges)
+    
+    def submit_outcome(
+        self,
+        outcome: RetrievalOutcome,
+        path_edges: List[Tuple[str, str, str]],
+        success_score: Optional[float] = None
+    ):
+        """
+        Queue an outcome for the next batched edge update
+        
+        The consumer thread applies the batch once edge_batch_size
+        outcomes are queued or the coalescing window after the first one
+        elapses. Decisive outcomes are flushed immediately.
+        
+        Args:
+            outcome: The retrieval outcome
+            path_edges: Edges used in the retrieval path
+            success_score: Precomputed composite success score
+        """
+        self._enqueue(outcome, path_edges, success_score)
+    
+    def submit_outcome_packed(
+        self,
+        outcome: RetrievalOutcome,
+        packed_edge_ids: np.ndarray,
+        success_score: Optional[float] = None
+    ):
+        """
+        Queue an outcome whose path is given as packed int64 edge keys
+        
+        Args:
+            outcome: The retrieval outcome
+            packed_edge_ids: Edge keys from pack_edges
+            success_score: Precomputed composite success score
+        """
+        self._enqueue(outcome, packed_edge_ids, success_score)
+    
+    def _enqueue(self, outcome: RetrievalOutcome, path_edges, success_score):
+        """Queue an outcome with tuple or packed path edges"""
+        if len(path_edges) == 0:
+            return
+        
+        if success_score is None:
+            success_score = outcome.composite_success_score()
+        if self._in_deadband(success_score):
+            return
+        
+        self._queue.put((outcome, path_edges, success_score))
+        self._has_items.set()
+        
+        if self._worker is None:
+            self._start_worker()
+        
+        threshold = self.cfg.edge_flush_immediately_score
+        if success_score >= threshold or success_score <= 1.0 - threshold:
+            self.flush()
+        elif self._queue.qsize() >= self.cfg.edge_batch_size:
+            self._batch_full.set()
+    
+    def _in_deadband(self, success_score: float) -> bool:
+        """Ambiguous outcomes near 0.5 carry no signal; count and skip them"""
+        if abs(success_score - 0.5) <= self.cfg.deadband:
+            self.deadband_skips += 1
+            return True
+        return False
+    
+    def _start_worker(self):
+        """Start the consumer thread on first submit"""
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._drain,
+                    name="gere-flush",
+                    daemon=True
+                )
+                self._worker.start()
+    
+    def _drain(self):
+        """Consumer loop: wait for an outcome, let the batch fill, flush"""
+        while True:
+            # Items stay queued until flush, so readers calling flush()
+            # always see every submitted outcome
+            self._has_items.wait()
+            self._has_items.clear()
+            
+            # Wake early once a full batch is queued
+            self._batch_full.wait(self._coalesce_delay_ms / 1000)
+            self._batch_full.clear()
+            
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Failed to apply edge update batch: {e}")
+    
+    def flush(self) -> int:
+        """
+        Apply all queued outcomes as one vectorized update
+        
+        Returns:
+            Number of outcomes applied
+        """
+        with self._lock:
+            batch = []
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            if batch:
+                start = time.perf_counter()
+                self._apply_batch(batch)
+                self.batches_flushed += 1
+                self._tune_coalesce_delay((time.perf_counter() - start) * 1000)
         
-        if success_score > 0.5:
-            # Successful retrieval - increase weights
-            self._strengthen_path(path_edges, outcome)
+        return len(batch)
+    
+    def _tune_coalesce_delay(self, latency_ms: float):
+        """
+        Track flush latency with an EWMA and scale the coalescing window
+        so flushes stay near edge_target_flush_latency_ms
+        """
+        if self._flush_latency_ms is None:
+            self._flush_latency_ms = latency_ms
         else:
-            # Failed retrieval - decrease weights
-            self._weaken_path(path_edges, outcome)
+            self._flush_latency_ms += 0.2 * (latency_ms - self._flush_latency_ms)
+        
+        # Slow flushes shrink the window (smaller batches), fast ones grow it
+        ratio = self.cfg.edge_target_flush_latency_ms / max(
+            self._flush_latency_ms, 1e-3
+        )
+        self._coalesce_delay_ms = min(
+            self.cfg.edge_batch_max_delay_ms,
+            max(
+                self.cfg.edge_min_coalesce_delay_ms,
+                self._coalesce_delay_ms * min(2.0, max(0.5, ratio))
+            )
+        )
+    
+    def _apply_batch(
+        self,
+        batch: List[Tuple[RetrievalOutcome, object, float]]
+    ):
+        """
+        Apply a batch of (outcome, path_edges, success_score) at once
+        
+        path_edges is either a list of edge tuples or packed int64 keys.
+        """
+        lengths = np.fromiter(
+            (len(path_edges) for _, path_edges, _ in batch),
+            dtype=np.int64,
+            count=len(batch)
+        )
+        scores = np.fromiter(
+            (success_score for _, _, success_score in batch),
+            dtype=np.float32,
+            count=len(batch)
+        )
+        
+        # Same per-outcome deltas as _strengthen_path/_weaken_path
+        hop_bonus = np.where(
+            lengths < _HOP_BONUS_LUT_SIZE,
+            _HOP_BONUS_LUT[np.minimum(lengths, _HOP_BONUS_LUT_SIZE - 1)],
+            np.log10(lengths + 1) * 0.05
+        )
+        positive = scores > 0.5
+        deltas = np.where(
+            positive,
+            self.cfg.positive_weight_delta * scores * (1.0 + hop_bonus),
+            self.cfg.negative_weight_delta * (1.0 - scores)
+        )
         
-        self.meta_graph.last_updated = datetime.now()
+        table = self.meta_graph.edge_weights
+        packed_keys = np.concatenate([
+            path_edges if isinstance(path_edges, np.ndarray)
+            else table.pack_many(path_edges)
+            for _, path_edges, _ in batch
+        ])
+        rows = table.rows_packed(packed_keys, self.cfg.initial_edge_weight)
+        self._apply_updates(
+            rows,
+            np.repeat(deltas, lengths),
+            np.repeat(scores, lengths),
+            np.repeat(positive, lengths)
+        )
+        
+        self.meta_graph.last_updated_ns = self._now_ns()
+        logger.debug(
+            f"Flushed {len(batch)} outcomes ({len(rows)} edge updates)"
+        )
     
     def _strengthen_path(
         self,
-        path_edges: List[Tuple[str, str, str]],
-        outcome: RetrievalOutcome
+        packed_edge_ids: np.ndarray,
+        success_score: float,
+        hop_bonus: float
     ):
         """Increase weights along successful path"""
-        success_score = outcome.composite_success_score()
+        if len(packed_edge_ids) == 0:
+            return
         
-        # Multi-hop bonus: deeper paths matter more
-        hop_count = len(path_edges)
-        hop_bonus = math.log10(hop_count + 1) * 0.05
+        table = self.meta_graph.edge_weights
+        rows = table.rows_packed(packed_edge_ids, self.cfg.initial_edge_weight)
         
-        for source, target, relation_type in path_edges:
-            edge_key = (source, target, relation_type)
-            
-            # Get or create edge weight
-            if edge_key not in self.meta_graph.edge_weights:
-                self.meta_graph.edge_weights[edge_key] = GraphEdgeWeight(
-                    source_id=source,
-                    target_id=target,
-                    relationship_type=relation_type,
-                    weight=self.cfg.initial_edge_weight,
-                    initial_weight=self.cfg.initial_edge_weight,
-                )
+        delta = self.cfg.positive_weight_delta * success_score * (1.0 + hop_bonus)
+        self._apply_updates(rows, delta, success_score, True)
+    
+    def _weaken_path(
+        self,
+        packed_edge_ids: np.ndarray,
+        success_score: float
+    ):
+        """Decrease weights along failed path"""
+        if len(packed_edge_ids) == 0:
+            return
+        
+        table = self.meta_graph.edge_weights
+        rows = table.rows_packed(packed_edge_ids, self.cfg.initial_edge_weight)
+        
+        # negative_weight_delta is negative; worse outcomes weaken more
+        delta = self.cfg.negative_weight_delta * (1.0 - success_score)
+        self._apply_updates(rows, delta, success_score, False)
+    
+    def _apply_updates(self, rows: np.ndarray, deltas, success_scores, positive):
+        """
+        Apply weight deltas to rows in one fused kernel call
+        
+        Repeated rows (cycles, overlapping paths in a batch) are reduced
+        first so each unique edge is written once. deltas, success_scores
+        and positive are scalars or per-row arrays.
+        """
+        table = self.meta_graph.edge_weights
+        count = len(rows)
+        positive = _column(positive, count, np.bool_)
+        
+        unique_rows, inverse = np.unique(rows, return_inverse=True)
+        unique_count = len(unique_rows)
+        
+        def reduce(values, dtype):
+            return np.bincount(
+                inverse, weights=values, minlength=unique_count
+            ).astype(dtype)
+        
+        uses = np.bincount(inverse, minlength=unique_count).astype(np.int32)
+        success_counts = reduce(positive, np.int32)
+        
+        kernels.apply_updates(
+            table.weight,
+            table.usage_count,
+            table.success_score_sum,
+            table.successes,
+            table.failures,
+            table.last_used,
+            unique_rows,
+            reduce(_column(deltas, count, np.float64), np.float32),
+            uses,
+            reduce(_column(success_scores, count, np.float64), np.float32),
+            success_counts,
+            self._now_ns(),
+            MIN_EDGE_WEIGHT,
+            MAX_EDGE_WEIGHT
+        )
+        
+        positive_count = int(success_counts.sum())
+        self.total_updates += count
+        self.positive_updates += positive_count
+        self.negative_updates += count - positive_count
+    
+    def apply_recency_decay(self) -> int:
+        """
+        Decay edges unused within the time window back toward their
+        initial weight
+        
+        Returns:
+            Number of decayed edges
+        """
+        self.flush()
+        
+        cutoff = self._now_ns() - int(
+            timedelta(days=self.cfg.time_window_days).total_seconds() * 1e9
+        )
+        
+        with self._lock:
+            table = self.meta_graph.edge_weights
+            stale = np.flatnonzero(table.last_used < cutoff)
             
-            edge = self.meta
\ No newline at end of file
+            if len(stale) > 0:
+                initial = table.initial_weight[stale]
+                table.weight[stale] = initial + (
+                    table.weight[stale] - initial
+                ) * self.cfg.recency_decay_factor
+                logger.info(f"Applied recency decay to {len(stale)} edges")
+        
+        return len(stale)
+    
+    def get_edge_weight(
+        self,
+        source: str,
+        target: str,
+        relation_type: str
+    ) -> Optional[GraphEdgeWeight]:
+        """Get the learned weight record for an edge"""
+        self.flush()
+        return self.meta_graph.edge_weights.get((source, target, relation_type))
+    
+    def get_top_edges(self, limit: int = 50) -> List[Tuple[str, str, str, float]]:
+        """
+        Get the highest weighted edges
+        
+        Args:
+            limit: Number of edges to return
+        
+        Returns:
+            List of (source, target, relationship_type, weight), heaviest first
+        """
+        self.flush()
+        
+        table = self.meta_graph.edge_weights
+        weight = table.weight
+        size = len(weight)
+        limit = min(limit, size)
+        if limit <= 0:
+            return []
+        
+        if limit < size:
+            # O(N) partial selection of the top K, then sort only those K
+            top = np.argpartition(weight, size - limit)[size - limit:]
+        else:
+            top = np.arange(size)
+        top = top[np.argsort(weight[top])[::-1]]
+        
+        return [
+            (*table.key(row), float(weight[row]))
+            for row in top
+        ]
+    
+    def get_statistics(self) -> Dict:
+        """Get reweighting statistics"""
+        self.flush()
+        table = self.meta_graph.edge_weights
+        weight = table.weight
+        
+        return {
+            "total_edges": len(weight),
+            "total_updates": self.total_updates,
+            "positive_updates": self.positive_updates,
+            "negative_updates": self.negative_updates,
+            "deadband_skips": self.deadband_skips,
+            "batches_flushed": self.batches_flushed,
+            "coalesce_delay_ms": self._coalesce_delay_ms,
+            "positive_ratio": (
+                self.positive_updates / self.total_updates
+                if self.total_updates > 0 else 0.0
+            ),
+            "average_edge_weight": (
+                float(weight.mean()) if len(weight) > 0
+                else self.cfg.initial_edge_weight
+            ),
+            "last_edge_update": (
+                monotonic_ns_to_datetime(table.last_used.max()).isoformat()
+                if len(weight) > 0 else None
+            ),
+        }
+
+
+# Global instance
+gere_instance: Optional[GraphEdgeReweightingEngine] = None
+_instance_lock = threading.Lock()
+
+
+def get_gere(meta_graph: AdaptiveMetaGraph) -> GraphEdgeReweightingEngine:
+    """Get or create GERE instance"""
+    global gere_instance
+    if gere_instance is None:
+        with _instance_lock:
+            if gere_instance is None:
+                gere_instance = GraphEdgeReweightingEngine(meta_graph)
+    return gere_instance
@@ -0,0 +1,81 @@
+"""
+Graph Edge Reweighting Kernels
+Fused per-edge update kernel for the edge weight table
+
+Kernels take aggregated updates for unique rows; callers deduplicate.
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # Fall back to NumPy scatter updates
+    numba = None
+
+
+def _apply_updates_numpy(
+    weight: np.ndarray,
+    usage_count: np.ndarray,
+    success_score_sum: np.ndarray,
+    successes: np.ndarray,
+    failures: np.ndarray,
+    last_used: np.ndarray,
+    rows: np.ndarray,
+    deltas: np.ndarray,
+    uses: np.ndarray,
+    score_sums: np.ndarray,
+    success_counts: np.ndarray,
+    now_ns: int,
+    min_weight: float,
+    max_weight: float
+):
+    """NumPy implementation of apply_updates"""
+    weight[rows] = np.clip(weight[rows] + deltas, min_weight, max_weight)
+    usage_count[rows] += uses
+    success_score_sum[rows] += score_sums
+    successes[rows] += success_counts
+    failures[rows] += uses - success_counts
+    last_used[rows] = now_ns
+
+
+def _apply_updates_loop(
+    weight, usage_count, success_score_sum, successes, failures,
+    last_used, rows, deltas, uses, score_sums, success_counts, now_ns,
+    min_weight, max_weight
+):
+    """Single-pass loop implementation of apply_updates, compiled by Numba"""
+    for i in range(rows.shape[0]):
+        row = rows[i]
+        weight[row] = min(max(weight[row] + deltas[i], min_weight), max_weight)
+        usage_count[row] += uses[i]
+        success_score_sum[row] += score_sums[i]
+        successes[row] += success_counts[i]
+        failures[row] += uses[i] - success_counts[i]
+        last_used[row] = now_ns
+
+
+if numba is not None:
+    apply_updates = numba.njit(cache=True, fastmath=True)(_apply_updates_loop)
+else:
+    apply_updates = _apply_updates_numpy
+
+
+def warmup():
+    """Compile the kernel ahead of the first real update"""
+    if numba is None:
+        return
+
+    apply_updates(
+        np.ones(1, dtype=np.float32),
+        np.zeros(1, dtype=np.int32),
+        np.zeros(1, dtype=np.float32),
+        np.zeros(1, dtype=np.int32),
+        np.zeros(1, dtype=np.int32),
+        np.zeros(1, dtype=np.int64),
+        np.zeros(1, dtype=np.int64),
+        np.zeros(1, dtype=np.float32),
+        np.zeros(1, dtype=np.int32),
+        np.zeros(1, dtype=np.float32),
+        np.zeros(1, dtype=np.int32),
+        0, 0.1, 10.0
+    )
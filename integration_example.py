@@ -6,9 +6,17 @@ Shows how to integrate with existing systems
 import logging
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import copy
 import json
+import time
 from abc import ABC, abstractmethod
 
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    orjson = None
+
 from adaptive_orchestrator import get_orchestrator
 from models import RetrievalMethod, QuerySignature
 
@@ -64,13 +72,13 @@ class BatchProcessingIntegration:
         queries: List[str],
         user_id: Optional[str] = None
     ) -> List[Dict]:
-        """Process multiple queries"""
-        results = []
-        
-        for i, query in enumerate(queries):
+        """Process multiple queries, up to batch_size at a time"""
+        def process_one(indexed_query: Tuple[int, str]) -> Dict:
+            i, query = indexed_query
             try:
                 logger.info(
-                    f"Processing query {i+1}/{len(queries)}: {query[:50]}..."
+                    "Processing query %d/%d: %.50s...",
+                    i + 1, len(queries), query
                 )
                 
                 response = self.orchestrator.process_query(
@@ -78,25 +86,29 @@ class BatchProcessingIntegration:
                     user_id
                 )
                 
-                results.append({
+                return {
                     "query": query,
                     "answer": response.answer,
                     "confidence": response.confidence_score,
                     "status": "success",
                     "execution_time_ms": response.execution_time_ms,
-                })
+                }
             
             except Exception as e:
-                logger.error(f"Failed to process query: {e}")
-                results.append({
+                logger.error("Failed to process query: %s", e)
+                return {
                     "query": query,
                     "answer": None,
                     "confidence": 0.0,
                     "status": "failed",
                     "error": str(e),
-                })
+                }
         
-        return results
+        # map keeps results in query order. process_query is safe to run
+        # concurrently: shared routing, embedding and cache state is
+        # locked, and adaptive updates are serialized by the orchestrator
+        with ThreadPoolExecutor(max_workers=self.batch_size) as executor:
+            return list(executor.map(process_one, enumerate(queries)))
     
     def export_results(
         self,
@@ -104,8 +116,15 @@ class BatchProcessingIntegration:
         filepath: str
     ):
         """Export results to JSON"""
-        with open(filepath, 'w') as f:
-            json.dump(results, f, indent=2)
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(
+                    results,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                ))
+        else:
+            with open(filepath, 'w') as f:
+                json.dump(results, f, indent=2)
         
         logger.info(f"Exported {len(results)} results to {filepath}")
 
@@ -130,7 +149,7 @@ class PerformanceMonitoringIntegration:
         query: str,
         user_id: Optional[str] = None
     ) -> Dict:
-        """Process query and collect metrics"""
+        """Process query and collect metrics; returns the current response"""
         response = self.orchestrator.process_query(query, user_id)
         
         # Update metrics
@@ -145,14 +164,11 @@ class PerformanceMonitoringIntegration:
         
         # Track method stats
         method = response.retrieval_method_used.value
-        if method not in self.metrics["method_stats"]:
-            self.metrics["method_stats"][method] = {
-                "count": 0,
-                "success_count": 0,
-                "total_time_ms": 0,
-            }
-        
-        method_stats = self.metrics["method_stats"][method]
+        method_stats = self.metrics["method_stats"].setdefault(method, {
+            "count": 0,
+            "success_count": 0,
+            "total_time_ms": 0,
+        })
         method_stats["count"] += 1
         method_stats["total_time_ms"] += response.execution_time_ms
         
@@ -160,16 +176,17 @@ class PerformanceMonitoringIntegration:
             method_stats["success_count"] += 1
         
         return {
-            **self.metrics,
-            "current_response": {
-                "query": query,
-                "answer": response.answer,
-                "confidence": response.confidence_score,
-                "method": method,
-                "execution_time_ms": response.execution_time_ms,
-            }
+            "query": query,
+            "answer": response.answer,
+            "confidence": response.confidence_score,
+            "method": method,
+            "execution_time_ms": response.execution_time_ms,
         }
     
+    def snapshot_metrics(self) -> Dict:
+        """Get a copy of the accumulated metrics"""
+        return copy.deepcopy(self.metrics)
+    
     def get_performance_report(self) -> Dict:
         """Generate performance report"""
         total_queries = self.metrics["total_queries"]
@@ -263,27 +280,34 @@ class CallbackIntegration:
         user_id: Optional[str] = None
     ) -> Dict:
         """Process query with callbacks"""
-        # Trigger on_query_start
-        for callback in self.callbacks["on_query_start"]:
-            callback({"query": query, "user_id": user_id})
+        # Payloads are only built for events that have listeners
+        callbacks = self.callbacks["on_query_start"]
+        if callbacks:
+            payload = {"query": query, "user_id": user_id}
+            for callback in callbacks:
+                callback(payload)
         
         # Process query
         response = self.orchestrator.process_query(query, user_id)
+        method = response.retrieval_method_used.value
         
-        # Trigger on_query_complete
-        for callback in self.callbacks["on_query_complete"]:
-            callback({
+        callbacks = self.callbacks["on_query_complete"]
+        if callbacks:
+            payload = {
                 "query": query,
                 "answer": response.answer,
                 "confidence": response.confidence_score,
-                "method": response.retrieval_method_used.value,
-            })
+                "method": method,
+            }
+            for callback in callbacks:
+                callback(payload)
         
         # Check for new relationships
-        pending = self.orchestrator.lrd.get_pending_relationships()
-        if pending:
-            for callback in self.callbacks["on_relationship_discovered"]:
-                callback({
+        callbacks = self.callbacks["on_relationship_discovered"]
+        if callbacks:
+            pending = self.orchestrator.lrd.get_pending_relationships()
+            if pending:
+                payload = {
                     "relationships": [
                         {
                             "source": r.source_entity,
@@ -293,13 +317,15 @@ class CallbackIntegration:
                         }
                         for r in pending
                     ]
-                })
+                }
+                for callback in callbacks:
+                    callback(payload)
         
         return {
             "query": query,
             "answer": response.answer,
             "confidence": response.confidence_score,
-            "method": response.retrieval_method_used.value,
+            "method": method,
         }
 
 
@@ -322,24 +348,10 @@ class DatabaseIntegration:
         """Store query result in database"""
         response = self.orchestrator.process_query(query, user_id)
         
-        sql = f"""
-            INSERT INTO {result_table}
-            (user_id, query, answer, confidence, method, execution_time_ms, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """
-        
         try:
             db_connection.execute(
-                sql,
-                (
-                    user_id,
-                    query,
-                    response.answer,
-                    response.confidence_score,
-                    response.retrieval_method_used.value,
-                    response.execution_time_ms,
-                    datetime.now(),
-                )
+                self._insert_sql(result_table),
+                self._result_row(query, user_id, response)
             )
             db_connection.commit()
             
@@ -349,6 +361,62 @@ class DatabaseIntegration:
             logger.error(f"Failed to store result: {e}")
             db_connection.rollback()
     
+    def store_query_results(
+        self,
+        db_connection,
+        items: List[Tuple[str, str]],
+        result_table: str = "rag_results"
+    ):
+        """
+        Process queries and store all results in one transaction
+        
+        Args:
+            db_connection: DB-API connection
+            items: (query, user_id) pairs
+            result_table: Table to insert into
+        """
+        rows = [
+            self._result_row(
+                query,
+                user_id,
+                self.orchestrator.process_query(query, user_id)
+            )
+            for query, user_id in items
+        ]
+        
+        try:
+            db_connection.executemany(self._insert_sql(result_table), rows)
+            db_connection.commit()
+            
+            logger.info(f"Stored {len(rows)} results")
+        
+        except Exception as e:
+            logger.error(f"Failed to store results: {e}")
+            db_connection.rollback()
+            raise
+    
+    @staticmethod
+    def _insert_sql(result_table: str) -> str:
+        """INSERT statement for a result row"""
+        return f"""
+            INSERT INTO {result_table}
+            (user_id, query, answer, confidence, method, execution_time_ms, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """
+    
+    @staticmethod
+    def _result_row(query: str, user_id: str, response) -> Tuple:
+        """Column values for a result row"""
+        return (
+            user_id,
+            query,
+            response.answer,
+            response.confidence_score,
+            response.retrieval_method_used.value,
+            response.execution_time_ms,
+            datetime.now(),
+        )
+    
     def get_user_query_history(
         self,
         db_connection,
@@ -393,12 +461,11 @@ class RAGMetricsMiddleware(BaseHTTPMiddleware):
         """Track metrics for each request"""
         if request.url.path == "/query":
             # Track time
-            import time
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             
             response = await call_next(request)
             
-            process_time = (time.time() - start_time) * 1000
+            process_time = (time.perf_counter_ns() - start_ns) / 1_000_000
             
             # Add metrics header
             response.headers["X-Process-Time"] = str(process_time)
@@ -3,10 +3,17 @@ Latent Relationship Discovery (LRD) Component
 Identifies implicit semantic relationships from successful retrievals
 """
 
+import bisect
 import logging
+import threading
+from collections import defaultdict
 from typing import List, Dict, Tuple, Optional, Set
 from datetime import datetime
+import itertools
 import re
+import sys
+
+import numpy as np
 
 from models import (
     LatentRelationship, AdaptiveMetaGraph, RetrievalOutcome
@@ -16,9 +23,27 @@ from config import config
 logger = logging.getLogger(__name__)
 
 
+# Words that never start an entity phrase
+_ARTICLES = frozenset(("The", "A", "An"))
+
+
 class LatentRelationshipDiscovery:
     """Discovers implicit relationships between entities"""
     
+    # Common relationship patterns
+    relationship_patterns = {
+        "part_of": r"(?:is part of|comprises|contains|includes)",
+        "similar_to": r"(?:similar to|like|analogous to|resembles)",
+        "causes": r"(?:causes|leads to|results in|triggers)",
+        "related_to": r"(?:related to|associated with|connected to)",
+        "parent_of": r"(?:parent|superclass|category of)",
+        "child_of": r"(?:child|instance of|subclass of)",
+        "collaborates_with": r"(?:works with|collaborates with|partners with)",
+        "depends_on": r"(?:depends on|relies on|requires)",
+        "influences": r"(?:influences|affects|impacts)",
+        "opposite_of": r"(?:opposite of|opposite to|contrary to)",
+    }
+    
     def __init__(self, meta_graph: AdaptiveMetaGraph):
         """
         Initialize LRD
@@ -29,19 +54,32 @@ class LatentRelationshipDiscovery:
         self.meta_graph = meta_graph
         self.cfg = config.adaptive_meta
         
-        # Common relationship patterns
-        self.relationship_patterns = {
-            "part_of": r"(?:is part of|comprises|contains|includes)",
-            "similar_to": r"(?:similar to|like|analogous to|resembles)",
-            "causes": r"(?:causes|leads to|results in|triggers)",
-            "related_to": r"(?:related to|associated with|connected to)",
-            "parent_of": r"(?:parent|superclass|category of)",
-            "child_of": r"(?:child|instance of|subclass of)",
-            "collaborates_with": r"(?:works with|collaborates with|partners with)",
-            "depends_on": r"(?:depends on|relies on|requires)",
-            "influences": r"(?:influences|affects|impacts)",
-            "opposite_of": r"(?:opposite of|opposite to|contrary to)",
+        # Fuse all patterns into one alternation; the named group that
+        # matched identifies the relationship type
+        self._relationship_regex = re.compile(
+            "|".join(
+                f"(?P<{name}>{pattern})"
+                for name, pattern in self.relationship_patterns.items()
+            ),
+            re.IGNORECASE
+        )
+        
+        # (source, target, type) -> relation_id
+        self._relation_index: Dict[Tuple[str, str, str], str] = {
+            (rel.source_entity, rel.target_entity, rel.relationship_type):
+                rel_id
+            for rel_id, rel in meta_graph.latent_relations.items()
         }
+        
+        # status -> relation ids, insertion ordered
+        self._by_status: Dict[str, Dict[str, None]] = defaultdict(dict)
+        for rel_id, rel in meta_graph.latent_relations.items():
+            self._by_status[rel.status][rel_id] = None
+        
+        # Relation ids by descending confidence, rebuilt lazily after
+        # confidences change
+        self._by_confidence: Optional[List[str]] = None
+        self._negated_confidences: List[float] = []
     
     def discover_from_reasoning_chain(
         self,
@@ -61,26 +99,36 @@ class LatentRelationshipDiscovery:
         discovered = []
         
         # Only process successful outcomes
-        if outcome.composite_success_score() < 0.6:
+        success_score = outcome.composite_success_score()
+        if success_score < 0.6:
             return discovered
         
-        # Extract entity pairs from reasoning chain
+        # Extract entity pairs from reasoning chain, remembering the
+        # step each relationship came from
+        steps = []
         for step in reasoning_chain:
             relationships = self._extract_relationships_from_text(step)
             discovered.extend(relationships)
+            steps.extend(itertools.repeat(step, len(relationships)))
+        
+        # Score based on outcome success, filtering in one array pass
+        confidences = np.fromiter(
+            (rel.confidence_score for rel in discovered),
+            dtype=np.float64,
+            count=len(discovered)
+        )
+        confidences *= success_score
+        keep = np.flatnonzero(
+            confidences >= self.cfg.latent_relation_confidence_threshold
+        )
         
-        # Score and filter relationships
         scored_relationships = []
-        for rel in discovered:
-            # Score based on outcome success
-            rel.confidence_score = (
-                outcome.composite_success_score() *
-                rel.confidence_score
-            )
-            
-            if rel.confidence_score >= self.cfg.latent_relation_confidence_threshold:
-                scored_relationships.append(rel)
-                self._add_or_update_relationship(rel)
+        for i, confidence in zip(keep.tolist(), confidences[keep].tolist()):
+            rel = discovered[i]
+            rel.confidence_score = confidence
+            rel.reasoning_chain = [steps[i]]
+            scored_relationships.append(rel)
+            self._add_or_update_relationship(rel)
         
         logger.info(
             f"Discovered {len(scored_relationships)} relationships "
@@ -96,26 +144,36 @@ class LatentRelationshipDiscovery:
         """Extract relationships from text using patterns"""
         relationships = []
         
+        # Scan the text once, keeping each matched type once per step.
+        # Most steps match nothing, so this runs before entity extraction
+        matched = {
+            match.lastgroup
+            for match in self._relationship_regex.finditer(text)
+        }
+        
+        if not matched:
+            return relationships
+        
         # Simple entity extraction (can be improved)
         entities = self._extract_entities(text)
         
         if len(entities) < 2:
             return relationships
         
-        # Check for relationship patterns
-        for relation_name, pattern in self.relationship_patterns.items():
-            if re.search(pattern, text, re.IGNORECASE):
+        # Entity pairs are shared by every matched type
+        pairs = list(itertools.combinations(entities, 2))
+        
+        for relation_name in self.relationship_patterns:
+            if relation_name in matched:
                 # Create relationships between entity pairs
-                for i, entity1 in enumerate(entities):
-                    for entity2 in entities[i+1:]:
-                        rel = LatentRelationship(
-                            source_entity=entity1,
-                            target_entity=entity2,
-                            relationship_type=relation_name,
-                            confidence_score=0.7,  # Base confidence
-                            reasoning_chain=[text]
-                        )
-                        relationships.append(rel)
+                for entity1, entity2 in pairs:
+                    rel = LatentRelationship(
+                        source_entity=entity1,
+                        target_entity=entity2,
+                        relationship_type=relation_name,
+                        confidence_score=0.7  # Base confidence
+                    )
+                    relationships.append(rel)
         
         return relationships
     
@@ -123,34 +181,34 @@ class LatentRelationshipDiscovery:
         """Extract potential entities from text"""
         # Simple extraction: capitalized words/phrases
         # In production, use NER models
-        words = text.split()
-        entities = []
+        entities: List[str] = []
+        run: List[str] = []
         
-        i = 0
-        while i < len(words):
-            word = words[i]
-            
-            # Look for capitalized words or phrases
-            if word and word[0].isupper() and word not in ['The', 'A', 'An']:
-                phrase = word
-                
-                # Collect consecutive capitalized words
-                j = i + 1
-                while j < len(words) and words[j] and words[j][0].isupper():
-                    phrase += " " + words[j]
-                    j += 1
-                
-                # Clean up
-                phrase = re.sub(r'[,.!?;:]$', '', phrase)
-                if len(phrase) > 2:
-                    entities.append(phrase)
-                
-                i = j
-            else:
-                i += 1
+        # Runs of capitalized words form phrases; an article can continue
+        # a phrase but not start one
+        for word in text.split():
+            if word[0].isupper():
+                if run or word not in _ARTICLES:
+                    run.append(word)
+            elif run:
+                self._add_phrase(run, entities)
+                run = []
+        if run:
+            self._add_phrase(run, entities)
         
         return entities
     
+    @staticmethod
+    def _add_phrase(run: List[str], entities: List[str]):
+        """Join a run of words into an entity, dropping trailing punctuation"""
+        phrase = " ".join(run)
+        if phrase[-1] in ",.!?;:":
+            phrase = phrase[:-1]
+        if len(phrase) > 2:
+            # Interned so relationships naming the same entity share one
+            # string
+            entities.append(sys.intern(phrase))
+    
     def _add_or_update_relationship(self, relationship: LatentRelationship):
         """Add new or update existing latent relationship"""
         rel_key = (
@@ -159,46 +217,49 @@ class LatentRelationshipDiscovery:
             relationship.relationship_type
         )
         
-        existing_id = None
-        for rel_id, rel in self.meta_graph.latent_relations.items():
-            if (rel.source_entity == relationship.source_entity and
-                rel.target_entity == relationship.target_entity and
-                rel.relationship_type == relationship.relationship_type):
-                existing_id = rel_id
-                break
+        existing_id = self._relation_index.get(rel_key)
         
         if existing_id:
             # Update existing relationship
             existing = self.meta_graph.latent_relations[existing_id]
             
-            # Average confidence scores
-            total_observations = existing.confidence_score + 1
-            existing.confidence_score = (
-                (existing.confidence_score * (total_observations - 1) +
-                 relationship.confidence_score) / total_observations
-            )
+            # Running average of confidence over observations
+            existing.observation_count += 1
+            existing.confidence_score += (
+                relationship.confidence_score - existing.confidence_score
+            ) / existing.observation_count
             
             # Add to reasoning chain
-            existing.reasoning_chain.extend(relationship.reasoning_chain)
+            if relationship.reasoning_chain:
+                if existing.reasoning_chain is None:
+                    existing.reasoning_chain = []
+                existing.reasoning_chain.extend(relationship.reasoning_chain)
+            self._by_confidence = None
             
-            logger.debug(
-                f"Updated relationship: {existing.source_entity} "
-                f"-[{existing.relationship_type}]-> "
-                f"{existing.target_entity} | "
-                f"Confidence: {existing.confidence_score:.2f}"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Updated relationship: {existing.source_entity} "
+                    f"-[{existing.relationship_type}]-> "
+                    f"{existing.target_entity} | "
+                    f"Confidence: {existing.confidence_score:.2f}"
+                )
         else:
             # Add new relationship
             self.meta_graph.latent_relations[relationship.relation_id] = (
                 relationship
             )
+            self._relation_index[rel_key] = relationship.relation_id
+            self._by_status[relationship.status][relationship.relation_id] = None
+            self._by_confidence = None
             
-            logger.info(
-                f"Discovered new relationship: {relationship.source_entity} "
-                f"-[{relationship.relationship_type}]-> "
-                f"{relationship.target_entity} | "
-                f"Confidence: {relationship.confidence_score:.2f}"
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    f"Discovered new relationship: "
+                    f"{relationship.source_entity} "
+                    f"-[{relationship.relationship_type}]-> "
+                    f"{relationship.target_entity} | "
+                    f"Confidence: {relationship.confidence_score:.2f}"
+                )
     
     def approve_relationships(
         self,
@@ -217,32 +278,48 @@ class LatentRelationshipDiscovery:
                 self.cfg.auto_approve_high_confidence
             )
         
+        # One timestamp for the whole batch
+        now = datetime.now()
         approved_count = 0
         for rel_id in relationship_ids:
             if rel_id in self.meta_graph.latent_relations:
                 rel = self.meta_graph.latent_relations[rel_id]
-                rel.status = "approved"
-                rel.approved_at = datetime.now()
+                self._set_status(rel, "approved")
+                rel.approved_at = now
                 approved_count += 1
         
         logger.info(f"Approved {approved_count} relationships")
     
+    def _set_status(self, rel: LatentRelationship, status: str):
+        """Change a relationship's status, keeping the status index"""
+        del self._by_status[rel.status][rel.relation_id]
+        rel.status = status
+        self._by_status[status][rel.relation_id] = None
+    
     def get_pending_relationships(self) -> List[LatentRelationship]:
         """Get all pending relationship approvals"""
-        return [
-            rel for rel in self.meta_graph.latent_relations.values()
-            if rel.status == "pending"
-        ]
+        relations = self.meta_graph.latent_relations
+        return [relations[rel_id] for rel_id in self._by_status["pending"]]
     
     def get_high_confidence_relationships(
         self,
         threshold: float = 0.8
     ) -> List[LatentRelationship]:
-        """Get high-confidence discovered relationships"""
-        return [
-            rel for rel in self.meta_graph.latent_relations.values()
-            if rel.confidence_score >= threshold
-        ]
+        """Get high-confidence discovered relationships, most confident first"""
+        relations = self.meta_graph.latent_relations
+        
+        if self._by_confidence is None:
+            self._by_confidence = sorted(
+                relations,
+                key=lambda rel_id: -relations[rel_id].confidence_score
+            )
+            self._negated_confidences = [
+                -relations[rel_id].confidence_score
+                for rel_id in self._by_confidence
+            ]
+        
+        count = bisect.bisect_right(self._negated_confidences, -threshold)
+        return [relations[rel_id] for rel_id in self._by_confidence[:count]]
     
     def auto_activate_high_confidence(
         self,
@@ -260,12 +337,15 @@ class LatentRelationshipDiscovery:
         if threshold is None:
             threshold = self.cfg.latent_relation_confidence_threshold
         
+        # One timestamp for the whole batch
+        now = datetime.now()
         activated = 0
-        for rel in self.meta_graph.latent_relations.values():
-            if (rel.status == "pending" and
-                rel.confidence_score >= threshold):
-                rel.status = "active"
-                rel.approved_at = datetime.now()
+        relations = self.meta_graph.latent_relations
+        for rel_id in list(self._by_status["pending"]):
+            rel = relations[rel_id]
+            if rel.confidence_score >= threshold:
+                self._set_status(rel, "active")
+                rel.approved_at = now
                 activated += 1
         
         logger.info(f"Auto-activated {activated} relationships")
@@ -273,28 +353,31 @@ class LatentRelationshipDiscovery:
     
     def get_statistics(self) -> Dict:
         """Get discovery statistics"""
-        relations = self.meta_graph.latent_relations.values()
+        relations = self.meta_graph.latent_relations
+        confidence_sum = sum(rel.confidence_score for rel in relations.values())
+        total = len(relations)
+        by_status = self._by_status
         
         return {
-            "total_discovered": len(relations),
-            "pending": sum(1 for r in relations if r.status == "pending"),
-            "approved": sum(1 for r in relations if r.status == "approved"),
-            "active": sum(1 for r in relations if r.status == "active"),
-            "rejected": sum(1 for r in relations if r.status == "rejected"),
-            "average_confidence": (
-                sum(r.confidence_score for r in relations) / len(relations)
-                if relations else 0.0
-            ),
+            "total_discovered": total,
+            "pending": len(by_status["pending"]),
+            "approved": len(by_status["approved"]),
+            "active": len(by_status["active"]),
+            "rejected": len(by_status["rejected"]),
+            "average_confidence": confidence_sum / total if total else 0.0,
         }
 
 
 # Global instance
 lrd_instance: Optional[LatentRelationshipDiscovery] = None
+_instance_lock = threading.Lock()
 
 
 def get_lrd(meta_graph: AdaptiveMetaGraph) -> LatentRelationshipDiscovery:
     """Get or create LRD instance"""
     global lrd_instance
     if lrd_instance is None:
-        lrd_instance = LatentRelationshipDiscovery(meta_graph)
+        with _instance_lock:
+            if lrd_instance is None:
+                lrd_instance = LatentRelationshipDiscovery(meta_graph)
     return lrd_instance
\ No newline at end of file
@@ -4,13 +4,20 @@ Routes queries to optimal retrieval strategies based on learning
 """
 
 import logging
+import threading
+from collections import deque
+from itertools import islice
 from typing import Dict, List, Tuple, Optional
 from enum import Enum
+from functools import lru_cache
 import hashlib
+import re
+
+import numpy as np
 
 from models import (
     QuerySignature, RetrievalMethod, AdaptiveMetaGraph,
-    MethodEffectiveness
+    MethodEffectiveness, METHOD_IDS
 )
 from config import config
 
@@ -26,6 +33,13 @@ class QueryType(str, Enum):
     HYBRID = "hybrid"
 
 
+# Dense query type IDs for indexing score vectors
+QUERY_TYPES: Tuple[QueryType, ...] = tuple(QueryType)
+QUERY_TYPE_IDS: Dict[QueryType, int] = {
+    query_type: index for index, query_type in enumerate(QUERY_TYPES)
+}
+
+
 class MetaAgentQueryRouter:
     """Routes queries to optimal retrieval strategies"""
     
@@ -38,6 +52,7 @@ class MetaAgentQueryRouter:
         """
         self.meta_graph = meta_graph
         self.cfg = config.retriever
+        self.meta_cfg = config.adaptive_meta
         
         # Query type patterns
         self.query_patterns = {
@@ -59,8 +74,44 @@ class MetaAgentQueryRouter:
             ],
         }
         
+        # All patterns in one alternation, scanned in a single pass. The
+        # zero-width lookahead finds matches at every offset, so patterns
+        # keep their substring semantics even when they overlap
+        self._pattern_types: Dict[str, int] = {
+            pattern: QUERY_TYPE_IDS[query_type]
+            for query_type, patterns in self.query_patterns.items()
+            for pattern in patterns
+        }
+        self._pattern_regex = re.compile(
+            "(?=(" + "|".join(
+                re.escape(pattern)
+                for pattern in sorted(self._pattern_types, key=len, reverse=True)
+            ) + "))"
+        )
+        
+        # Classification is deterministic in the lowercased query text
+        self._classify_lower = lru_cache(
+            maxsize=self.meta_cfg.classification_cache_size
+        )(self._compute_query_type)
+        
+        # Methods in METHOD_IDS order, matching score array indices
+        self._methods = tuple(METHOD_IDS)
+        
         # Statistics
-        self.routing_decisions = []
+        self.total_routing_decisions = 0
+        self.routing_decisions = deque(
+            maxlen=self.meta_cfg.routing_history_size
+        )
+        
+        # Routing cache per query type, cleared when the epoch advances.
+        # Queries route on several threads while updates advance the
+        # epoch, so the cache and counters change under one lock
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._updates_since_epoch = 0
+        self._routing_cache: Dict[
+            str, Tuple[RetrievalMethod, Dict[RetrievalMethod, float]]
+        ] = {}
     
     def classify_query(self, query_text: str) -> QueryType:
         """
@@ -72,36 +123,42 @@ class MetaAgentQueryRouter:
         Returns:
             QueryType classification
         """
-        query_lower = query_text.lower()
-        scores = {qt: 0.0 for qt in QueryType}
-        
-        for query_type, patterns in self.query_patterns.items():
-            for pattern in patterns:
-                if pattern in query_lower:
-                    scores[query_type] += 1.0
+        return self._classify_lower(query_text.lower())
+    
+    def _compute_query_type(self, query_lower: str) -> QueryType:
+        """Score query types by pattern hits in lowercased text"""
+        # Each distinct pattern counts once
+        matched = set(self._pattern_regex.findall(query_lower))
+        if not matched:
+            return QueryType.SEMANTIC
         
-        # Normalize scores
-        total = sum(scores.values())
-        if total > 0:
-            scores = {k: v/total for k, v in scores.items()}
-        else:
-            scores[QueryType.SEMANTIC] = 1.0
+        # Hit counts indexed by QUERY_TYPE_IDS; only the argmax matters,
+        # so they are not normalized
+        scores = [0] * len(QUERY_TYPES)
+        for pattern in matched:
+            scores[self._pattern_types[pattern]] += 1
         
-        # Return highest score
-        return max(scores.keys(), key=lambda x: scores[x])
+        # Return highest score (first on ties, in enum order)
+        return QUERY_TYPES[scores.index(max(scores))]
     
-    def get_query_signature_hash(self, query_signature: QuerySignature) -> str:
+    def get_query_signature_hash(
+        self,
+        query_signature: QuerySignature,
+        query_type: Optional[QueryType] = None
+    ) -> str:
         """
         Create hash of query signature for routing stats
         
         Args:
             query_signature: Query signature
+            query_type: Precomputed classification, if already known
             
         Returns:
             Hash string
         """
         # Use query type as key
-        query_type = self.classify_query(query_signature.query_text)
+        if query_type is None:
+            query_type = self.classify_query(query_signature.query_text)
         return f"{query_type.value}"
     
     def should_optimize_routing(self) -> bool:
@@ -111,19 +168,13 @@ class MetaAgentQueryRouter:
         Returns:
             Whether routing should be optimized
         """
-        min_queries = self.cfg.min_historical_queries
+        min_queries = self.meta_cfg.min_historical_queries
         
-        # Count outcomes by method
-        outcomes_by_method = {}
-        for method in RetrievalMethod:
-            count = sum(
-                1 for o in self.meta_graph.query_outcomes
-                if o.retrieval_method == method
-            )
-            outcomes_by_method[method] = count
+        # Count outcomes by method in one pass over the method column
+        outcomes_by_method = self.meta_graph.query_outcomes.method_counts()
         
         # Check if we have enough data
-        min_count = min(outcomes_by_method.values())
+        min_count = int(outcomes_by_method.min())
         return min_count >= min_queries
     
     def get_optimal_routing(
@@ -133,47 +184,64 @@ class MetaAgentQueryRouter:
         """
         Determine optimal routing for a query
         
+        Routing is cached per query type until the routing epoch advances.
+        
         Args:
             query_signature: The query signature
             
         Returns:
             Tuple of (primary method, ensemble weights)
         """
-        query_type = self.classify_query(query_signature.query_text)
-        query_type_str = query_type.value
+        query_type_str = (
+            query_signature.query_type or
+            self.classify_query(query_signature.query_text).value
+        )
         
-        # Get best method based on historical data
-        if self.should_optimize_routing():
-            # Calculate effectiveness for each method
-            method_scores = {}
+        with self._lock:
+            routing = self._routing_cache.get(query_type_str)
+            if routing is None:
+                routing = self._compute_routing(query_type_str)
+                self._routing_cache[query_type_str] = routing
             
-            for method in RetrievalMethod:
-                effectiveness = self._get_method_effectiveness(
-                    method, query_type_str
-                )
-                
-                if effectiveness and effectiveness.is_reliable():
-                    score = (
-                        effectiveness.success_rate *
-                        effectiveness.confidence
-                    )
-                else:
-                    score = 0.5  # Default neutral score
-                
-                method_scores[method] = score
+            best_method, ensemble_weights = routing
             
-            # Normalize scores for ensemble
-            total = sum(method_scores.values())
-            ensemble_weights = (
-                {k: v/total for k, v in method_scores.items()}
-                if total > 0 else {m: 1/3 for m in RetrievalMethod}
+            # Record routing decision; per-method weights only when debugging
+            self.total_routing_decisions += 1
+            decision = {
+                "query_type": query_type_str,
+                "selected_method": best_method.value,
+            }
+            if logger.isEnabledFor(logging.DEBUG):
+                decision["weights"] = {
+                    k.value: v for k, v in ensemble_weights.items()
+                }
+            self.routing_decisions.append(decision)
+        
+        return best_method, dict(ensemble_weights)
+    
+    def _compute_routing(
+        self,
+        query_type_str: str
+    ) -> Tuple[RetrievalMethod, Dict[RetrievalMethod, float]]:
+        """Score methods for a query type from current effectiveness data"""
+        # Get best method based on historical data
+        if self.should_optimize_routing():
+            # Score every method at once from the dense stats table;
+            # unreliable methods get a neutral 0.5
+            scores = self.meta_graph.method_effectiveness.scores(
+                query_type_str
             )
             
-            # Pick best method
-            best_method = max(
-                method_scores.keys(),
-                key=lambda x: method_scores[x]
+            # Pick best method (first on ties, in METHOD_IDS order)
+            best_method = self._methods[int(scores.argmax())]
+            
+            # Normalize scores for ensemble, converting to a dict once
+            total = scores.sum()
+            weights = (
+                scores / total if total > 0
+                else np.full(len(self._methods), 1/3)
             )
+            ensemble_weights = dict(zip(self._methods, weights.tolist()))
         else:
             # Insufficient data - use default routing
             best_method = RetrievalMethod.HYBRID
@@ -183,27 +251,22 @@ class MetaAgentQueryRouter:
                 RetrievalMethod.LOGICAL_FILTERING: 0.34,
             }
         
-        # Record routing decision
-        self.routing_decisions.append({
-            "query_type": query_type_str,
-            "selected_method": best_method.value,
-            "weights": {k.value: v for k, v in ensemble_weights.items()},
-        })
-        
         return best_method, ensemble_weights
     
+    def _advance_epoch(self):
+        """Invalidate cached routing; caller holds self._lock"""
+        self._epoch += 1
+        self._updates_since_epoch = 0
+        self._routing_cache.clear()
+        logger.debug(f"Advanced routing epoch to {self._epoch}")
+    
     def _get_method_effectiveness(
         self,
         method: RetrievalMethod,
         query_type: str
     ) -> Optional[MethodEffectiveness]:
         """Get effectiveness metric for method/query type combo"""
-        method_key = f"{method.value}_{query_type}"
-        
-        if method_key in self.meta_graph.method_effectiveness:
-            return self.meta_graph.method_effectiveness[method_key]
-        
-        return None
+        return self.meta_graph.method_effectiveness.get(method, query_type)
     
     def update_method_effectiveness(
         self,
@@ -221,34 +284,37 @@ class MetaAgentQueryRouter:
             success: Whether retrieval succeeded
             execution_time_ms: Execution time
         """
-        method_key = f"{method.value}_{query_type}"
-        
-        if method_key not in self.meta_graph.method_effectiveness:
-            self.meta_graph.method_effectiveness[method_key] = (
-                MethodEffectiveness(
-                    method=method,
-                    query_type_signature=query_type
-                )
+        # Under the routing lock, so no route computed from the old stats
+        # is cached after the epoch advances
+        with self._lock:
+            self.meta_graph.method_effectiveness.update(
+                method, query_type, success, execution_time_ms
             )
+            
+            self._updates_since_epoch += 1
+            if (
+                self._updates_since_epoch
+                >= self.meta_cfg.routing_update_frequency
+            ):
+                self._advance_epoch()
         
-        effectiveness = self.meta_graph.method_effectiveness[method_key]
-        effectiveness.update(success, execution_time_ms)
-        
-        logger.debug(
-            f"Updated {method.value} effectiveness for {query_type}: "
-            f"Success rate = {effectiveness.success_rate:.2%}, "
-            f"Confidence = {effectiveness.confidence:.2%}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            effectiveness = self._get_method_effectiveness(method, query_type)
+            logger.debug(
+                f"Updated {method.value} effectiveness for {query_type}: "
+                f"Success rate = {effectiveness.success_rate:.2%}, "
+                f"Confidence = {effectiveness.confidence:.2%}"
+            )
     
     def get_routing_recommendations(self) -> Dict:
         """Get routing performance recommendations"""
         recommendations = {}
         
-        for method_key, effectiveness in (
+        for (method, query_type), effectiveness in (
             self.meta_graph.method_effectiveness.items()
         ):
             if effectiveness.total_uses > 0:
-                recommendations[method_key] = {
+                recommendations[f"{method.value}_{query_type}"] = {
                     "method": effectiveness.method.value,
                     "query_type": effectiveness.query_type_signature,
                     "success_rate": effectiveness.success_rate,
@@ -261,24 +327,30 @@ class MetaAgentQueryRouter:
     
     def get_statistics(self) -> Dict:
         """Get routing statistics"""
-        return {
-            "total_routing_decisions": len(self.routing_decisions),
-            "methods_tracked": len(self.meta_graph.method_effectiveness),
-            "recent_decisions": (
-                self.routing_decisions[-10:]
-                if len(self.routing_decisions) >= 10
-                else self.routing_decisions
-            ),
-        }
+        with self._lock:
+            return {
+                "total_routing_decisions": self.total_routing_decisions,
+                "methods_tracked": len(self.meta_graph.method_effectiveness),
+                "routing_epoch": self._epoch,
+                "cached_routes": len(self._routing_cache),
+                "recent_decisions": list(islice(
+                    self.routing_decisions,
+                    max(0, len(self.routing_decisions) - 10),
+                    None
+                )),
+            }
 
 
 # Global instance
 mqr_instance: Optional[MetaAgentQueryRouter] = None
+_instance_lock = threading.Lock()
 
 
 def get_mqr(meta_graph: AdaptiveMetaGraph) -> MetaAgentQueryRouter:
     """Get or create MQR instance"""
     global mqr_instance
     if mqr_instance is None:
-        mqr_instance = MetaAgentQueryRouter(meta_graph)
+        with _instance_lock:
+            if mqr_instance is None:
+                mqr_instance = MetaAgentQueryRouter(meta_graph)
     return mqr_instance
\ No newline at end of file
@@ -2,12 +2,19 @@
 Data Models and Structures for AdaptiveGraphRAG
 """
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Any
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple, Any, Deque
 from datetime import datetime
 from enum import Enum
+from collections import deque
+import threading
+import time
 import uuid
 
+import numpy as np
+
+import embedding_kernels
+
 
 class RetrievalMethod(str, Enum):
     """Enumeration of retrieval methods"""
@@ -24,20 +31,37 @@ class RelationshipType(str, Enum):
     INFERRED = "inferred"
 
 
-@dataclass
+# Composite success score weights
+SUCCESS_WEIGHT = 0.4
+CONFIDENCE_WEIGHT = 0.3
+REASONING_VALIDITY_WEIGHT = 0.2
+EMBEDDING_COHERENCE_WEIGHT = 0.1
+COMPOSITE_SCORE_WEIGHTS = np.array([
+    SUCCESS_WEIGHT, CONFIDENCE_WEIGHT,
+    REASONING_VALIDITY_WEIGHT, EMBEDDING_COHERENCE_WEIGHT
+])
+
+
+@dataclass(slots=True)
 class QuerySignature:
     """Represents a query's semantic signature"""
     query_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     query_text: str = ""
-    embedding: List[float] = field(default_factory=list)
+    embedding: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=np.float16)
+    )
     query_type: str = ""  # e.g., "semantic", "structured", "multi-hop"
-    created_at: datetime = field(default_factory=datetime.now)
+    created_at_ns: int = field(default_factory=time.monotonic_ns)
     
     def __hash__(self):
         return hash(self.query_id)
+    
+    @property
+    def created_at(self) -> datetime:
+        return monotonic_ns_to_datetime(self.created_at_ns)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RetrievalOutcome:
     """Records the outcome of a retrieval operation"""
     outcome_id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -54,31 +78,92 @@ class RetrievalOutcome:
     retrieved_nodes: List[str] = field(default_factory=list)
     retrieved_edges: List[Tuple[str, str, str]] = field(default_factory=list)
     
-    # Timing
+    # Timing (time.monotonic_ns ticks)
     execution_time_ms: float = 0.0
-    created_at: datetime = field(default_factory=datetime.now)
+    created_at_ns: int = field(default_factory=time.monotonic_ns)
+    
+    @property
+    def created_at(self) -> datetime:
+        return monotonic_ns_to_datetime(self.created_at_ns)
     
     def composite_success_score(self) -> float:
         """Calculate composite success score"""
-        weights = {
-            "success": 0.4,
-            "confidence": 0.3,
-            "reasoning_validity": 0.2,
-            "embedding_coherence": 0.1
-        }
-        
         score = (
-            (1.0 if self.success else 0.0) * weights["success"] +
-            self.confidence_score * weights["confidence"] +
-            self.reasoning_validity * weights["reasoning_validity"] +
-            self.embedding_coherence * weights["embedding_coherence"]
+            (SUCCESS_WEIGHT if self.success else 0.0) +
+            self.confidence_score * CONFIDENCE_WEIGHT +
+            self.reasoning_validity * REASONING_VALIDITY_WEIGHT +
+            self.embedding_coherence * EMBEDDING_COHERENCE_WEIGHT
         )
         return max(0.0, min(1.0, score))
+    
+    @staticmethod
+    def batch_scores(outcomes: List["RetrievalOutcome"]) -> np.ndarray:
+        """Composite success scores for many outcomes as one matrix product"""
+        metrics = np.array(
+            [
+                (
+                    o.success, o.confidence_score,
+                    o.reasoning_validity, o.embedding_coherence
+                )
+                for o in outcomes
+            ],
+            dtype=np.float64
+        ).reshape(len(outcomes), 4)
+        return np.clip(metrics @ COMPOSITE_SCORE_WEIGHTS, 0.0, 1.0)
+
+
+# Anchor for converting monotonic_ns() ticks back to wall-clock time
+_WALL_ANCHOR = time.time()
+_MONOTONIC_ANCHOR_NS = time.monotonic_ns()
+_UNIX_OFFSET_NS = int(_WALL_ANCHOR * 1e9) - _MONOTONIC_ANCHOR_NS
+
 
+def monotonic_ns_to_datetime(ticks_ns: int) -> datetime:
+    """Convert a time.monotonic_ns() tick from this process to a datetime"""
+    return datetime.fromtimestamp(
+        _WALL_ANCHOR + (int(ticks_ns) - _MONOTONIC_ANCHOR_NS) / 1e9
+    )
 
-@dataclass
+
+def monotonic_ns_to_unix(ticks_ns: np.ndarray) -> np.ndarray:
+    """Convert an array of this process's monotonic_ns() ticks to unix seconds"""
+    return _WALL_ANCHOR + (
+        np.asarray(ticks_ns, dtype=np.int64) - _MONOTONIC_ANCHOR_NS
+    ) / 1e9
+
+
+def monotonic_ns_to_unix_ns(ticks_ns: np.ndarray) -> np.ndarray:
+    """Convert monotonic_ns() ticks to int64 unix nanoseconds, for persisting"""
+    return np.asarray(ticks_ns, dtype=np.int64) + _UNIX_OFFSET_NS
+
+
+def unix_ns_to_monotonic_ns(unix_ns: np.ndarray) -> np.ndarray:
+    """Convert persisted int64 unix nanoseconds to this process's ticks"""
+    return np.asarray(unix_ns, dtype=np.int64) - _UNIX_OFFSET_NS
+
+
+# Packed int64 edge key layout: source (bits 40-62) | target (16-39) |
+# relation (0-15). Entity IDs are shared by sources and targets.
+EDGE_SOURCE_SHIFT = 40
+EDGE_TARGET_SHIFT = 16
+EDGE_TARGET_MASK = (1 << 24) - 1
+EDGE_RELATION_MASK = (1 << 16) - 1
+MAX_EDGE_ENTITIES = 1 << 23
+MAX_EDGE_RELATIONS = 1 << 16
+
+
+# Bounds for adaptive edge weights
+MIN_EDGE_WEIGHT = 0.1
+MAX_EDGE_WEIGHT = 10.0
+
+
+@dataclass(slots=True, frozen=True)
 class GraphEdgeWeight:
-    """Represents weighted edges in the adaptive meta-graph"""
+    """
+    Snapshot of a weighted edge in the adaptive meta-graph
+    
+    Live weights and counters are stored in EdgeWeightTable.
+    """
     source_id: str = ""
     target_id: str = ""
     relationship_type: str = ""
@@ -89,16 +174,23 @@ class GraphEdgeWeight:
     # Tracking
     successes: int = 0
     failures: int = 0
-    last_used: datetime = field(default_factory=datetime.now)
+    last_used_ns: int = field(default_factory=time.monotonic_ns)
     
     # Statistics
     average_success_score: float = 0.0
     usage_count: int = 0
     
-    def update_weight(self, delta: float):
-        """Update edge weight with a delta"""
-        self.weight = max(0.1, min(10.0, self.weight + delta))
-        self.last_used = datetime.now()
+    @property
+    def last_used(self) -> datetime:
+        return monotonic_ns_to_datetime(self.last_used_ns)
+    
+    def with_weight_delta(self, delta: float) -> "GraphEdgeWeight":
+        """Return a copy with the weight moved by delta"""
+        return replace(
+            self,
+            weight=max(MIN_EDGE_WEIGHT, min(MAX_EDGE_WEIGHT, self.weight + delta)),
+            last_used_ns=time.monotonic_ns()
+        )
     
     def get_effectiveness_ratio(self) -> float:
         """Calculate success/total ratio"""
@@ -108,7 +200,7 @@ class GraphEdgeWeight:
         return self.successes / total
 
 
-@dataclass
+@dataclass(slots=True)
 class LatentRelationship:
     """Discovered implicit relationship between entities"""
     relation_id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -117,18 +209,34 @@ class LatentRelationship:
     relationship_type: str = ""
     
     confidence_score: float = 0.0
-    reasoning_chain: List[str] = field(default_factory=list)
+    observation_count: int = 1
+    reasoning_chain: Optional[List[str]] = None  # Allocated on first step
     
     # Status
     status: str = "pending"  # pending, approved, rejected, active
-    discovered_at: datetime = field(default_factory=datetime.now)
+    discovered_at_ns: int = field(default_factory=time.monotonic_ns)
     approved_at: Optional[datetime] = None
     
+    @property
+    def discovered_at(self) -> datetime:
+        return monotonic_ns_to_datetime(self.discovered_at_ns)
+    
     def is_approved(self) -> bool:
         return self.status == "approved" or self.status == "active"
 
 
-@dataclass
+# Sample-size confidence 1 - 1/(1 + 0.1n), precomputed for small n
+_CONFIDENCE_LUT = 1.0 - 1.0 / (1.0 + np.arange(1025) * 0.1)
+
+
+def sample_confidence(total_uses: int) -> float:
+    """Confidence in a success rate measured over total_uses samples"""
+    if total_uses < len(_CONFIDENCE_LUT):
+        return float(_CONFIDENCE_LUT[total_uses])
+    return 1.0 - (1.0 / (1.0 + total_uses * 0.1))
+
+
+@dataclass(slots=True)
 class MethodEffectiveness:
     """Tracks effectiveness of each retrieval method"""
     method: RetrievalMethod = RetrievalMethod.VECTOR_SEARCH
@@ -161,49 +269,914 @@ class MethodEffectiveness:
         self.success_rate = self.successful_uses / self.total_uses
         
         # Update confidence (sigmoid based on sample size)
-        self.confidence = 1.0 - (1.0 / (1.0 + self.total_uses * 0.1))
+        self.confidence = sample_confidence(self.total_uses)
+    
+    @classmethod
+    def from_counts(
+        cls,
+        method: RetrievalMethod,
+        query_type_signature: str,
+        total_uses: int,
+        successful_uses: int,
+        average_execution_time_ms: float
+    ) -> "MethodEffectiveness":
+        """
+        Build the stats that calling update() once per sample would give
+        
+        Args:
+            method: Retrieval method
+            query_type_signature: Query type the samples belong to
+            total_uses: Number of samples
+            successful_uses: Number of successful samples
+            average_execution_time_ms: Moving average of execution time
+            
+        Returns:
+            MethodEffectiveness object
+        """
+        effectiveness = cls(
+            method=method,
+            query_type_signature=query_type_signature
+        )
+        if total_uses == 0:
+            return effectiveness
+        
+        effectiveness.total_uses = total_uses
+        effectiveness.successful_uses = successful_uses
+        effectiveness.success_rate = successful_uses / total_uses
+        effectiveness.average_execution_time_ms = average_execution_time_ms
+        effectiveness.confidence = sample_confidence(total_uses)
+        
+        return effectiveness
     
     def is_reliable(self, min_samples: int = 5) -> bool:
         """Check if method is reliable enough for routing"""
         return self.total_uses >= min_samples and self.confidence > 0.5
 
 
-@dataclass
+class IdInterner:
+    """Maps hashable keys to dense int32 IDs"""
+    
+    def __init__(self):
+        self._ids: Dict[Any, int] = {}
+        self._keys: List[Any] = []
+    
+    def intern(self, key: Any) -> int:
+        """Get the ID for a key, assigning the next ID if unseen"""
+        key_id = self._ids.get(key)
+        if key_id is None:
+            key_id = len(self._keys)
+            self._ids[key] = key_id
+            self._keys.append(key)
+        return key_id
+    
+    def intern_many(self, keys: List[Any]) -> np.ndarray:
+        """Intern a sequence of keys into an int32 array"""
+        return np.fromiter(
+            (self.intern(key) for key in keys),
+            dtype=np.int32,
+            count=len(keys)
+        )
+    
+    def lookup(self, key: Any) -> Optional[int]:
+        """Get the ID for a key without assigning one"""
+        return self._ids.get(key)
+    
+    def key(self, key_id: int) -> Any:
+        """Get the key for an ID"""
+        return self._keys[key_id]
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+# Stable integer IDs for columnar method storage
+METHOD_IDS: Dict[RetrievalMethod, int] = {
+    method: index for index, method in enumerate(RetrievalMethod)
+}
+
+
+class MethodEffectivenessTable:
+    """Dense effectiveness stats indexed by [query type, method]"""
+    
+    def __init__(self, capacity: int = 8):
+        """
+        Initialize effectiveness table
+        
+        Args:
+            capacity: Initial query type capacity (doubles on overflow)
+        """
+        self.query_types = IdInterner()
+        
+        # Columns per [query_type_id, METHOD_IDS[method]]
+        shape = (capacity, len(METHOD_IDS))
+        self._total_uses = np.zeros(shape, dtype=np.int64)
+        self._successful_uses = np.zeros(shape, dtype=np.int64)
+        self._average_execution_time_ms = np.zeros(shape, dtype=np.float64)
+    
+    def _query_type_id(self, query_type: str) -> int:
+        """Intern a query type, growing the table if needed"""
+        type_id = self.query_types.intern(query_type)
+        if type_id == len(self._total_uses):
+            for name in (
+                "_total_uses", "_successful_uses",
+                "_average_execution_time_ms"
+            ):
+                column = getattr(self, name)
+                grown = np.zeros(
+                    (len(column) * 2, column.shape[1]),
+                    dtype=column.dtype
+                )
+                grown[:len(column)] = column
+                setattr(self, name, grown)
+        return type_id
+    
+    def update(
+        self,
+        method: RetrievalMethod,
+        query_type: str,
+        success: bool,
+        execution_time_ms: float
+    ):
+        """Record one use of a method for a query type"""
+        cell = (self._query_type_id(query_type), METHOD_IDS[method])
+        
+        self._total_uses[cell] += 1
+        self._successful_uses[cell] += success
+        
+        # Exponential moving average for time
+        average = self._average_execution_time_ms[cell]
+        self._average_execution_time_ms[cell] = (
+            execution_time_ms if average == 0
+            else 0.8 * average + 0.2 * execution_time_ms
+        )
+    
+    def scores(self, query_type: str, min_samples: int = 5) -> np.ndarray:
+        """
+        Routing score per method (indexed by METHOD_IDS) for a query type
+        
+        Reliable methods score success_rate * confidence; others 0.5.
+        """
+        type_id = self.query_types.lookup(query_type)
+        if type_id is None:
+            return np.full(len(METHOD_IDS), 0.5)
+        
+        total = self._total_uses[type_id]
+        success_rate = np.divide(
+            self._successful_uses[type_id], total,
+            out=np.full(len(METHOD_IDS), 0.5), where=total > 0
+        )
+        confidence = 1.0 - 1.0 / (1.0 + total * 0.1)
+        reliable = (total >= min_samples) & (confidence > 0.5)
+        
+        return np.where(reliable, success_rate * confidence, 0.5)
+    
+    def get(
+        self,
+        method: RetrievalMethod,
+        query_type: str
+    ) -> Optional[MethodEffectiveness]:
+        """Materialize stats for a method/query type, if it has been used"""
+        type_id = self.query_types.lookup(query_type)
+        if type_id is None:
+            return None
+        
+        method_id = METHOD_IDS[method]
+        total = int(self._total_uses[type_id, method_id])
+        if total == 0:
+            return None
+        
+        successful = int(self._successful_uses[type_id, method_id])
+        return MethodEffectiveness(
+            method=method,
+            query_type_signature=query_type,
+            success_rate=successful / total,
+            average_execution_time_ms=float(
+                self._average_execution_time_ms[type_id, method_id]
+            ),
+            total_uses=total,
+            successful_uses=successful,
+            confidence=sample_confidence(total),
+        )
+    
+    def for_query_type(self, query_type: str) -> List[MethodEffectiveness]:
+        """Materialize stats for every method used with a query type"""
+        if self.query_types.lookup(query_type) is None:
+            return []
+        
+        return [
+            effectiveness for effectiveness in (
+                self.get(method, query_type) for method in METHOD_IDS
+            )
+            if effectiveness is not None
+        ]
+    
+    def items(
+        self
+    ) -> List[Tuple[Tuple[RetrievalMethod, str], MethodEffectiveness]]:
+        """Materialize ((method, query_type), stats) for reporting"""
+        methods = list(METHOD_IDS)
+        type_ids, method_ids = np.nonzero(
+            self._total_uses[:len(self.query_types)]
+        )
+        
+        items = []
+        for type_id, method_id in zip(type_ids, method_ids):
+            method = methods[method_id]
+            query_type = self.query_types.key(int(type_id))
+            items.append((
+                (method, query_type),
+                self.get(method, query_type)
+            ))
+        return items
+    
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._total_uses))
+
+
+class OutcomeStore:
+    """Columnar (struct-of-arrays) store of retrieval outcomes"""
+    
+    def __init__(self, capacity: int = 1024, recent_window: int = 1000):
+        """
+        Initialize outcome store
+        
+        Args:
+            capacity: Initial row capacity (doubles on overflow)
+            recent_window: Number of full outcome objects kept for debugging
+        """
+        self.size = 0
+        self._confidence = np.empty(capacity, dtype=np.float32)
+        self._composite_score = np.empty(capacity, dtype=np.float32)
+        self._success = np.empty(capacity, dtype=np.bool_)
+        self._execution_time_ms = np.empty(capacity, dtype=np.float32)
+        self._method_id = np.empty(capacity, dtype=np.int8)
+        self._created_at_ns = np.empty(capacity, dtype=np.int64)
+        self._query_type_id = np.empty(capacity, dtype=np.int32)
+        
+        # Query type strings interned to dense IDs
+        self.query_types = IdInterner()
+        
+        # Running per-method counts, indexed by METHOD_IDS
+        self._method_counts = np.zeros(len(METHOD_IDS), dtype=np.int64)
+        
+        # Most recent outcome objects only
+        self.recent: Deque[RetrievalOutcome] = deque(maxlen=recent_window)
+    
+    def append(
+        self,
+        outcome: RetrievalOutcome,
+        composite_score: Optional[float] = None
+    ):
+        """Append an outcome as one row, optionally with its precomputed score"""
+        if self.size == len(self._method_id):
+            self._grow()
+        
+        row = self.size
+        self._confidence[row] = outcome.confidence_score
+        self._composite_score[row] = (
+            composite_score if composite_score is not None
+            else outcome.composite_success_score()
+        )
+        self._success[row] = outcome.success
+        self._execution_time_ms[row] = outcome.execution_time_ms
+        method_id = METHOD_IDS[outcome.retrieval_method]
+        self._method_id[row] = method_id
+        self._created_at_ns[row] = outcome.created_at_ns
+        self._query_type_id[row] = self.query_types.intern(
+            outcome.query_signature.query_type
+        )
+        self._method_counts[method_id] += 1
+        self.size += 1
+        
+        self.recent.append(outcome)
+    
+    def _grow(self):
+        """Double the capacity of every column"""
+        capacity = max(1, len(self._method_id) * 2)
+        for name in (
+            "_confidence", "_composite_score", "_success",
+            "_execution_time_ms", "_method_id", "_created_at_ns",
+            "_query_type_id"
+        ):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    @property
+    def confidence(self) -> np.ndarray:
+        return self._confidence[:self.size]
+    
+    @property
+    def composite_score(self) -> np.ndarray:
+        return self._composite_score[:self.size]
+    
+    @property
+    def success(self) -> np.ndarray:
+        return self._success[:self.size]
+    
+    @property
+    def execution_time_ms(self) -> np.ndarray:
+        return self._execution_time_ms[:self.size]
+    
+    @property
+    def method_id(self) -> np.ndarray:
+        return self._method_id[:self.size]
+    
+    @property
+    def created_at_ns(self) -> np.ndarray:
+        return self._created_at_ns[:self.size]
+    
+    @property
+    def query_type_id(self) -> np.ndarray:
+        return self._query_type_id[:self.size]
+    
+    def extend_columns(
+        self,
+        confidence: np.ndarray,
+        composite_score: np.ndarray,
+        success: np.ndarray,
+        execution_time_ms: np.ndarray,
+        method_id: np.ndarray,
+        created_at_ns: np.ndarray,
+        query_types: List[str]
+    ):
+        """Append many rows at once from column arrays (e.g. a snapshot)"""
+        count = len(method_id)
+        while self.size + count > len(self._method_id):
+            self._grow()
+        
+        rows = slice(self.size, self.size + count)
+        self._confidence[rows] = confidence
+        self._composite_score[rows] = composite_score
+        self._success[rows] = success
+        self._execution_time_ms[rows] = execution_time_ms
+        self._method_id[rows] = method_id
+        self._created_at_ns[rows] = created_at_ns
+        self._query_type_id[rows] = self.query_types.intern_many(query_types)
+        self._method_counts += np.bincount(
+            method_id, minlength=len(METHOD_IDS)
+        )
+        self.size += count
+    
+    def drop_oldest(self, count: int):
+        """Drop the oldest rows, shifting the rest to the front"""
+        count = min(count, self.size)
+        self._method_counts -= np.bincount(
+            self._method_id[:count], minlength=len(METHOD_IDS)
+        )
+        for name in (
+            "_confidence", "_composite_score", "_success",
+            "_execution_time_ms", "_method_id", "_created_at_ns",
+            "_query_type_id"
+        ):
+            column = getattr(self, name)
+            column[:self.size - count] = column[count:self.size]
+        self.size -= count
+    
+    def window_start(self, cutoff_ns: int) -> int:
+        """First row created at or after a tick; rows are in creation order"""
+        return int(np.searchsorted(self.created_at_ns, cutoff_ns, side="left"))
+    
+    def method_counts(self) -> np.ndarray:
+        """Count outcomes per method, indexed by METHOD_IDS"""
+        return self._method_counts.copy()
+
+
+class PackedEdgeIndex:
+    """Open-addressing hash index from packed int64 edge keys to rows"""
+    
+    EMPTY = -1
+    MAX_LOAD_FACTOR = 0.7
+    
+    # Fibonacci hashing multiplier; spreads the structured packed key bits
+    _HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+    
+    def __init__(self, capacity: int = 1 << 12):
+        """
+        Initialize index
+        
+        Args:
+            capacity: Initial slot count (rounded up to a power of two)
+        """
+        self._bits = max(1, (capacity - 1).bit_length())
+        self._keys = np.full(1 << self._bits, self.EMPTY, dtype=np.int64)
+        self._rows = np.zeros(1 << self._bits, dtype=np.int32)
+        self.size = 0
+    
+    def _slots(self, keys: np.ndarray) -> np.ndarray:
+        """Home slot of each key"""
+        hashed = keys.astype(np.uint64) * self._HASH_MULTIPLIER
+        return (hashed >> np.uint64(64 - self._bits)).astype(np.int64)
+    
+    def lookup(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Find rows for many keys with vectorized linear probing
+        
+        Returns:
+            int64 rows, EMPTY (-1) for missing keys
+        """
+        mask = len(self._keys) - 1
+        result = np.full(len(keys), self.EMPTY, dtype=np.int64)
+        pending = np.arange(len(keys))
+        slots = self._slots(keys)
+        
+        # Each round advances every unresolved key by one slot
+        while pending.size:
+            slot_keys = self._keys[slots]
+            found = slot_keys == keys[pending]
+            result[pending[found]] = self._rows[slots[found]]
+            
+            probing = ~found & (slot_keys != self.EMPTY)
+            pending = pending[probing]
+            slots = (slots[probing] + 1) & mask
+        
+        return result
+    
+    def get(self, key: int) -> Optional[int]:
+        """Find the row for one key"""
+        row = self.lookup(np.array([key], dtype=np.int64))[0]
+        return int(row) if row != self.EMPTY else None
+    
+    def insert(self, keys: np.ndarray, rows: np.ndarray):
+        """
+        Insert keys that are unique and not yet present
+        
+        Args:
+            keys: int64 packed keys
+            rows: Row index for each key
+        """
+        while self.size + len(keys) > self.MAX_LOAD_FACTOR * len(self._keys):
+            self._grow()
+        self._place(keys, rows)
+        self.size += len(keys)
+    
+    def _place(self, keys: np.ndarray, rows: np.ndarray):
+        """Write keys into empty slots, first claimant wins each slot"""
+        mask = len(self._keys) - 1
+        pending = np.arange(len(keys))
+        slots = self._slots(keys)
+        
+        while pending.size:
+            empty = np.flatnonzero(self._keys[slots] == self.EMPTY)
+            claimed, first = np.unique(slots[empty], return_index=True)
+            winners = pending[empty[first]]
+            self._keys[claimed] = keys[winners]
+            self._rows[claimed] = rows[winners]
+            
+            placed = np.zeros(len(pending), dtype=np.bool_)
+            placed[empty[first]] = True
+            pending = pending[~placed]
+            slots = (slots[~placed] + 1) & mask
+    
+    def _grow(self):
+        """Double the slot count and rehash live keys"""
+        live = self._keys != self.EMPTY
+        keys, rows = self._keys[live], self._rows[live]
+        
+        self._bits += 1
+        self._keys = np.full(1 << self._bits, self.EMPTY, dtype=np.int64)
+        self._rows = np.zeros(1 << self._bits, dtype=np.int32)
+        self._place(keys, rows)
+    
+    def __len__(self) -> int:
+        return self.size
+
+
+class EdgeWeightTable:
+    """Columnar (struct-of-arrays) table of adaptive edge weights"""
+    
+    def __init__(self, capacity: int = 1024):
+        """
+        Initialize edge weight table
+        
+        Args:
+            capacity: Initial row capacity (doubles on overflow)
+        """
+        self.size = 0
+        
+        # Edges are keyed by interned IDs packed into one int64
+        self.entities = IdInterner()
+        self.relations = IdInterner()
+        self.index = PackedEdgeIndex()  # packed key -> row
+        
+        self._packed_key = np.empty(capacity, dtype=np.int64)
+        self._weight = np.empty(capacity, dtype=np.float32)
+        self._initial_weight = np.empty(capacity, dtype=np.float32)
+        self._successes = np.empty(capacity, dtype=np.int32)
+        self._failures = np.empty(capacity, dtype=np.int32)
+        self._usage_count = np.empty(capacity, dtype=np.int32)
+        self._success_score_sum = np.empty(capacity, dtype=np.float32)
+        self._last_used = np.empty(capacity, dtype=np.int64)  # monotonic_ns
+    
+    def rows(
+        self,
+        edge_keys: List[Tuple[str, str, str]],
+        initial_weight: float
+    ) -> np.ndarray:
+        """
+        Get the rows for edges, inserting unseen edges at initial_weight
+        
+        Args:
+            edge_keys: (source, target, relationship_type) tuples
+            initial_weight: Weight assigned to newly inserted edges
+        
+        Returns:
+            int64 row indices in input order
+        """
+        return self.rows_packed(self.pack_many(edge_keys), initial_weight)
+    
+    def rows_packed(
+        self,
+        packed_keys: np.ndarray,
+        initial_weight: float
+    ) -> np.ndarray:
+        """
+        Get the rows for packed edge keys, inserting unseen edges
+        
+        Args:
+            packed_keys: int64 keys from pack/pack_many
+            initial_weight: Weight assigned to newly inserted edges
+        
+        Returns:
+            int64 row indices in input order
+        """
+        packed_keys = np.asarray(packed_keys, dtype=np.int64)
+        rows = self.index.lookup(packed_keys)
+        
+        missing = rows == PackedEdgeIndex.EMPTY
+        if missing.any():
+            new_keys, inverse = np.unique(
+                packed_keys[missing], return_inverse=True
+            )
+            new_rows = self._insert(new_keys, initial_weight)
+            self.index.insert(new_keys, new_rows)
+            rows[missing] = new_rows[inverse]
+        
+        return rows
+    
+    def pack_many(self, edge_keys: List[Tuple[str, str, str]]) -> np.ndarray:
+        """Pack (source, target, relationship_type) tuples into int64 keys"""
+        pack = self.pack
+        return np.fromiter(
+            (pack(*edge_key) for edge_key in edge_keys),
+            dtype=np.int64,
+            count=len(edge_keys)
+        )
+    
+    def pack(self, source: str, target: str, relation_type: str) -> int:
+        """Intern an edge's strings and pack their IDs into an int64 key"""
+        source_id = self.entities.intern(source)
+        target_id = self.entities.intern(target)
+        relation_id = self.relations.intern(relation_type)
+        
+        if len(self.entities) > MAX_EDGE_ENTITIES:
+            raise ValueError(
+                f"Edge table supports at most {MAX_EDGE_ENTITIES} entities"
+            )
+        if len(self.relations) > MAX_EDGE_RELATIONS:
+            raise ValueError(
+                f"Edge table supports at most {MAX_EDGE_RELATIONS} "
+                f"relationship types"
+            )
+        
+        return (
+            (source_id << EDGE_SOURCE_SHIFT)
+            | (target_id << EDGE_TARGET_SHIFT)
+            | relation_id
+        )
+    
+    def _find(self, edge_key: Tuple[str, str, str]) -> Optional[int]:
+        """Get the row for an edge without inserting it"""
+        source, target, relation_type = edge_key
+        source_id = self.entities.lookup(source)
+        target_id = self.entities.lookup(target)
+        relation_id = self.relations.lookup(relation_type)
+        if source_id is None or target_id is None or relation_id is None:
+            return None
+        
+        return self.index.get(
+            (source_id << EDGE_SOURCE_SHIFT)
+            | (target_id << EDGE_TARGET_SHIFT)
+            | relation_id
+        )
+    
+    def key(self, row: int) -> Tuple[str, str, str]:
+        """Get the (source, target, relationship_type) of a row"""
+        packed_key = int(self._packed_key[row])
+        entity = self.entities.key
+        return (
+            entity(packed_key >> EDGE_SOURCE_SHIFT),
+            entity((packed_key >> EDGE_TARGET_SHIFT) & EDGE_TARGET_MASK),
+            self.relations.key(packed_key & EDGE_RELATION_MASK),
+        )
+    
+    def _insert(self, packed_keys: np.ndarray, initial_weight: float) -> np.ndarray:
+        """Append new edge rows; returns their row indices"""
+        while self.size + len(packed_keys) > len(self._weight):
+            self._grow()
+        
+        rows = slice(self.size, self.size + len(packed_keys))
+        self._weight[rows] = initial_weight
+        self._initial_weight[rows] = initial_weight
+        self._successes[rows] = 0
+        self._failures[rows] = 0
+        self._usage_count[rows] = 0
+        self._success_score_sum[rows] = 0.0
+        self._last_used[rows] = time.monotonic_ns()
+        self._packed_key[rows] = packed_keys
+        
+        self.size += len(packed_keys)
+        return np.arange(rows.start, rows.stop, dtype=np.int64)
+    
+    def _grow(self):
+        """Double the capacity of every column"""
+        capacity = max(1, len(self._weight) * 2)
+        for name in (
+            "_packed_key", "_weight", "_initial_weight", "_successes",
+            "_failures", "_usage_count", "_success_score_sum", "_last_used"
+        ):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def __contains__(self, edge_key: Tuple[str, str, str]) -> bool:
+        return self._find(edge_key) is not None
+    
+    @property
+    def weight(self) -> np.ndarray:
+        return self._weight[:self.size]
+    
+    @property
+    def initial_weight(self) -> np.ndarray:
+        return self._initial_weight[:self.size]
+    
+    @property
+    def successes(self) -> np.ndarray:
+        return self._successes[:self.size]
+    
+    @property
+    def failures(self) -> np.ndarray:
+        return self._failures[:self.size]
+    
+    @property
+    def usage_count(self) -> np.ndarray:
+        return self._usage_count[:self.size]
+    
+    @property
+    def success_score_sum(self) -> np.ndarray:
+        return self._success_score_sum[:self.size]
+    
+    @property
+    def last_used(self) -> np.ndarray:
+        return self._last_used[:self.size]
+    
+    def view(self, row: int) -> GraphEdgeWeight:
+        """Materialize one row as a GraphEdgeWeight snapshot"""
+        source, target, relation_type = self.key(row)
+        usage_count = int(self._usage_count[row])
+        
+        return GraphEdgeWeight(
+            source_id=source,
+            target_id=target,
+            relationship_type=relation_type,
+            weight=float(self._weight[row]),
+            initial_weight=float(self._initial_weight[row]),
+            successes=int(self._successes[row]),
+            failures=int(self._failures[row]),
+            last_used_ns=int(self._last_used[row]),
+            average_success_score=(
+                float(self._success_score_sum[row]) / usage_count
+                if usage_count > 0 else 0.0
+            ),
+            usage_count=usage_count,
+        )
+    
+    def get(self, edge_key: Tuple[str, str, str]) -> Optional[GraphEdgeWeight]:
+        """Get a GraphEdgeWeight snapshot for an edge, if tracked"""
+        row = self._find(edge_key)
+        return self.view(row) if row is not None else None
+
+
+class EmbeddingStore:
+    """Embeddings keyed by text, stored as rows of one matrix"""
+    
+    # Largest int8 magnitude used; keeps the range symmetric
+    INT8_MAX = 127
+    
+    def __init__(self, capacity: int = 1024, quantize: bool = False):
+        """
+        Initialize embedding store
+        
+        Args:
+            capacity: Initial row capacity (doubles on overflow)
+            quantize: Store rows as int8 with a per-row float16 scale
+        """
+        self.size = 0
+        self.capacity = capacity
+        self.quantize = quantize
+        self._rows: Dict[str, int] = {}
+        self._keys: List[str] = []
+        
+        # Allocated on first insert, once the dimension is known
+        self._matrix: Optional[np.ndarray] = None
+        self._scales = np.ones(capacity, dtype=np.float16)
+        self._norms = np.zeros(capacity, dtype=np.float32)
+        
+        # Embedding calls run on several query threads; allocation, row
+        # reservation and growth must not interleave
+        self._lock = threading.Lock()
+    
+    def _quantize(self, vector: np.ndarray) -> Tuple[np.ndarray, np.float16]:
+        """Symmetric int8 quantization with one scale per vector"""
+        peak = float(np.abs(vector).max()) if vector.size else 0.0
+        scale = np.float16(peak / self.INT8_MAX if peak > 0 else 1.0)
+        quantized = np.clip(
+            np.rint(vector / np.float32(scale)),
+            -self.INT8_MAX, self.INT8_MAX
+        ).astype(np.int8)
+        return quantized, scale
+    
+    def put(self, key: str, vector: Any):
+        """Store an embedding, overwriting any existing row for the key"""
+        vector = np.asarray(vector, dtype=np.float32)
+        # Quantize before taking the lock; only the row writes need it
+        if self.quantize:
+            quantized, scale = self._quantize(vector)
+            norm = np.linalg.norm(quantized * np.float32(scale))
+        else:
+            norm = np.linalg.norm(vector)
+        
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.empty(
+                    (self.capacity, vector.shape[0]),
+                    dtype=np.int8 if self.quantize else np.float32
+                )
+            
+            row = self._rows.get(key)
+            if row is None:
+                if self.size == len(self._matrix):
+                    self._grow()
+                row = self.size
+                self._rows[key] = row
+                self._keys.append(key)
+                self.size += 1
+            
+            if self.quantize:
+                self._matrix[row] = quantized
+                self._scales[row] = scale
+            else:
+                self._matrix[row] = vector
+            self._norms[row] = norm
+    
+    def _row_vector(self, row: int) -> np.ndarray:
+        """Row as float32, dequantizing if needed; caller holds self._lock"""
+        if self.quantize:
+            return self._matrix[row] * np.float32(self._scales[row])
+        return self._matrix[row]
+    
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Get a read-only float32 embedding for a key, if stored"""
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                return None
+            # Copied, so a later overwrite of the row cannot change it
+            vector = np.array(self._row_vector(row), dtype=np.float32)
+        vector.flags.writeable = False
+        return vector
+    
+    def _grow(self):
+        """Double the capacity of the matrix and columns; caller holds self._lock"""
+        capacity = max(1, len(self._matrix) * 2)
+        grown = np.empty(
+            (capacity, self._matrix.shape[1]), dtype=self._matrix.dtype
+        )
+        grown[:self.size] = self._matrix[:self.size]
+        self._matrix = grown
+        
+        for name in ("_scales", "_norms"):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+    
+    def similarities(self, query: Any) -> np.ndarray:
+        """
+        Cosine similarity of a query against every stored embedding
+        
+        Args:
+            query: Query embedding
+            
+        Returns:
+            Similarity per row, in key() order
+        """
+        query = np.asarray(query, dtype=np.float32)
+        if self.quantize:
+            quantized, query_scale = self._quantize(query)
+        
+        with self._lock:
+            if self.size == 0:
+                return np.zeros(0, dtype=np.float32)
+            
+            matrix = self._matrix[:self.size]
+            norms = self._norms[:self.size] * np.linalg.norm(query)
+            
+            if self.quantize:
+                # Integer dot products on the int8 rows, rescaled afterwards
+                dots = embedding_kernels.int8_dots(matrix, quantized)
+                scores = dots.astype(np.float32)
+                scores *= self._scales[:self.size] * np.float32(query_scale)
+            else:
+                scores = matrix @ query
+        
+        # Zero vectors already score 0; skip dividing by their zero norm
+        np.divide(scores, norms, out=scores, where=norms > 0)
+        return scores
+    
+    def key(self, row: int) -> str:
+        """Text key stored at a row"""
+        with self._lock:
+            return self._keys[row]
+    
+    def clear(self):
+        """Drop every embedding, keeping the allocated matrix"""
+        with self._lock:
+            self.size = 0
+            self._rows.clear()
+            self._keys.clear()
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+    
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the stored rows and their per-row columns"""
+        if self._matrix is None:
+            return 0
+        row_bytes = (
+            self._matrix.itemsize * self._matrix.shape[1]
+            + self._scales.itemsize + self._norms.itemsize
+        )
+        return self.size * row_bytes
+
+
+@dataclass(slots=True)
 class AdaptiveMetaGraph:
     """Core adaptive meta-graph data structure"""
     graph_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     
     # Query tracking
-    query_outcomes: List[RetrievalOutcome] = field(default_factory=list)
+    query_outcomes: OutcomeStore = field(default_factory=OutcomeStore)
     query_signatures: Dict[str, QuerySignature] = field(default_factory=dict)
     
     # Graph adaptation
-    edge_weights: Dict[Tuple[str, str, str], GraphEdgeWeight] = field(default_factory=dict)
+    edge_weights: EdgeWeightTable = field(default_factory=EdgeWeightTable)
     
     # Method tracking
-    method_effectiveness: Dict[str, MethodEffectiveness] = field(default_factory=dict)
+    method_effectiveness: MethodEffectivenessTable = field(
+        default_factory=MethodEffectivenessTable
+    )
     
     # Relationship discovery
     latent_relations: Dict[str, LatentRelationship] = field(default_factory=dict)
     
     # Embedding cache
-    embedding_cache: Dict[str, List[float]] = field(default_factory=dict)
+    embedding_cache: EmbeddingStore = field(default_factory=EmbeddingStore)
     
-    # Metadata
-    created_at: datetime = field(default_factory=datetime.now)
-    last_updated: datetime = field(default_factory=datetime.now)
+    # Metadata (time.monotonic_ns ticks)
+    created_at_ns: int = field(default_factory=time.monotonic_ns)
+    last_updated_ns: int = field(default_factory=time.monotonic_ns)
     version: int = 1
     
+    @property
+    def created_at(self) -> datetime:
+        return monotonic_ns_to_datetime(self.created_at_ns)
+    
+    @property
+    def last_updated(self) -> datetime:
+        return monotonic_ns_to_datetime(self.last_updated_ns)
+    
     def get_best_retrieval_method(self, query_type: str) -> RetrievalMethod:
         """Determine best retrieval method for query type"""
         best_method = RetrievalMethod.VECTOR_SEARCH
         best_score = -1.0
         
-        for method_name, method_stat in self.method_effectiveness.items():
-            if method_stat.query_type_signature == query_type:
-                if method_stat.is_reliable() and method_stat.success_rate > best_score:
-                    best_method = method_stat.method
-                    best_score = method_stat.success_rate
+        for method_stat in self.method_effectiveness.for_query_type(query_type):
+            if method_stat.is_reliable() and method_stat.success_rate > best_score:
+                best_method = method_stat.method
+                best_score = method_stat.success_rate
         
         return best_method
     
@@ -216,15 +1189,12 @@ class AdaptiveMetaGraph:
         }
         
         # Override with learned weights if available
-        for method_name, method_stat in self.method_effectiveness.items():
-            if method_stat.query_type_signature == query_type:
-                if method_stat.is_reliable():
-                    for method_enum in RetrievalMethod:
-                        if method_enum.value == method_name:
-                            # Weight by success rate and confidence
-                            weights[method_enum] = (
-                                method_stat.success_rate * method_stat.confidence
-                            )
+        for method_stat in self.method_effectiveness.for_query_type(query_type):
+            if method_stat.is_reliable():
+                # Weight by success rate and confidence
+                weights[method_stat.method] = (
+                    method_stat.success_rate * method_stat.confidence
+                )
         
         # Normalize weights
         total = sum(weights.values())
@@ -234,7 +1204,7 @@ class AdaptiveMetaGraph:
         return weights
 
 
-@dataclass
+@dataclass(slots=True)
 class RAGResponse:
     """Response structure for RAG queries"""
     query: str = ""
@@ -3,11 +3,19 @@ Neo4j Database Manager Component
 Handles all Neo4j graph database operations
 """
 
+import asyncio
 import logging
 from typing import List, Dict, Optional, Tuple, Any
 from datetime import datetime
+from functools import lru_cache
+import re
+import threading
+import time
 
-from neo4j import GraphDatabase, Session, Transaction
+from neo4j import (
+    AsyncDriver, AsyncGraphDatabase, GraphDatabase, Session, Transaction,
+    READ_ACCESS, WRITE_ACCESS
+)
 from neo4j.exceptions import Neo4jError
 
 from config import config
@@ -16,6 +24,127 @@ from models import LatentRelationship, GraphEdgeWeight
 logger = logging.getLogger(__name__)
 
 
+# Labels, relationship types and property keys can't be query
+# parameters, so they are validated before being spliced into Cypher
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _check_identifier(name: str):
+    """Reject names that are not plain Cypher identifiers"""
+    if not _IDENTIFIER_RE.match(name):
+        raise ValueError(f"Invalid Cypher identifier: {name!r}")
+
+
+# Query text is cached per identifier so repeated calls send identical
+# strings, which also lets the server reuse cached plans
+@lru_cache(maxsize=64)
+def _create_node_query(label: str) -> str:
+    """CREATE for one node with a label"""
+    _check_identifier(label)
+    return f"""
+        CREATE (n:{label} $props)
+        SET n.created_at = datetime()
+        RETURN id(n) as node_id
+    """
+
+
+@lru_cache(maxsize=64)
+def _create_nodes_query(label: str) -> str:
+    """UNWIND CREATE for many nodes with a label"""
+    _check_identifier(label)
+    return f"""
+        UNWIND $rows AS props
+        CREATE (n:{label})
+        SET n = props, n.created_at = datetime()
+        RETURN id(n) as node_id
+    """
+
+
+@lru_cache(maxsize=64)
+def _create_relationship_query(relation_type: str) -> str:
+    """CREATE for one relationship of a type"""
+    _check_identifier(relation_type)
+    return f"""
+        MATCH (s) WHERE id(s) = $source_id
+        MATCH (t) WHERE id(t) = $target_id
+        CREATE (s)-[r:{relation_type} $props]->(t)
+        SET r.created_at = datetime()
+        RETURN r
+    """
+
+
+@lru_cache(maxsize=64)
+def _create_relationships_query(relation_type: str) -> str:
+    """UNWIND CREATE for many relationships of a type"""
+    _check_identifier(relation_type)
+    return f"""
+        UNWIND $rows AS row
+        MATCH (s) WHERE id(s) = row.source_id
+        MATCH (t) WHERE id(t) = row.target_id
+        CREATE (s)-[r:{relation_type}]->(t)
+        SET r = row.props, r.created_at = datetime()
+    """
+
+
+@lru_cache(maxsize=64)
+def _update_edge_weight_query(relation_type: str) -> str:
+    """Weight update for a relationship type"""
+    _check_identifier(relation_type)
+    return f"""
+        MATCH (s:Entity {{name: $source}})-
+              [r:{relation_type} {{type: $rel_type}}]->
+              (t:Entity {{name: $target}})
+        SET r.weight = $weight, r.updated_at = datetime()
+        RETURN r
+    """
+
+
+@lru_cache(maxsize=64)
+def _neighbors_query(hops: int) -> str:
+    """Variable-length neighbor expansion up to hops"""
+    if hops < 1:
+        raise ValueError(f"hops must be positive, got {hops}")
+    return f"""
+        MATCH (e:Entity {{name: $name}})-[*1..{hops}]-(neighbor)
+        RETURN DISTINCT neighbor.name as name,
+               labels(neighbor) as labels,
+               neighbor.embedding_id as embedding_id
+        LIMIT 100
+    """
+
+
+@lru_cache(maxsize=64)
+def _search_by_property_query(label: str, property_name: str) -> str:
+    """Property match on a label"""
+    _check_identifier(label)
+    _check_identifier(property_name)
+    return f"""
+        MATCH (n:{label} {{{property_name}: $value}})
+        RETURN properties(n) as props, id(n) as node_id
+        LIMIT 50
+    """
+
+
+@lru_cache(maxsize=64)
+def _weighted_paths_query(max_hops: int) -> str:
+    """Directed paths up to max_hops ranked by total edge weight"""
+    if max_hops < 1:
+        raise ValueError(f"max_hops must be positive, got {max_hops}")
+    # Paths stream lazily, so the candidate LIMIT caps how many are
+    # expanded before the ranking sort
+    return f"""
+        MATCH path = (s:Entity {{name: $source}})-[*1..{max_hops}]->
+                     (t:Entity {{name: $target}})
+        WITH path LIMIT $max_candidates
+        WITH path, reduce(
+            w = 0.0, r IN relationships(path) | w + coalesce(r.weight, 1.0)
+        ) AS weight
+        RETURN path, weight
+        ORDER BY weight DESC
+        LIMIT $limit
+    """
+
+
 class Neo4jManager:
     """Manages Neo4j database operations"""
     
@@ -37,6 +166,57 @@ class Neo4jManager:
         except Neo4jError as e:
             logger.error(f"Failed to connect to Neo4j: {e}")
             raise
+        
+        self._ensure_schema()
+        
+        # Async driver for concurrent read fan-out, created on first use
+        self._async_driver: Optional[AsyncDriver] = None
+        
+        # Cached node/relationship counts and when they expire
+        self._stats: Optional[Dict[str, Any]] = None
+        self._stats_expires_at = 0.0
+    
+    def _ensure_schema(self):
+        """Index Entity.name, which every entity lookup matches on"""
+        with self.driver.session(database=self.cfg.database) as session:
+            # Opt-in: a uniqueness constraint makes duplicate names fail
+            # on create, which plain writes otherwise allow
+            if self.cfg.unique_entity_names:
+                try:
+                    session.run(
+                        "CREATE CONSTRAINT entity_name_unique IF NOT EXISTS "
+                        "FOR (n:Entity) REQUIRE n.name IS UNIQUE"
+                    ).consume()
+                    return
+                except Neo4jError as e:
+                    # Pre-4.4 syntax, or duplicate names already stored
+                    logger.warning(
+                        f"Could not create Entity.name constraint: {e}"
+                    )
+            
+            try:
+                session.run(
+                    "CREATE INDEX entity_name IF NOT EXISTS "
+                    "FOR (n:Entity) ON (n.name)"
+                ).consume()
+            except Neo4jError as e:
+                logger.warning(f"Could not create Entity.name index: {e}")
+    
+    @property
+    def async_driver(self) -> AsyncDriver:
+        """Async driver sharing this manager's connection settings"""
+        if self._async_driver is None:
+            self._async_driver = AsyncGraphDatabase.driver(
+                self.cfg.uri,
+                auth=(self.cfg.username, self.cfg.password)
+            )
+        return self._async_driver
+    
+    async def aclose(self):
+        """Close the async driver; call from the event loop that used it"""
+        if self._async_driver is not None:
+            await self._async_driver.close()
+            self._async_driver = None
     
     def close(self):
         """Close database connection"""
@@ -44,6 +224,26 @@ class Neo4jManager:
             self.driver.close()
             logger.info("Closed Neo4j connection")
     
+    def _session(self, access_mode: str) -> Session:
+        """
+        Open a session for an access mode
+        
+        Sessions are cheap and not thread-safe; the driver pools the
+        connections underneath, so each call opens its own.
+        """
+        return self.driver.session(
+            database=self.cfg.database,
+            default_access_mode=access_mode
+        )
+    
+    def _read_session(self) -> Session:
+        """Open a read session (routed to readers)"""
+        return self._session(READ_ACCESS)
+    
+    def _write_session(self) -> Session:
+        """Open a write session"""
+        return self._session(WRITE_ACCESS)
+    
     def create_node(
         self,
         label: str,
@@ -59,13 +259,9 @@ class Neo4jManager:
         Returns:
             Node ID
         """
-        with self.driver.session(database=self.cfg.database) as session:
-            query = f"""
-                CREATE (n:{label} $props)
-                SET n.created_at = datetime()
-                RETURN id(n) as node_id
-            """
-            
+        query = _create_node_query(label)
+        
+        with self._write_session() as session:
             result = session.run(query, props=properties)
             record = result.single()
             
@@ -76,6 +272,36 @@ class Neo4jManager:
         
         return ""
     
+    def create_nodes(
+        self,
+        label: str,
+        properties_list: List[Dict[str, Any]]
+    ) -> List[str]:
+        """
+        Create many nodes in one transaction
+        
+        Args:
+            label: Node label shared by all nodes
+            properties_list: Properties for each node
+            
+        Returns:
+            Node IDs, in input order
+        """
+        if not properties_list:
+            return []
+        
+        query = _create_nodes_query(label)
+        
+        def write(tx: Transaction) -> List[str]:
+            result = tx.run(query, rows=properties_list)
+            return [str(record["node_id"]) for record in result]
+        
+        with self._write_session() as session:
+            node_ids = session.execute_write(write)
+        
+        logger.debug(f"Created {len(node_ids)} nodes with label {label}")
+        return node_ids
+    
     def create_relationship(
         self,
         source_id: str,
@@ -95,22 +321,16 @@ class Neo4jManager:
         if properties is None:
             properties = {}
         
-        with self.driver.session(database=self.cfg.database) as session:
-            query = f"""
-                MATCH (s) WHERE id(s) = $source_id
-                MATCH (t) WHERE id(t) = $target_id
-                CREATE (s)-[r:{relation_type} $props]->(t)
-                SET r.created_at = datetime()
-                RETURN r
-            """
-            
+        query = _create_relationship_query(relation_type)
+        
+        with self._write_session() as session:
             try:
                 session.run(
                     query,
                     source_id=int(source_id),
                     target_id=int(target_id),
                     props=properties
-                )
+                ).consume()
                 logger.debug(
                     f"Created relationship {relation_type} "
                     f"from {source_id} to {target_id}"
@@ -118,6 +338,42 @@ class Neo4jManager:
             except Neo4jError as e:
                 logger.error(f"Failed to create relationship: {e}")
     
+    def create_relationships(
+        self,
+        relation_type: str,
+        relationships: List[Tuple[str, str, Optional[Dict[str, Any]]]]
+    ):
+        """
+        Create many relationships of one type in one transaction
+        
+        Args:
+            relation_type: Relationship type shared by all relationships
+            relationships: (source_id, target_id, properties) triples
+        """
+        if not relationships:
+            return
+        
+        query = _create_relationships_query(relation_type)
+        rows = [
+            {
+                "source_id": int(source_id),
+                "target_id": int(target_id),
+                "props": properties or {},
+            }
+            for source_id, target_id, properties in relationships
+        ]
+        
+        try:
+            with self._write_session() as session:
+                session.execute_write(
+                    lambda tx: tx.run(query, rows=rows).consume()
+                )
+            logger.debug(
+                f"Created {len(rows)} {relation_type} relationships"
+            )
+        except Neo4jError as e:
+            logger.error(f"Failed to create relationships: {e}")
+    
     def add_latent_relationship(
         self,
         relationship: LatentRelationship
@@ -137,7 +393,7 @@ class Neo4jManager:
             )
             return
         
-        with self.driver.session(database=self.cfg.database) as session:
+        with self._write_session() as session:
             query = """
                 MATCH (s:Entity {name: $source})
                 MATCH (t:Entity {name: $target})
@@ -158,7 +414,7 @@ class Neo4jManager:
                     rel_type=relationship.relationship_type,
                     confidence=relationship.confidence_score,
                     status=relationship.status
-                )
+                ).consume()
                 logger.info(
                     f"Added latent relationship to Neo4j: "
                     f"{relationship.source_entity}-"
@@ -168,6 +424,52 @@ class Neo4jManager:
             except Neo4jError as e:
                 logger.warning(f"Failed to add latent relationship: {e}")
     
+    def add_latent_relationships(
+        self,
+        relationships: List[LatentRelationship]
+    ):
+        """
+        Add many discovered latent relationships in one transaction
+        
+        Args:
+            relationships: LatentRelationship objects; only approved and
+                active ones are written
+        """
+        rows = [
+            {
+                "source": rel.source_entity,
+                "target": rel.target_entity,
+                "rel_type": rel.relationship_type,
+                "confidence": rel.confidence_score,
+                "status": rel.status,
+            }
+            for rel in relationships
+            if rel.status in ("approved", "active")
+        ]
+        if not rows:
+            return
+        
+        query = """
+            UNWIND $rows AS row
+            MATCH (s:Entity {name: row.source})
+            MATCH (t:Entity {name: row.target})
+            CREATE (s)-[r:LATENT_RELATIONSHIP {
+                type: row.rel_type,
+                confidence: row.confidence,
+                discovered_at: datetime(),
+                status: row.status
+            }]->(t)
+        """
+        
+        try:
+            with self._write_session() as session:
+                session.execute_write(
+                    lambda tx: tx.run(query, rows=rows).consume()
+                )
+            logger.info(f"Added {len(rows)} latent relationships to Neo4j")
+        except Neo4jError as e:
+            logger.warning(f"Failed to add latent relationships: {e}")
+    
     def update_edge_weight(
         self,
         source_entity: str,
@@ -184,15 +486,9 @@ class Neo4jManager:
             relation_type: Relationship type
             weight: New weight value
         """
-        with self.driver.session(database=self.cfg.database) as session:
-            query = f"""
-                MATCH (s:Entity {{name: $source}})-
-                      [r:{relation_type} {{type: $rel_type}}]->
-                      (t:Entity {{name: $target}})
-                SET r.weight = $weight, r.updated_at = datetime()
-                RETURN r
-            """
-            
+        query = _update_edge_weight_query(relation_type)
+        
+        with self._write_session() as session:
             try:
                 result = session.run(
                     query,
@@ -225,15 +521,9 @@ class Neo4jManager:
         Returns:
             List of neighboring entities
         """
-        with self.driver.session(database=self.cfg.database) as session:
-            query = f"""
-                MATCH (e:Entity {{name: $name}})-[*1..{hops}]-(neighbor)
-                RETURN DISTINCT neighbor.name as name,
-                       labels(neighbor) as labels,
-                       neighbor.embedding_id as embedding_id
-                LIMIT 100
-            """
-            
+        query = _neighbors_query(hops)
+        
+        with self._read_session() as session:
             try:
                 result = session.run(query, name=entity_name)
                 return [dict(record) for record in result]
@@ -258,13 +548,9 @@ class Neo4jManager:
         Returns:
             List of matching nodes
         """
-        with self.driver.session(database=self.cfg.database) as session:
-            query = f"""
-                MATCH (n:{label} {{{property_name}: $value}})
-                RETURN properties(n) as props, id(n) as node_id
-                LIMIT 50
-            """
-            
+        query = _search_by_property_query(label, property_name)
+        
+        with self._read_session() as session:
             try:
                 result = session.run(
                     query,
@@ -277,40 +563,98 @@ class Neo4jManager:
                 )
                 return []
     
+    async def _aread(self, query: str, **params) -> List[Dict[str, Any]]:
+        """Run a read query on the async driver"""
+        async with self.async_driver.session(
+            database=self.cfg.database,
+            default_access_mode=READ_ACCESS
+        ) as session:
+            result = await session.run(query, **params)
+            return [dict(record) async for record in result]
+    
+    async def aget_entity_neighbors(
+        self,
+        entity_name: str,
+        hops: int = 2
+    ) -> List[Dict[str, Any]]:
+        """Async get_entity_neighbors"""
+        try:
+            return await self._aread(_neighbors_query(hops), name=entity_name)
+        except Neo4jError as e:
+            logger.warning(f"Failed to get entity neighbors: {e}")
+            return []
+    
+    async def asearch_by_property(
+        self,
+        label: str,
+        property_name: str,
+        property_value: Any
+    ) -> List[Dict[str, Any]]:
+        """Async search_by_property"""
+        try:
+            return await self._aread(
+                _search_by_property_query(label, property_name),
+                value=property_value
+            )
+        except Neo4jError as e:
+            logger.warning(f"Failed to search by property: {e}")
+            return []
+    
+    async def aget_neighbors_many(
+        self,
+        entity_names: List[str],
+        hops: int = 2
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Expand several entities concurrently
+        
+        Args:
+            entity_names: Seed entity names
+            hops: Number of hops
+            
+        Returns:
+            Neighbor lists, in input order
+        """
+        return list(await asyncio.gather(*(
+            self.aget_entity_neighbors(name, hops) for name in entity_names
+        )))
+    
     def get_highest_weighted_paths(
         self,
         source_entity: str,
         target_entity: str,
-        limit: int = 5
+        limit: int = 5,
+        max_hops: int = 3,
+        max_candidates: int = 1000
     ) -> List[List[Dict[str, Any]]]:
         """
         Find highest weighted paths between entities
         
+        Directed paths from source to target are ranked by the sum of
+        their edge weights (1.0 for unweighted edges). Only the first
+        max_candidates paths found are ranked, which bounds the expansion
+        on dense graphs.
+        
         Args:
             source_entity: Source entity
             target_entity: Target entity
             limit: Max paths to return
+            max_hops: Max path length
+            max_candidates: Max paths expanded before ranking
             
         Returns:
             List of paths
         """
-        with self.driver.session(database=self.cfg.database) as session:
-            query = """
-                MATCH (s:Entity {name: $source}),
-                      (t:Entity {name: $target})
-                CALL apoc.algo.dijkstra(s, t, 'weight', 5)
-                YIELD path, weight
-                RETURN path, weight
-                ORDER BY weight DESC
-                LIMIT $limit
-            """
-            
+        query = _weighted_paths_query(max_hops)
+        
+        with self._read_session() as session:
             try:
                 result = session.run(
                     query,
                     source=source_entity,
                     target=target_entity,
-                    limit=limit
+                    limit=limit,
+                    max_candidates=max_candidates
                 )
                 paths = []
                 for record in result:
@@ -326,32 +670,59 @@ class Neo4jManager:
                 return []
     
     def get_statistics(self) -> Dict[str, Any]:
-        """Get database statistics"""
-        with self.driver.session(database=self.cfg.database) as session:
-            # Get node counts
-            node_query = "MATCH (n) RETURN count(n) as count"
-            node_result = session.run(node_query).single()
-            node_count = node_result["count"] if node_result else 0
-            
-            # Get relationship counts
-            rel_query = "MATCH ()-[r]->() RETURN count(r) as count"
-            rel_result = session.run(rel_query).single()
-            rel_count = rel_result["count"] if rel_result else 0
-            
-            return {
-                "nodes": node_count,
-                "relationships": rel_count,
-                "database": self.cfg.database,
-            }
+        """
+        Get database statistics
+        
+        Counts are cached for stats_cache_ttl_seconds.
+        
+        Returns:
+            Node and relationship counts
+        """
+        now = time.monotonic()
+        if self._stats is not None and now < self._stats_expires_at:
+            return dict(self._stats)
+        
+        with self._read_session() as session:
+            try:
+                # Read counts from store metadata when APOC is installed
+                result = session.run(
+                    "CALL apoc.meta.stats() YIELD nodeCount, relCount "
+                    "RETURN nodeCount, relCount"
+                ).single()
+                node_count = result["nodeCount"] if result else 0
+                rel_count = result["relCount"] if result else 0
+            except Neo4jError as e:
+                logger.debug(f"apoc.meta.stats unavailable, counting: {e}")
+                
+                # Get node counts
+                node_query = "MATCH (n) RETURN count(n) as count"
+                node_result = session.run(node_query).single()
+                node_count = node_result["count"] if node_result else 0
+                
+                # Get relationship counts
+                rel_query = "MATCH ()-[r]->() RETURN count(r) as count"
+                rel_result = session.run(rel_query).single()
+                rel_count = rel_result["count"] if rel_result else 0
+        
+        self._stats = {
+            "nodes": node_count,
+            "relationships": rel_count,
+            "database": self.cfg.database,
+        }
+        self._stats_expires_at = now + self.cfg.stats_cache_ttl_seconds
+        return dict(self._stats)
 
 
 # Global instance
 neo4j_instance: Optional[Neo4jManager] = None
+_instance_lock = threading.Lock()
 
 
 def get_neo4j_manager() -> Neo4jManager:
     """Get or create Neo4j manager instance"""
     global neo4j_instance
     if neo4j_instance is None:
-        neo4j_instance = Neo4jManager()
+        with _instance_lock:
+            if neo4j_instance is None:
+                neo4j_instance = Neo4jManager()
     return neo4j_instance
\ No newline at end of file
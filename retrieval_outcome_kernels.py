@@ -0,0 +1,93 @@
+"""
+Retrieval Outcome Kernels
+Fused filter-and-aggregate kernel for per-method outcome statistics
+
+Kernels take the columns of a time window, oldest row first.
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # Fall back to NumPy masks and reductions
+    numba = None
+
+
+def _method_stats_numpy(
+    method_id: np.ndarray,
+    query_type_id: np.ndarray,
+    composite_score: np.ndarray,
+    execution_time_ms: np.ndarray,
+    method: int,
+    query_type: int,
+    threshold: float
+):
+    """NumPy implementation of method_stats"""
+    mask = method_id == method
+    if query_type >= 0:
+        mask &= query_type_id == query_type
+
+    total = int(np.count_nonzero(mask))
+    passed = int(np.count_nonzero(composite_score[mask] > threshold))
+
+    # The moving average is seeded with the first nonzero time, then
+    # decays by 0.8 per sample
+    times = execution_time_ms[mask]
+    nonzero = np.flatnonzero(times)
+    average_time = 0.0
+    if len(nonzero):
+        times = np.asarray(times[nonzero[0]:], dtype=np.float64)
+        weights = 0.2 * np.power(0.8, np.arange(len(times) - 1, -1, -1))
+        weights[0] = 0.8 ** (len(times) - 1)
+        average_time = float(times @ weights)
+
+    return total, passed, average_time
+
+
+def _method_stats_loop(
+    method_id, query_type_id, composite_score, execution_time_ms,
+    method, query_type, threshold
+):
+    """Single-pass loop implementation of method_stats, compiled by Numba"""
+    total = 0
+    passed = 0
+    average_time = 0.0
+    for i in range(method_id.shape[0]):
+        if method_id[i] != method:
+            continue
+        if query_type >= 0 and query_type_id[i] != query_type:
+            continue
+
+        total += 1
+        if composite_score[i] > threshold:
+            passed += 1
+
+        # Same recurrence as MethodEffectiveness.update(), in row order
+        if average_time == 0.0:
+            average_time = np.float64(execution_time_ms[i])
+        else:
+            average_time = 0.8 * average_time + 0.2 * execution_time_ms[i]
+
+    return total, passed, average_time
+
+
+# Not parallel: the moving average depends on row order. No fastmath,
+# so the recurrence rounds exactly as the per-sample update does
+if numba is not None:
+    method_stats = numba.njit(cache=True)(_method_stats_loop)
+else:
+    method_stats = _method_stats_numpy
+
+
+def warmup():
+    """Compile the kernel ahead of the first effectiveness query"""
+    if numba is None:
+        return
+
+    method_stats(
+        np.zeros(1, dtype=np.int8),
+        np.zeros(1, dtype=np.int32),
+        np.zeros(1, dtype=np.float32),
+        np.zeros(1, dtype=np.float32),
+        0, -1, 0.5
+    )
@@ -4,20 +4,80 @@ Tracks and records all retrieval outcomes for learning
 """
 
 import logging
+import multiprocessing
+import os
+import threading
 from typing import Dict, List, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime
 import json
+import time
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Fall back to NDJSON snapshots
+    pa = None
+    pq = None
+
 from models import (
     RetrievalOutcome, QuerySignature, RetrievalMethod,
-    AdaptiveMetaGraph, MethodEffectiveness
+    AdaptiveMetaGraph, MethodEffectiveness, OutcomeStore, METHOD_IDS,
+    monotonic_ns_to_unix, monotonic_ns_to_unix_ns, unix_ns_to_monotonic_ns
 )
 from config import config
+import retrieval_outcome_kernels as kernels
 
 logger = logging.getLogger(__name__)
 
 
+def _dumps_line(record: Dict) -> bytes:
+    """Serialize one record as a newline-terminated JSON line"""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record) + "\n").encode("utf-8")
+
+
+# Field order of the row tuples serialized by _batch_json
+_EXPORT_FIELDS = (
+    "outcome_id", "query_id", "query_text", "method", "success",
+    "composite_score", "execution_time_ms", "created_at",
+)
+
+
+def _batch_json(rows: List[Tuple]) -> bytes:
+    """Serialize a batch of export rows; top-level so pool workers can run it"""
+    return b"".join(
+        _dumps_line(dict(zip(_EXPORT_FIELDS, row))) for row in rows
+    )
+
+
+def _loads(line: bytes) -> Dict:
+    """Parse one JSON line"""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def _cutoff_ns(days: int) -> int:
+    """Monotonic tick for the start of a window of the last N days"""
+    return time.monotonic_ns() - int(days * 86400 * 1e9)
+
+
+# Methods by METHOD_IDS ordinal, for decoding persisted outcomes
+_METHODS: Tuple[RetrievalMethod, ...] = tuple(METHOD_IDS)
+# Method values by the same ordinal, so per-outcome and per-method loops
+# skip the enum value lookup
+_METHOD_VALUES: Tuple[str, ...] = tuple(method.value for method in _METHODS)
+
+
 class RetrievalOutcomeTracker:
     """Tracks all retrieval outcomes and enables learning from them"""
     
@@ -25,12 +85,33 @@ class RetrievalOutcomeTracker:
         """Initialize the tracker"""
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.cfg = config.outcome_tracker
         
+        # Outcomes are trimmed back to max_retained_outcomes only once
+        # they exceed it by retention_slack, so each trim is amortized
         self.outcomes: List[RetrievalOutcome] = []
+        # Columns parallel to outcomes for vectorized aggregates; outcomes
+        # are appended as they are created, so rows stay in time order
+        self.columns = OutcomeStore(recent_window=0)
         self.query_signatures: Dict[str, QuerySignature] = {}
         
+        # Summaries by window with their expiry, valid while no outcome
+        # is recorded; total_recorded only grows, even past trims
+        self.total_recorded = 0
+        self._summary_cache: Dict[int, Tuple[float, Dict]] = {}
+        self._summary_cache_recorded = 0
+        
+        # Append-only log of outcomes recorded since the last snapshot
+        self._wal_path = self.storage_path / "outcomes.wal.ndjson"
+        self._wal_fp = None
+        # Records in the log, checkpointed past wal_checkpoint_records
+        self._wal_records = 0
+        
         # Load existing outcomes if available
         self._load_outcomes()
+        
+        # Pay kernel compilation off the hot path
+        kernels.warmup()
     
     def record_outcome(
         self,
@@ -73,30 +154,79 @@ class RetrievalOutcomeTracker:
             execution_time_ms=execution_time_ms,
         )
         
-        self.outcomes.append(outcome)
-        self.query_signatures[query_signature.query_id] = query_signature
+        score = outcome.composite_success_score()
+        self._append(outcome, score)
+        
+        if self.cfg.wal_enabled:
+            self._write_wal(outcome)
+            if self._wal_records >= self.cfg.wal_checkpoint_records:
+                self._checkpoint()
         
         logger.info(
             f"Recorded outcome: {outcome.outcome_id} | "
             f"Method: {retrieval_method.value} | "
             f"Success: {success} | "
-            f"Score: {outcome.composite_success_score():.2f}"
+            f"Score: {score:.2f}"
         )
         
         return outcome
     
+    def _append(self, outcome: RetrievalOutcome, score: float):
+        """Add an outcome to the list and columns, trimming if over budget"""
+        self.outcomes.append(outcome)
+        self.columns.append(outcome, score)
+        self.total_recorded += 1
+        self.query_signatures[outcome.query_signature.query_id] = (
+            outcome.query_signature
+        )
+        
+        if len(self.outcomes) > (
+            self.cfg.max_retained_outcomes + self.cfg.retention_slack
+        ):
+            self._drop_oldest(
+                len(self.outcomes) - self.cfg.max_retained_outcomes
+            )
+    
+    def _drop_oldest(self, count: int):
+        """Forget the oldest outcomes and their query signatures"""
+        for outcome in self.outcomes[:count]:
+            self.query_signatures.pop(outcome.query_signature.query_id, None)
+        del self.outcomes[:count]
+        self.columns.drop_oldest(count)
+        logger.debug(f"Dropped {count} oldest outcomes")
+    
+    def _window_start(self, days: int) -> int:
+        """First row created in the last N days, found by binary search"""
+        return self.columns.window_start(_cutoff_ns(days))
+    
+    def _recent_slice(self, days: int) -> List[RetrievalOutcome]:
+        """Outcomes created in the last N days"""
+        return self.outcomes[self._window_start(days):]
+    
+    def _recent_mask(
+        self,
+        days: int,
+        method: Optional[RetrievalMethod] = None
+    ) -> Tuple[int, Optional[np.ndarray]]:
+        """
+        Locate recent rows, optionally for one method
+        
+        Returns:
+            Tuple of (window start row, method mask over the window or None)
+        """
+        start = self._window_start(days)
+        if method is None:
+            return start, None
+        return start, self.columns.method_id[start:] == METHOD_IDS[method]
+    
     def get_outcomes_by_method(
         self,
         method: RetrievalMethod,
         days: int = 30
     ) -> List[RetrievalOutcome]:
         """Get outcomes for a specific retrieval method in recent days"""
-        cutoff_date = datetime.now() - timedelta(days=days)
-        
-        return [
-            o for o in self.outcomes
-            if o.retrieval_method == method and o.created_at >= cutoff_date
-        ]
+        start, mask = self._recent_mask(days, method)
+        return self._outcomes_where(start, mask)
     
     def get_outcomes_by_query_type(
         self,
@@ -104,13 +234,24 @@ class RetrievalOutcomeTracker:
         days: int = 30
     ) -> List[RetrievalOutcome]:
         """Get outcomes for a specific query type"""
-        cutoff_date = datetime.now() - timedelta(days=days)
+        # One int compare per row against the interned query type ID
+        query_type_id = self.columns.query_types.lookup(query_type)
+        if query_type_id is None:
+            return []
         
-        return [
-            o for o in self.outcomes
-            if o.query_signature.query_type == query_type 
-            and o.created_at >= cutoff_date
-        ]
+        start = self._window_start(days)
+        return self._outcomes_where(
+            start, self.columns.query_type_id[start:] == query_type_id
+        )
+    
+    def _outcomes_where(
+        self,
+        start: int,
+        mask: np.ndarray
+    ) -> List[RetrievalOutcome]:
+        """Outcome objects for the masked rows of a window"""
+        outcomes = self.outcomes
+        return [outcomes[start + i] for i in np.flatnonzero(mask).tolist()]
     
     def calculate_method_effectiveness(
         self,
@@ -129,24 +270,31 @@ class RetrievalOutcomeTracker:
         Returns:
             MethodEffectiveness object
         """
-        outcomes = self.get_outcomes_by_method(method, days)
-        
+        query_type_id = -1
         if query_type:
-            outcomes = [
-                o for o in outcomes
-                if o.query_signature.query_type == query_type
-            ]
+            query_type_id = self.columns.query_types.lookup(query_type)
+            if query_type_id is None:
+                return MethodEffectiveness(
+                    method=method,
+                    query_type_signature=query_type
+                )
         
-        effectiveness = MethodEffectiveness(
-            method=method,
-            query_type_signature=query_type
+        # One fused pass over the window; composite scores were computed
+        # once, at record time
+        start = self._window_start(days)
+        total, passed, average_time = kernels.method_stats(
+            self.columns.method_id[start:],
+            self.columns.query_type_id[start:],
+            self.columns.composite_score[start:],
+            self.columns.execution_time_ms[start:],
+            METHOD_IDS[method],
+            query_type_id,
+            0.5
         )
         
-        for outcome in outcomes:
-            success = outcome.composite_success_score() > 0.5
-            effectiveness.update(success, outcome.execution_time_ms)
-        
-        return effectiveness
+        return MethodEffectiveness.from_counts(
+            method, query_type, total, passed, average_time
+        )
     
     def get_failed_retrievals(
         self,
@@ -154,18 +302,14 @@ class RetrievalOutcomeTracker:
         days: int = 30
     ) -> List[RetrievalOutcome]:
         """Get recent failed retrievals for analysis"""
-        cutoff_date = datetime.now() - timedelta(days=days)
-        
-        failed = [
-            o for o in self.outcomes
-            if not o.success and o.created_at >= cutoff_date
-        ]
-        
-        return sorted(
-            failed,
-            key=lambda x: x.created_at,
-            reverse=True
-        )[:limit]
+        start = self._window_start(days)
+        failed_rows = np.flatnonzero(~self.columns.success[start:])
+        
+        # Rows are in creation order, so the newest failures are the last
+        # ones; no sort or top-k selection needed
+        newest = failed_rows[::-1][:limit]
+        outcomes = self.outcomes
+        return [outcomes[start + i] for i in newest.tolist()]
     
     def get_success_rate(
         self,
@@ -173,19 +317,15 @@ class RetrievalOutcomeTracker:
         days: int = 30
     ) -> float:
         """Calculate success rate"""
-        outcomes = self.outcomes
+        start, mask = self._recent_mask(days, method)
+        success = self.columns.success[start:]
+        if mask is not None:
+            success = success[mask]
         
-        cutoff_date = datetime.now() - timedelta(days=days)
-        outcomes = [o for o in outcomes if o.created_at >= cutoff_date]
-        
-        if method:
-            outcomes = [o for o in outcomes if o.retrieval_method == method]
-        
-        if not outcomes:
+        if not len(success):
             return 0.0
         
-        successful = sum(1 for o in outcomes if o.success)
-        return successful / len(outcomes)
+        return float(success.mean())
     
     def get_average_execution_time(
         self,
@@ -193,101 +333,457 @@ class RetrievalOutcomeTracker:
         days: int = 30
     ) -> float:
         """Get average execution time in milliseconds"""
-        outcomes = self.outcomes
-        
-        cutoff_date = datetime.now() - timedelta(days=days)
-        outcomes = [o for o in outcomes if o.created_at >= cutoff_date]
+        start, mask = self._recent_mask(days, method)
+        execution_time_ms = self.columns.execution_time_ms[start:]
+        if mask is not None:
+            execution_time_ms = execution_time_ms[mask]
         
-        if method:
-            outcomes = [o for o in outcomes if o.retrieval_method == method]
-        
-        if not outcomes:
+        if not len(execution_time_ms):
             return 0.0
         
-        total_time = sum(o.execution_time_ms for o in outcomes)
-        return total_time / len(outcomes)
+        return float(execution_time_ms.mean(dtype=np.float64))
     
     def get_performance_summary(self, days: int = 30) -> Dict:
-        """Get comprehensive performance summary"""
+        """
+        Get comprehensive performance summary
+        
+        Summaries are reused until an outcome is recorded or
+        summary_cache_ttl_seconds pass.
+        
+        Args:
+            days: Time window in days
+            
+        Returns:
+            Overall and per-method metrics
+        """
+        if self._summary_cache_recorded != self.total_recorded:
+            self._summary_cache.clear()
+            self._summary_cache_recorded = self.total_recorded
+        
+        now = time.monotonic()
+        cached = self._summary_cache.get(days)
+        if cached is not None and now < cached[0]:
+            return dict(cached[1])
+        
+        summary = self._compute_performance_summary(days)
+        self._summary_cache[days] = (
+            now + self.cfg.summary_cache_ttl_seconds,
+            summary
+        )
+        return dict(summary)
+    
+    def _compute_performance_summary(self, days: int) -> Dict:
+        """Aggregate the performance summary for a window"""
         summary = {
             "timestamp": datetime.now().isoformat(),
             "time_window_days": days,
             "total_outcomes": len(self.outcomes),
         }
         
+        # Group the window by method in one pass per column
+        start = self._window_start(days)
+        method_id = self.columns.method_id[start:]
+        num_methods = len(METHOD_IDS)
+        counts = np.bincount(method_id, minlength=num_methods)
+        successes = np.bincount(
+            method_id, weights=self.columns.success[start:],
+            minlength=num_methods
+        )
+        time_sums = np.bincount(
+            method_id, weights=self.columns.execution_time_ms[start:],
+            minlength=num_methods
+        )
+        confidence_sums = np.bincount(
+            method_id, weights=self.columns.confidence[start:],
+            minlength=num_methods
+        )
+        
         # Overall metrics
-        summary["overall_success_rate"] = self.get_success_rate(days=days)
+        total = int(counts.sum())
+        summary["overall_success_rate"] = (
+            float(successes.sum()) / total if total else 0.0
+        )
         summary["overall_avg_execution_time_ms"] = (
-            self.get_average_execution_time(days=days)
+            float(time_sums.sum()) / total if total else 0.0
         )
         
         # Per-method metrics
         summary["methods"] = {}
-        for method in RetrievalMethod:
-            outcomes = self.get_outcomes_by_method(method, days)
-            if outcomes:
-                summary["methods"][method.value] = {
-                    "count": len(outcomes),
-                    "success_rate": self.get_success_rate(method, days),
+        for method_index, method_value in enumerate(_METHOD_VALUES):
+            count = int(counts[method_index])
+            if count:
+                summary["methods"][method_value] = {
+                    "count": count,
+                    "success_rate": float(successes[method_index]) / count,
                     "avg_execution_time_ms": (
-                        self.get_average_execution_time(method, days)
+                        float(time_sums[method_index]) / count
+                    ),
+                    "avg_confidence": (
+                        float(confidence_sums[method_index]) / count
                     ),
-                    "avg_confidence": sum(
-                        o.confidence_score for o in outcomes
-                    ) / len(outcomes),
                 }
         
         return summary
     
-    def export_outcomes(self, filepath: str):
-        """Export outcomes to JSON file"""
-        data = {
-            "exported_at": datetime.now().isoformat(),
-            "total_outcomes": len(self.outcomes),
-            "outcomes": [
-                {
-                    "outcome_id": o.outcome_id,
-                    "query_id": o.query_signature.query_id,
-                    "query_text": o.query_signature.query_text,
-                    "method": o.retrieval_method.value,
-                    "success": o.success,
-                    "composite_score": o.composite_success_score(),
-                    "execution_time_ms": o.execution_time_ms,
-                    "created_at": o.created_at.isoformat(),
-                }
-                for o in self.outcomes
+    def export_outcomes(
+        self,
+        filepath: str,
+        num_proc: Optional[int] = None,
+        batch_size: int = 10000
+    ):
+        """
+        Export outcomes to a newline-delimited JSON file
+        
+        The first line is a header with the export time and outcome
+        count; each following line is one outcome. Batches are written
+        as they are serialized, so the export is never held in memory.
+        
+        Args:
+            filepath: Output path
+            num_proc: Worker processes for serialization (None for serial)
+            batch_size: Outcomes per serialized batch
+        """
+        columns = self.columns
+        outcomes = self.outcomes
+        
+        # Numeric fields come from the columns as whole-list conversions;
+        # only the strings and the float64 execution time are read from
+        # the outcome objects. Scores are stored as float32; round off the
+        # widening noise
+        scores = np.round(columns.composite_score.astype(np.float64), 6).tolist()
+        successes = columns.success.tolist()
+        method_ids = columns.method_id.tolist()
+        # Ticks to wall-clock seconds in one vector op, not per outcome
+        created_at = monotonic_ns_to_unix(columns.created_at_ns).tolist()
+        fromtimestamp = datetime.fromtimestamp
+        
+        def export_rows(offset: int) -> List[Tuple]:
+            end = offset + batch_size
+            return [
+                (
+                    o.outcome_id,
+                    o.query_signature.query_id,
+                    o.query_signature.query_text,
+                    _METHOD_VALUES[method_id],
+                    success,
+                    score,
+                    o.execution_time_ms,
+                    fromtimestamp(created).isoformat(),
+                )
+                for o, method_id, success, score, created in zip(
+                    outcomes[offset:end],
+                    method_ids[offset:end],
+                    successes[offset:end],
+                    scores[offset:end],
+                    created_at[offset:end]
+                )
             ]
-        }
         
         Path(filepath).parent.mkdir(parents=True, exist_ok=True)
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        with open(filepath, 'wb') as f:
+            f.write(_dumps_line({
+                "exported_at": datetime.now().isoformat(),
+                "total_outcomes": len(outcomes),
+            }))
+            
+            batches = (
+                export_rows(offset)
+                for offset in range(0, len(outcomes), batch_size)
+            )
+            
+            if num_proc and num_proc > 1 and len(outcomes) > batch_size:
+                # Spawned workers import only this module, never a copy
+                # of a threaded server; imap keeps batches in order
+                context = multiprocessing.get_context("spawn")
+                with context.Pool(num_proc) as pool:
+                    for chunk in pool.imap(_batch_json, batches):
+                        f.write(chunk)
+            else:
+                for batch in batches:
+                    f.write(_batch_json(batch))
         
         logger.info(f"Exported outcomes to {filepath}")
     
+    # ==================== Persistence ====================
+    
+    def _restore_outcome(
+        self,
+        outcome_id: str,
+        query_id: str,
+        query_text: str,
+        query_type: str,
+        method_id: int,
+        success: bool,
+        confidence_score: float,
+        reasoning_validity: float,
+        embedding_coherence: float,
+        execution_time_ms: float,
+        created_at_ns: int
+    ) -> RetrievalOutcome:
+        """Rebuild a persisted outcome, sharing signatures by query ID"""
+        signature = self.query_signatures.get(query_id)
+        if signature is None:
+            signature = QuerySignature(
+                query_id=query_id,
+                query_text=query_text,
+                query_type=query_type,
+                created_at_ns=created_at_ns
+            )
+            self.query_signatures[query_id] = signature
+        
+        return RetrievalOutcome(
+            outcome_id=outcome_id,
+            query_signature=signature,
+            retrieval_method=_METHODS[method_id],
+            success=success,
+            confidence_score=confidence_score,
+            reasoning_validity=reasoning_validity,
+            embedding_coherence=embedding_coherence,
+            execution_time_ms=execution_time_ms,
+            created_at_ns=created_at_ns,
+        )
+    
+    @staticmethod
+    def _wal_record(outcome: RetrievalOutcome) -> Dict:
+        """Write-ahead log record for one outcome"""
+        return {
+            "outcome_id": outcome.outcome_id,
+            "query_id": outcome.query_signature.query_id,
+            "query_text": outcome.query_signature.query_text,
+            "query_type": outcome.query_signature.query_type,
+            "method_id": METHOD_IDS[outcome.retrieval_method],
+            "success": outcome.success,
+            "confidence_score": outcome.confidence_score,
+            "reasoning_validity": outcome.reasoning_validity,
+            "embedding_coherence": outcome.embedding_coherence,
+            "execution_time_ms": outcome.execution_time_ms,
+            "created_at_unix_ns": int(
+                monotonic_ns_to_unix_ns(outcome.created_at_ns)
+            ),
+        }
+    
+    def _write_wal(self, outcome: RetrievalOutcome):
+        """Append one outcome to the write-ahead log"""
+        if self._wal_fp is None:
+            self._wal_fp = open(self._wal_path, 'ab')
+        
+        self._wal_fp.write(_dumps_line(self._wal_record(outcome)))
+        self._wal_fp.flush()
+        if self.cfg.wal_fsync:
+            os.fsync(self._wal_fp.fileno())
+        self._wal_records += 1
+    
+    def _checkpoint(self):
+        """Fold the write-ahead log into a snapshot so it stays bounded"""
+        if pq is not None:
+            self.save_outcomes()
+            return
+        
+        # Without pyarrow the log is the only persisted copy; rewrite it
+        # with just the retained outcomes
+        self._close_wal()
+        partial = self._wal_path.with_suffix(".ndjson.tmp")
+        with open(partial, 'wb') as f:
+            for outcome in self.outcomes:
+                f.write(_dumps_line(self._wal_record(outcome)))
+        partial.replace(self._wal_path)
+        self._wal_records = len(self.outcomes)
+        
+        logger.info(
+            f"Compacted {self._wal_path} to {self._wal_records} outcomes"
+        )
+    
+    def _replay_wal(self):
+        """Re-record outcomes logged after the last snapshot"""
+        if not self._wal_path.exists():
+            return
+        
+        # A crash between snapshot and truncate leaves logged outcomes
+        # that the snapshot already holds
+        loaded = {o.outcome_id for o in self.outcomes}
+        replayed = 0
+        
+        with open(self._wal_path, 'rb+') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Torn final write from a crash; cut it off so the
+                    # next append starts on a fresh line
+                    logger.warning(
+                        f"Truncating partial line in {self._wal_path}"
+                    )
+                    f.truncate(f.tell() - len(line))
+                    break
+                self._wal_records += 1
+                try:
+                    record = _loads(line)
+                except ValueError:
+                    logger.warning(
+                        f"Skipping unreadable line in {self._wal_path}"
+                    )
+                    continue
+                if record["outcome_id"] in loaded:
+                    continue
+                
+                outcome = self._restore_outcome(
+                    record["outcome_id"],
+                    record["query_id"],
+                    record["query_text"],
+                    record["query_type"],
+                    record["method_id"],
+                    record["success"],
+                    record["confidence_score"],
+                    record["reasoning_validity"],
+                    record["embedding_coherence"],
+                    record["execution_time_ms"],
+                    int(unix_ns_to_monotonic_ns(record["created_at_unix_ns"]))
+                )
+                self._append(outcome, outcome.composite_success_score())
+                replayed += 1
+        
+        if replayed:
+            logger.info(f"Replayed {replayed} outcomes from {self._wal_path}")
+    
     def _load_outcomes(self):
-        """Load outcomes from storage"""
-        outcomes_file = self.storage_path / "outcomes.json"
-        if outcomes_file.exists():
-            try:
-                with open(outcomes_file, 'r') as f:
-                    # Load implementation would go here
-                    logger.info("Loaded existing outcomes")
-            except Exception as e:
-                logger.warning(f"Failed to load outcomes: {e}")
+        """Load the Parquet snapshot in storage, then replay the log"""
+        self._load_snapshot()
+        if self.cfg.wal_enabled:
+            self._replay_wal()
+            if self._wal_records >= self.cfg.wal_checkpoint_records:
+                self._checkpoint()
+    
+    def _load_snapshot(self):
+        """Load outcomes from the Parquet snapshot in storage"""
+        snapshot_file = self.storage_path / "outcomes.parquet"
+        if pq is None or not snapshot_file.exists():
+            return
+        
+        try:
+            table = pq.read_table(snapshot_file, memory_map=True)
+        except Exception as e:
+            logger.warning(f"Failed to load outcomes: {e}")
+            return
+        
+        # Numeric columns load straight into the outcome store
+        columns = {
+            name: table.column(name).to_numpy()
+            for name in (
+                "method_id", "success", "confidence_score",
+                "reasoning_validity", "embedding_coherence",
+                "composite_score", "execution_time_ms", "created_at_unix_ns"
+            )
+        }
+        created_at_ns = unix_ns_to_monotonic_ns(columns["created_at_unix_ns"])
+        query_types = table.column("query_type").to_pylist()
+        self.columns.extend_columns(
+            columns["confidence_score"],
+            columns["composite_score"],
+            columns["success"],
+            columns["execution_time_ms"],
+            columns["method_id"],
+            created_at_ns,
+            query_types
+        )
+        
+        self.outcomes.extend(
+            self._restore_outcome(*row) for row in zip(
+            table.column("outcome_id").to_pylist(),
+            table.column("query_id").to_pylist(),
+            table.column("query_text").to_pylist(),
+            query_types,
+            columns["method_id"].tolist(),
+            columns["success"].tolist(),
+            columns["confidence_score"].tolist(),
+            columns["reasoning_validity"].tolist(),
+            columns["embedding_coherence"].tolist(),
+            columns["execution_time_ms"].tolist(),
+            created_at_ns.tolist()
+        ))
+        
+        self.total_recorded = len(self.outcomes)
+        logger.info(
+            f"Loaded {len(self.outcomes)} outcomes from {snapshot_file}"
+        )
+    
+    def _save_snapshot(self, filepath: Path):
+        """Write all outcomes as one zstd-compressed Parquet table"""
+        outcomes = self.outcomes
+        table = pa.table({
+            "outcome_id": [o.outcome_id for o in outcomes],
+            "query_id": [o.query_signature.query_id for o in outcomes],
+            "query_text": [o.query_signature.query_text for o in outcomes],
+            "query_type": [o.query_signature.query_type for o in outcomes],
+            "method_id": self.columns.method_id,
+            "success": self.columns.success,
+            "confidence_score": self.columns.confidence,
+            "reasoning_validity": np.fromiter(
+                (o.reasoning_validity for o in outcomes),
+                dtype=np.float32, count=len(outcomes)
+            ),
+            "embedding_coherence": np.fromiter(
+                (o.embedding_coherence for o in outcomes),
+                dtype=np.float32, count=len(outcomes)
+            ),
+            "composite_score": self.columns.composite_score,
+            "execution_time_ms": self.columns.execution_time_ms,
+            "created_at_unix_ns": monotonic_ns_to_unix_ns(
+                self.columns.created_at_ns
+            ),
+        })
+        
+        # Write beside the snapshot, then swap it in
+        partial = filepath.with_suffix(".parquet.tmp")
+        pq.write_table(table, partial, compression="zstd")
+        partial.replace(filepath)
     
     def save_outcomes(self):
-        """Save outcomes to storage"""
-        self.export_outcomes(str(self.storage_path / "outcomes.json"))
+        """
+        Checkpoint outcomes to storage
+        
+        Writes a Parquet snapshot that _load_outcomes reads back on
+        startup, then truncates the write-ahead log it supersedes.
+        Without pyarrow, falls back to an NDJSON export and keeps the
+        log, since the export is not reloaded.
+        """
+        if pq is None:
+            self.export_outcomes(str(self.storage_path / "outcomes.ndjson"))
+            return
+        
+        snapshot_file = self.storage_path / "outcomes.parquet"
+        self._save_snapshot(snapshot_file)
+        
+        # The snapshot now holds everything logged so far
+        self._close_wal()
+        if self._wal_path.exists():
+            self._wal_path.write_bytes(b"")
+        self._wal_records = 0
+        
+        logger.info(
+            f"Saved {len(self.outcomes)} outcomes to {snapshot_file}"
+        )
+    
+    def close(self):
+        """Checkpoint any logged outcomes, then close the write-ahead log"""
+        if self._wal_records and pq is not None:
+            self.save_outcomes()
+        self._close_wal()
+    
+    def _close_wal(self):
+        """Close the write-ahead log file"""
+        if self._wal_fp is not None:
+            self._wal_fp.close()
+            self._wal_fp = None
 
 
 # Global instance
 rot_instance: Optional[RetrievalOutcomeTracker] = None
+_instance_lock = threading.Lock()
 
 
 def get_rot() -> RetrievalOutcomeTracker:
     """Get or create ROT instance"""
     global rot_instance
     if rot_instance is None:
-        rot_instance = RetrievalOutcomeTracker()
+        with _instance_lock:
+            if rot_instance is None:
+                rot_instance = RetrievalOutcomeTracker()
     return rot_instance
\ No newline at end of file
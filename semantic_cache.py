@@ -0,0 +1,190 @@
+"""
+Semantic Response Cache Component
+Serves cached responses for repeated or paraphrased queries
+"""
+
+import logging
+from typing import List, Dict, Optional, Sequence
+import threading
+import time
+
+import numpy as np
+
+from models import RAGResponse
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """Embedding-similarity cache of RAG responses with TTL and LRU eviction"""
+
+    def __init__(
+        self,
+        similarity_threshold: Optional[float] = None,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None
+    ):
+        """
+        Initialize semantic cache
+
+        Args:
+            similarity_threshold: Min cosine similarity for a cache hit
+            ttl_seconds: Lifetime of a cached response
+            max_entries: Max cached responses before LRU eviction
+        """
+        self.cfg = config.semantic_cache
+        self.similarity_threshold = (
+            similarity_threshold
+            if similarity_threshold is not None
+            else self.cfg.similarity_threshold
+        )
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else self.cfg.ttl_seconds
+        )
+        self.max_entries = (
+            max_entries if max_entries is not None else self.cfg.max_entries
+        )
+
+        # Preallocated L2-normalized query embeddings; rows [0, _size) live.
+        # Allocated on first put once the embedding dimension is known.
+        self._matrix: Optional[np.ndarray] = None
+        self._expires_at = np.empty(self.max_entries, dtype=np.float64)
+        self._last_used = np.empty(self.max_entries, dtype=np.float64)
+        self._responses: List[RAGResponse] = []
+        self._size = 0
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def normalize(embedding: Sequence[float]) -> np.ndarray:
+        """L2-normalize an embedding into a contiguous float32 vector"""
+        vector = np.ascontiguousarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        return vector
+
+    def get(self, query_vector: np.ndarray) -> Optional[RAGResponse]:
+        """
+        Look up a cached response for a normalized query embedding
+
+        Args:
+            query_vector: L2-normalized query embedding
+
+        Returns:
+            Cached RAGResponse on hit, otherwise None
+        """
+        with self._lock:
+            self._expire()
+
+            if self._size == 0:
+                self.misses += 1
+                return None
+
+            # Single SGEMV over all live rows
+            scores = self._matrix[:self._size] @ query_vector
+            best = int(np.argmax(scores))
+
+            if scores[best] < self.similarity_threshold:
+                self.misses += 1
+                return None
+
+            self._last_used[best] = time.monotonic()
+            self.hits += 1
+
+            logger.debug(f"Semantic cache hit (similarity {scores[best]:.3f})")
+            return self._responses[best]
+
+    def put(self, query_vector: np.ndarray, response: RAGResponse):
+        """
+        Store a response under a normalized query embedding
+
+        Args:
+            query_vector: L2-normalized query embedding
+            response: Response to cache
+        """
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._expire()
+
+            if self._matrix is None:
+                self._matrix = np.empty(
+                    (self.max_entries, query_vector.shape[0]),
+                    dtype=np.float32
+                )
+
+            if self._size >= self.max_entries:
+                lru_index = int(np.argmin(self._last_used[:self._size]))
+                self._remove(lru_index)
+                self.evictions += 1
+
+            now = time.monotonic()
+            row = self._size
+            self._matrix[row] = query_vector
+            self._expires_at[row] = now + self.ttl_seconds
+            self._last_used[row] = now
+            self._responses.append(response)
+            self._size += 1
+
+    def _expire(self):
+        """Drop entries whose TTL has elapsed"""
+        expired = np.flatnonzero(
+            self._expires_at[:self._size] <= time.monotonic()
+        )
+        # Remove from the back so swapped-in rows are never expired ones
+        for index in expired[::-1]:
+            self._remove(int(index))
+
+    def _remove(self, index: int):
+        """Remove a cache entry by swapping the last live row into its slot"""
+        last = self._size - 1
+        if index != last:
+            self._matrix[index] = self._matrix[last]
+            self._expires_at[index] = self._expires_at[last]
+            self._last_used[index] = self._last_used[last]
+            self._responses[index] = self._responses[last]
+        self._responses.pop()
+        self._size = last
+
+    def clear(self):
+        """Remove all cached responses"""
+        with self._lock:
+            self._responses = []
+            self._size = 0
+        logger.info("Cleared semantic cache")
+
+    def get_statistics(self) -> Dict:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+
+        return {
+            "entries": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups > 0 else 0.0,
+            "evictions": self.evictions,
+            "similarity_threshold": self.similarity_threshold,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+# Global instance
+semantic_cache_instance: Optional[SemanticCache] = None
+_instance_lock = threading.Lock()
+
+
+def get_semantic_cache() -> SemanticCache:
+    """Get or create semantic cache instance"""
+    global semantic_cache_instance
+    if semantic_cache_instance is None:
+        with _instance_lock:
+            if semantic_cache_instance is None:
+                semantic_cache_instance = SemanticCache()
+    return semantic_cache_instance
@@ -4,41 +4,79 @@ Validates all dependencies and configurations
 """
 
 import sys
+import socket
 import subprocess
 import importlib
-from typing import Tuple, List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import PackageNotFoundError, version as dist_version
+from typing import Tuple, List, Dict, Optional
 from pathlib import Path
+from urllib.parse import urlsplit
 import os
 
 
 class AdaptiveRAGSetupChecker:
     """Comprehensive setup verification"""
     
+    # Threads probing imports at once; imports are mostly file I/O
+    IMPORT_WORKERS = 8
+    
+    # Bounds on how long an unreachable Neo4j can stall the check
+    NEO4J_PROBE_TIMEOUT = 1.0  # TCP reachability probe, seconds
+    NEO4J_CONNECT_TIMEOUT = 2.0  # Driver connect/acquire, seconds
+    
+    # Environment variables the checks read
+    ENV_KEYS = ("NEO4J_URI", "NEO4J_USERNAME", "NEO4J_PASSWORD", "API_PORT")
+    
     def __init__(self):
         """Initialize checker"""
         self.checks_passed = []
         self.checks_failed = []
         self.warnings = []
+        
+        # Output lines for the current section, written in one call
+        self._buffer: List[str] = []
+        
+        # Parse .env once; checks read this snapshot
+        try:
+            from dotenv import load_dotenv
+            load_dotenv()
+        except ImportError:
+            pass
+        self._env: Dict[str, str] = {
+            key: os.environ[key] for key in self.ENV_KEYS if key in os.environ
+        }
+    
+    def _print(self, text: str = ""):
+        """Buffer a line of output"""
+        self._buffer.append(f"{text}\n")
+    
+    def flush_section(self):
+        """Write buffered output to stdout in one call"""
+        if self._buffer:
+            sys.stdout.write("".join(self._buffer))
+            sys.stdout.flush()
+            self._buffer.clear()
     
     def print_header(self, text: str):
         """Print formatted header"""
-        print("\n" + "=" * 80)
-        print(f"  {text}")
-        print("=" * 80)
+        self._print("\n" + "=" * 80)
+        self._print(f"  {text}")
+        self._print("=" * 80)
     
     def print_success(self, text: str):
         """Print success message"""
-        print(f"✓ {text}")
+        self._print(f"✓ {text}")
         self.checks_passed.append(text)
     
     def print_error(self, text: str):
         """Print error message"""
-        print(f"✗ {text}")
+        self._print(f"✗ {text}")
         self.checks_failed.append(text)
     
     def print_warning(self, text: str):
         """Print warning message"""
-        print(f"⚠ {text}")
+        self._print(f"⚠ {text}")
         self.warnings.append(text)
     
     def check_python_version(self) -> bool:
@@ -48,7 +86,7 @@ class AdaptiveRAGSetupChecker:
         version = sys.version_info
         version_str = f"{version.major}.{version.minor}.{version.micro}"
         
-        print(f"Python version: {version_str}")
+        self._print(f"Python version: {version_str}")
         
         if version.major >= 3 and version.minor >= 10:
             self.print_success(f"Python {version_str} meets requirements (≥3.10)")
@@ -78,21 +116,19 @@ class AdaptiveRAGSetupChecker:
         
         all_installed = True
         
-        for package, required_version in dependencies.items():
-            try:
-                imported = importlib.import_module(package)
-                
-                # Try to get version
-                try:
-                    version = imported.__version__
-                except AttributeError:
-                    version = "unknown"
-                
+        # Probe concurrently, then report in declaration order
+        with ThreadPoolExecutor(max_workers=self.IMPORT_WORKERS) as executor:
+            versions = list(executor.map(self._probe_version, dependencies))
+        
+        for (package, required_version), version in zip(
+            dependencies.items(), versions
+        ):
+            if version is not None:
                 self.print_success(
                     f"{package} {version} installed "
                     f"(required: ≥{required_version})"
                 )
-            except ImportError:
+            else:
                 self.print_error(
                     f"{package} NOT installed "
                     f"(required: ≥{required_version}). "
@@ -102,26 +138,51 @@ class AdaptiveRAGSetupChecker:
         
         return all_installed
     
+    @staticmethod
+    def _probe_version(package: str) -> Optional[str]:
+        """Get a package's version, or None if missing"""
+        # Installed distribution metadata, without running the package
+        try:
+            return dist_version(package)
+        except PackageNotFoundError:
+            pass
+        
+        # No metadata (e.g. vendored or on sys.path only) - import it
+        try:
+            imported = importlib.import_module(package)
+        except ImportError:
+            return None
+        
+        # Try to get version
+        return getattr(imported, "__version__", "unknown")
+    
     def check_neo4j_connection(self) -> bool:
         """Check Neo4j connectivity"""
         self.print_header("NEO4J CONNECTION CHECK")
         
-        from dotenv import load_dotenv
-        load_dotenv()
+        uri = self._env.get("NEO4J_URI", "bolt://localhost:7687")
+        username = self._env.get("NEO4J_USERNAME", "neo4j")
+        password = self._env.get("NEO4J_PASSWORD", "password")
         
-        uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
-        username = os.getenv("NEO4J_USERNAME", "neo4j")
-        password = os.getenv("NEO4J_PASSWORD", "password")
-        
-        print(f"Attempting connection to: {uri}")
+        self._print(f"Attempting connection to: {uri}")
+        self.flush_section()  # Show progress before a possibly slow connect
         
         try:
+            # Fail fast on an unreachable host before building a driver
+            address = urlsplit(uri)
+            socket.create_connection(
+                (address.hostname or "localhost", address.port or 7687),
+                timeout=self.NEO4J_PROBE_TIMEOUT
+            ).close()
+            
             from neo4j import GraphDatabase
             
             driver = GraphDatabase.driver(
                 uri,
                 auth=(username, password),
-                encrypted=False
+                encrypted=False,
+                connection_timeout=self.NEO4J_CONNECT_TIMEOUT,
+                connection_acquisition_timeout=self.NEO4J_CONNECT_TIMEOUT
             )
             
             with driver.session() as session:
@@ -147,13 +208,26 @@ class AdaptiveRAGSetupChecker:
         required_dirs = ["data", "logs", "data/rot_storage"]
         all_created = True
         
-        for directory in required_dirs:
-            path = Path(directory)
+        # Create only the deepest directories; their parents come along
+        paths = [Path(directory) for directory in required_dirs]
+        errors: Dict[Path, Exception] = {}
+        for path in paths:
+            if any(path in other.parents for other in paths):
+                continue
             try:
                 path.mkdir(parents=True, exist_ok=True)
-                self.print_success(f"Directory '{directory}' ready")
             except Exception as e:
-                self.print_error(f"Failed to create '{directory}': {e}")
+                errors[path] = e
+        
+        for directory, path in zip(required_dirs, paths):
+            if path.is_dir():
+                self.print_success(f"Directory '{directory}' ready")
+            else:
+                error = errors.get(path) or next(
+                    (errors[other] for other in errors if path in other.parents),
+                    "not created"
+                )
+                self.print_error(f"Failed to create '{directory}': {error}")
                 all_created = False
         
         return all_created
@@ -168,20 +242,7 @@ class AdaptiveRAGSetupChecker:
             self.print_success(".env file found")
             
             # Check required keys
-            from dotenv import load_dotenv
-            load_dotenv()
-            
-            required_keys = [
-                "NEO4J_URI",
-                "NEO4J_USERNAME",
-                "NEO4J_PASSWORD",
-                "API_PORT"
-            ]
-            
-            missing = []
-            for key in required_keys:
-                if not os.getenv(key):
-                    missing.append(key)
+            missing = [key for key in self.ENV_KEYS if not self._env.get(key)]
             
             if missing:
                 self.print_warning(
@@ -209,8 +270,8 @@ class AdaptiveRAGSetupChecker:
             available_gb = memory.available / (1024 ** 3)
             total_gb = memory.total / (1024 ** 3)
             
-            print(f"Total memory: {total_gb:.1f}GB")
-            print(f"Available memory: {available_gb:.1f}GB")
+            self._print(f"Total memory: {total_gb:.1f}GB")
+            self._print(f"Available memory: {available_gb:.1f}GB")
             
             if available_gb >= 2:
                 self.print_success(
@@ -248,40 +309,56 @@ class AdaptiveRAGSetupChecker:
         
         all_imported = True
         
-        for module_name, class_name in test_imports:
-            try:
-                module = importlib.import_module(module_name)
-                getattr(module, class_name)
+        # Probe concurrently, then report in declaration order
+        with ThreadPoolExecutor(max_workers=self.IMPORT_WORKERS) as executor:
+            errors = list(executor.map(self._probe_import, test_imports))
+        
+        for (module_name, class_name), error in zip(test_imports, errors):
+            if error is None:
                 self.print_success(
                     f"Successfully imported {class_name} from {module_name}"
                 )
-            except Exception as e:
+            else:
                 self.print_error(
                     f"Failed to import {class_name} "
-                    f"from {module_name}: {e}"
+                    f"from {module_name}: {error}"
                 )
                 all_imported = False
         
         return all_imported
     
+    @staticmethod
+    def _probe_import(target: Tuple[str, str]) -> Optional[Exception]:
+        """Import a module attribute, returning the error if it fails"""
+        module_name, class_name = target
+        try:
+            module = importlib.import_module(module_name)
+            getattr(module, class_name)
+        except Exception as e:
+            return e
+        return None
+    
     def run_all_checks(self) -> bool:
         """Run all checks"""
-        print("\n")
-        print("╔" + "=" * 78 + "╗")
-        print("║" + " " * 78 + "║")
-        print("║" + "AdaptiveGraphRAG Setup Verification".center(78) + "║")
-        print("║" + " " * 78 + "║")
-        print("╚" + "=" * 78 + "╝")
-        
-        checks = [
-            self.check_python_version(),
-            self.check_dependencies(),
-            self.check_directories(),
-            self.check_env_file(),
-            self.check_memory(),
-            self.check_neo4j_connection(),
-            self.check_imports(),
-        ]
+        self._print("\n")
+        self._print("╔" + "=" * 78 + "╗")
+        self._print("║" + " " * 78 + "║")
+        self._print("║" + "AdaptiveGraphRAG Setup Verification".center(78) + "║")
+        self._print("║" + " " * 78 + "║")
+        self._print("╚" + "=" * 78 + "╝")
+        
+        checks = []
+        for check in (
+            self.check_python_version,
+            self.check_dependencies,
+            self.check_directories,
+            self.check_env_file,
+            self.check_memory,
+            self.check_neo4j_connection,
+            self.check_imports,
+        ):
+            checks.append(check())
+            self.flush_section()
         
         self.print_summary()
         
@@ -295,32 +372,34 @@ class AdaptiveRAGSetupChecker:
         failed = len(self.checks_failed)
         warnings = len(self.warnings)
         
-        print(f"\n✓ Checks passed: {passed}")
-        print(f"✗ Checks failed: {failed}")
-        print(f"⚠ Warnings: {warnings}")
+        self._print(f"\n✓ Checks passed: {passed}")
+        self._print(f"✗ Checks failed: {failed}")
+        self._print(f"⚠ Warnings: {warnings}")
         
         if self.checks_failed:
-            print("\n" + "-" * 80)
-            print("FAILED CHECKS:")
+            self._print("\n" + "-" * 80)
+            self._print("FAILED CHECKS:")
             for i, failure in enumerate(self.checks_failed, 1):
-                print(f"{i}. {failure}")
+                self._print(f"{i}. {failure}")
         
         if self.warnings:
-            print("\n" + "-" * 80)
-            print("WARNINGS:")
+            self._print("\n" + "-" * 80)
+            self._print("WARNINGS:")
             for i, warning in enumerate(self.warnings, 1):
-                print(f"{i}. {warning}")
+                self._print(f"{i}. {warning}")
         
-        print("\n" + "-" * 80)
+        self._print("\n" + "-" * 80)
         
         if failed == 0:
-            print("\n🎉 ALL CHECKS PASSED! Ready to run AdaptiveGraphRAG.\n")
-            print("Next steps:")
-            print("1. python demo_script.py          # Run demo")
-            print("2. python api_server.py           # Start API server")
-            print("3. curl http://localhost:8000/docs  # API documentation")
+            self._print("\n🎉 ALL CHECKS PASSED! Ready to run AdaptiveGraphRAG.\n")
+            self._print("Next steps:")
+            self._print("1. python demo_script.py          # Run demo")
+            self._print("2. python api_server.py           # Start API server")
+            self._print("3. curl http://localhost:8000/docs  # API documentation")
         else:
-            print("\n⚠️  SETUP INCOMPLETE - Fix failed checks above\n")
+            self._print("\n⚠️  SETUP INCOMPLETE - Fix failed checks above\n")
+        
+        self.flush_section()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,131 @@
+"""
+Query Signature Index Component
+Approximate nearest-neighbour lookup of past queries by embedding
+"""
+
+import logging
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
+
+from models import RetrievalOutcome
+from config import config
+
+try:
+    import hnswlib
+except ImportError:  # Fall back to an exact flat scan
+    hnswlib = None
+
+logger = logging.getLogger(__name__)
+
+
+class QuerySignatureIndex:
+    """HNSW index over embeddings of past queries and their outcomes"""
+
+    def __init__(self, dim: Optional[int] = None):
+        """
+        Initialize index
+
+        Args:
+            dim: Embedding dimension
+        """
+        self.cfg = config.signature_index
+        self.dim = dim or config.embedding.embedding_dim
+
+        # Label (row) -> outcome of the indexed query
+        self._outcomes: List[RetrievalOutcome] = []
+
+        if hnswlib is not None:
+            self._index = hnswlib.Index(space="cosine", dim=self.dim)
+            self._index.init_index(
+                max_elements=self.cfg.max_elements,
+                M=self.cfg.m,
+                ef_construction=self.cfg.ef_construction
+            )
+            self._index.set_ef(self.cfg.ef_search)
+            self._matrix = None
+        else:
+            logger.warning(
+                "hnswlib not installed; using exact flat scan for "
+                "query signature lookups"
+            )
+            self._index = None
+            self._matrix = np.empty((1024, self.dim), dtype=np.float32)
+
+    def add(self, outcome: RetrievalOutcome):
+        """
+        Index an outcome under its query embedding
+
+        Args:
+            outcome: Recorded outcome whose signature has an embedding
+        """
+        embedding = outcome.query_signature.embedding
+        if len(embedding) != self.dim:
+            return
+
+        label = len(self._outcomes)
+        vector = np.asarray(embedding, dtype=np.float32)
+
+        if self._index is not None:
+            if label >= self._index.get_max_elements():
+                self._index.resize_index(label * 2)
+            self._index.add_items(vector[np.newaxis, :], np.array([label]))
+        else:
+            if label == len(self._matrix):
+                grown = np.empty(
+                    (len(self._matrix) * 2, self.dim),
+                    dtype=np.float32
+                )
+                grown[:label] = self._matrix
+                self._matrix = grown
+            norm = np.linalg.norm(vector)
+            self._matrix[label] = vector / norm if norm > 0 else vector
+
+        self._outcomes.append(outcome)
+
+    def search(
+        self,
+        embedding: np.ndarray,
+        k: int = 5
+    ) -> List[Tuple[RetrievalOutcome, float]]:
+        """
+        Find outcomes of the most similar past queries
+
+        Args:
+            embedding: Query embedding
+            k: Number of neighbours
+
+        Returns:
+            List of (outcome, cosine similarity), most similar first
+        """
+        count = len(self._outcomes)
+        k = min(k, count)
+        if k == 0 or len(embedding) != self.dim:
+            return []
+
+        vector = np.asarray(embedding, dtype=np.float32)
+
+        if self._index is not None:
+            labels, distances = self._index.knn_query(vector, k=k)
+            return [
+                (self._outcomes[int(label)], 1.0 - float(distance))
+                for label, distance in zip(labels[0], distances[0])
+            ]
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        scores = self._matrix[:count] @ vector
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._outcomes[int(i)], float(scores[i])) for i in top]
+
+    def __len__(self) -> int:
+        return len(self._outcomes)
+
+    def get_statistics(self) -> Dict:
+        """Get index statistics"""
+        return {
+            "indexed_queries": len(self._outcomes),
+            "backend": "hnsw" if self._index is not None else "flat",
+        }
@@ -0,0 +1,88 @@
+"""
+Retrieval Outcome Tracker persistence tests
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from config import config
+from models import QuerySignature, RetrievalMethod
+from retrieval_outcome_tracker import RetrievalOutcomeTracker
+
+
+@pytest.fixture(autouse=True)
+def wal_enabled(monkeypatch):
+    monkeypatch.setattr(config.outcome_tracker, "wal_enabled", True)
+
+
+def record(tracker, count, offset=0):
+    methods = list(RetrievalMethod)
+    for i in range(offset, offset + count):
+        tracker.record_outcome(
+            QuerySignature(query_text=f"query {i}", query_type="semantic"),
+            methods[i % len(methods)],
+            i % 3 != 0,
+            0.9, 0.7, 0.6, [], [],
+            float(i)
+        )
+
+
+def assert_same_outcomes(restored, original):
+    assert [o.outcome_id for o in restored.outcomes] == [
+        o.outcome_id for o in original.outcomes
+    ]
+    assert [o.query_signature.query_text for o in restored.outcomes] == [
+        o.query_signature.query_text for o in original.outcomes
+    ]
+    np.testing.assert_array_equal(
+        restored.columns.method_id, original.columns.method_id
+    )
+    np.testing.assert_array_equal(
+        restored.columns.success, original.columns.success
+    )
+    np.testing.assert_array_equal(
+        restored.columns.execution_time_ms,
+        original.columns.execution_time_ms
+    )
+
+
+def test_snapshot_and_wal_round_trip(tmp_path):
+    tracker = RetrievalOutcomeTracker(str(tmp_path))
+    record(tracker, 20)
+    tracker.save_outcomes()
+    # Logged after the snapshot; left in the WAL as if the process died
+    record(tracker, 15, offset=20)
+
+    restored = RetrievalOutcomeTracker(str(tmp_path))
+
+    assert len(restored.outcomes) == 35
+    assert_same_outcomes(restored, tracker)
+    assert restored.get_success_rate() == tracker.get_success_rate()
+
+    tracker.close()
+    restored.close()
+
+
+def test_close_checkpoints_wal(tmp_path):
+    tracker = RetrievalOutcomeTracker(str(tmp_path))
+    record(tracker, 10)
+    tracker.close()
+
+    assert (tmp_path / "outcomes.parquet").exists()
+    assert (tmp_path / "outcomes.wal.ndjson").stat().st_size == 0
+    assert_same_outcomes(RetrievalOutcomeTracker(str(tmp_path)), tracker)
+
+
+def test_wal_checkpoints_past_threshold(tmp_path, monkeypatch):
+    monkeypatch.setattr(config.outcome_tracker, "wal_checkpoint_records", 8)
+
+    tracker = RetrievalOutcomeTracker(str(tmp_path))
+    record(tracker, 12)
+
+    wal_lines = (tmp_path / "outcomes.wal.ndjson").read_bytes().count(b"\n")
+    assert wal_lines == 4
+    assert_same_outcomes(RetrievalOutcomeTracker(str(tmp_path)), tracker)
+
+    tracker.close()